@@ -15,17 +15,15 @@ Funcionalidades:
 
 import datetime as dt
 import io
-import itertools
 import json
-import random
-import time
 import os
-from collections import defaultdict
-from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Any
 import requests
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -35,824 +33,91 @@ from supabase_client import (
     buscar_concursos_ultimo_ano,
     buscar_ultimo_concurso as buscar_ultimo_concurso_db,
     buscar_jogos_salvos as buscar_jogos_salvos_db,
-    salvar_jogo as salvar_jogo_db,
     salvar_jogos_em_lote,
     deletar_jogo as deletar_jogo_db,
     deletar_todos_jogos,
     conferir_jogo_no_banco,
     sincronizar_com_caixa,
-    verificar_atualizacao,
-    contar_concursos,
 )
 
-# Importar estilos premium
-from styles import (
-    get_premium_styles,
-    criar_bola_html,
-    criar_bolas_jogo,
-    criar_header_premium,
-    criar_kpi_card,
-    criar_volante_premium,
-    criar_game_card,
-)
-
-# Constantes
-DEZENA_MIN = 1
-DEZENA_MAX = 60
-TAMANHO_JOGO = 6
-FAIXAS = [(1, 20), (21, 40), (41, 60)]
-ARQUIVO_JOGOS_SALVOS = "jogos_salvos.json"
-
-
-@dataclass(frozen=True)
-class Concurso:
-    numero: int
-    data: dt.date
-    dezenas: Tuple[int, ...]
-
-    @property
-    def dezenas_set(self) -> Set[int]:
-        return set(self.dezenas)
-
-    def to_dict(self) -> dict:
-        return {
-            'numero': self.numero,
-            'data': self.data.isoformat(),
-            'dezenas': list(self.dezenas)
-        }
-
-
-@dataclass
-class JogoSalvo:
-    id: int
-    dezenas: List[int]
-    data_criacao: str
-    algoritmos: List[str]
-    conferido: bool = False
-    acertos: Dict[int, int] = None  # {concurso: acertos}
-
-    def to_dict(self) -> dict:
-        return {
-            'id': self.id,
-            'dezenas': self.dezenas,
-            'data_criacao': self.data_criacao,
-            'algoritmos': self.algoritmos,
-            'conferido': self.conferido,
-            'acertos': self.acertos or {}
-        }
-
-    @staticmethod
-    def from_dict(d: dict) -> 'JogoSalvo':
-        return JogoSalvo(
-            id=d['id'],
-            dezenas=d['dezenas'],
-            data_criacao=d['data_criacao'],
-            algoritmos=d['algoritmos'],
-            conferido=d.get('conferido', False),
-            acertos=d.get('acertos', {})
-        )
-
-
-@dataclass
-class ScoreDezena:
-    dezena: int
-    frequencia: float = 0.0
-    markov: float = 0.0
-    coocorrencia: float = 0.0
-    atraso: float = 0.0
-
-    def score_total(self, pesos: Dict[str, float]) -> float:
-        return (
-            self.frequencia * pesos.get('frequencia', 0) +
-            self.markov * pesos.get('markov', 0) +
-            self.coocorrencia * pesos.get('coocorrencia', 0) +
-            self.atraso * pesos.get('atraso', 0)
-        )
-
-
-class AnalisadorMegaSena:
-    def __init__(self, concursos: List[Concurso]):
-        self.concursos = sorted(concursos, key=lambda c: c.data)
-        self.ultimo_concurso = self.concursos[-1] if self.concursos else None
-        self._frequencias: Optional[Dict[int, int]] = None
-        self._matriz_markov: Optional[Dict[int, Dict[int, int]]] = None
-        self._coocorrencias: Optional[Dict[Tuple[int, int], int]] = None
-        self._atrasos: Optional[Dict[int, int]] = None
-
-    def filtrar_por_anos(self, anos: int) -> 'AnalisadorMegaSena':
-        limite = dt.date.today() - dt.timedelta(days=anos * 365)
-        filtrados = [c for c in self.concursos if c.data >= limite]
-        return AnalisadorMegaSena(filtrados)
-
-    def calcular_frequencias(self) -> Dict[int, int]:
-        if self._frequencias is None:
-            self._frequencias = defaultdict(int)
-            for c in self.concursos:
-                for d in c.dezenas:
-                    self._frequencias[d] += 1
-        return self._frequencias
-
-    def scores_frequencia(self) -> Dict[int, float]:
-        freq = self.calcular_frequencias()
-        if not freq:
-            return {d: 0.0 for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
-        max_freq = max(freq.values()) if freq else 1
-        return {d: freq.get(d, 0) / max_freq for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
-
-    def calcular_matriz_markov(self) -> Dict[int, Dict[int, int]]:
-        if self._matriz_markov is None:
-            self._matriz_markov = defaultdict(lambda: defaultdict(int))
-            for i in range(len(self.concursos) - 1):
-                atual = self.concursos[i]
-                proximo = self.concursos[i + 1]
-                for d_atual in atual.dezenas:
-                    for d_proximo in proximo.dezenas:
-                        self._matriz_markov[d_atual][d_proximo] += 1
-        return self._matriz_markov
-
-    def scores_markov(self, dezenas_referencia: Optional[Set[int]] = None) -> Dict[int, float]:
-        if dezenas_referencia is None:
-            if self.ultimo_concurso is None:
-                return {d: 0.0 for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
-            dezenas_referencia = self.ultimo_concurso.dezenas_set
-
-        matriz = self.calcular_matriz_markov()
-        scores = defaultdict(float)
-
-        for d_ref in dezenas_referencia:
-            seguidores = matriz.get(d_ref, {})
-            for d_seguidor, contagem in seguidores.items():
-                scores[d_seguidor] += contagem
-
-        max_score = max(scores.values()) if scores else 1
-        return {d: scores.get(d, 0) / max_score for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
-
-    def calcular_coocorrencias(self) -> Dict[Tuple[int, int], int]:
-        if self._coocorrencias is None:
-            self._coocorrencias = defaultdict(int)
-            for c in self.concursos:
-                dezenas = sorted(c.dezenas)
-                for i in range(len(dezenas)):
-                    for j in range(i + 1, len(dezenas)):
-                        par = (dezenas[i], dezenas[j])
-                        self._coocorrencias[par] += 1
-        return self._coocorrencias
-
-    def scores_coocorrencia(self) -> Dict[int, float]:
-        cooc = self.calcular_coocorrencias()
-        top_pares = sorted(cooc.items(), key=lambda x: x[1], reverse=True)[:100]
-        scores = defaultdict(float)
-        for (d1, d2), contagem in top_pares:
-            scores[d1] += contagem
-            scores[d2] += contagem
-        max_score = max(scores.values()) if scores else 1
-        return {d: scores.get(d, 0) / max_score for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
-
-    def pares_mais_frequentes(self, top_n: int = 20) -> List[Tuple[Tuple[int, int], int]]:
-        cooc = self.calcular_coocorrencias()
-        return sorted(cooc.items(), key=lambda x: x[1], reverse=True)[:top_n]
-
-    def calcular_atrasos(self) -> Dict[int, int]:
-        if self._atrasos is None:
-            self._atrasos = {}
-            for d in range(DEZENA_MIN, DEZENA_MAX + 1):
-                atraso = 0
-                for c in reversed(self.concursos):
-                    if d in c.dezenas_set:
-                        break
-                    atraso += 1
-                self._atrasos[d] = atraso
-        return self._atrasos
-
-    def scores_atraso(self) -> Dict[int, float]:
-        atrasos = self.calcular_atrasos()
-        max_atraso = max(atrasos.values()) if atrasos else 1
-        return {d: atrasos.get(d, 0) / max_atraso for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
-
-    def dezenas_mais_atrasadas(self, top_n: int = 10) -> List[Tuple[int, int]]:
-        atrasos = self.calcular_atrasos()
-        return sorted(atrasos.items(), key=lambda x: x[1], reverse=True)[:top_n]
-
-    def conferir_jogo(self, dezenas: List[int], concurso: Concurso) -> int:
-        """Retorna quantidade de acertos do jogo no concurso."""
-        return len(set(dezenas) & concurso.dezenas_set)
-
-    def simular_jogo(self, dezenas: List[int], ultimos_n: int = 100) -> Dict[str, any]:
-        """Simula um jogo nos ultimos N concursos."""
-        concursos_sim = self.concursos[-ultimos_n:] if len(self.concursos) > ultimos_n else self.concursos
-        resultados = {
-            'total_concursos': len(concursos_sim),
-            'acertos': {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0},
-            'detalhes': []
-        }
-
-        for c in concursos_sim:
-            acertos = self.conferir_jogo(dezenas, c)
-            resultados['acertos'][acertos] += 1
-            if acertos >= 4:
-                resultados['detalhes'].append({
-                    'concurso': c.numero,
-                    'data': c.data.isoformat(),
-                    'acertos': acertos,
-                    'dezenas_sorteadas': list(c.dezenas)
-                })
-
-        return resultados
+# Importar cache de concursos por processo
+from cache_concursos import CacheConcursos, CacheDerivados, identificador_dados
 
-    # ============== ANÁLISES ESTATÍSTICAS AVANÇADAS ==============
-
-    def probabilidades_reais(self) -> Dict[str, Dict]:
-        """Calcula probabilidades reais da Mega-Sena."""
-        from math import comb
-
-        total_combinacoes = comb(60, 6)  # 50.063.860
-
-        return {
-            'sena': {
-                'chance': 1,
-                'total': total_combinacoes,
-                'probabilidade': 1 / total_combinacoes,
-                'percentual': (1 / total_combinacoes) * 100,
-                'texto': f"1 em {total_combinacoes:,}".replace(',', '.')
-            },
-            'quina': {
-                'chance': comb(6, 5) * comb(54, 1),
-                'total': total_combinacoes,
-                'probabilidade': (comb(6, 5) * comb(54, 1)) / total_combinacoes,
-                'percentual': ((comb(6, 5) * comb(54, 1)) / total_combinacoes) * 100,
-                'texto': f"1 em {total_combinacoes // (comb(6, 5) * comb(54, 1)):,}".replace(',', '.')
-            },
-            'quadra': {
-                'chance': comb(6, 4) * comb(54, 2),
-                'total': total_combinacoes,
-                'probabilidade': (comb(6, 4) * comb(54, 2)) / total_combinacoes,
-                'percentual': ((comb(6, 4) * comb(54, 2)) / total_combinacoes) * 100,
-                'texto': f"1 em {total_combinacoes // (comb(6, 4) * comb(54, 2)):,}".replace(',', '.')
-            }
-        }
-
-    def analise_soma(self) -> Dict[str, any]:
-        """Analisa a soma dos números sorteados."""
-        somas = [sum(c.dezenas) for c in self.concursos]
-
-        if not somas:
-            return {'media': 0, 'min': 0, 'max': 0, 'faixa_ideal': (0, 0)}
-
-        media = sum(somas) / len(somas)
-        desvio = (sum((s - media) ** 2 for s in somas) / len(somas)) ** 0.5
-
-        # Faixa ideal = média ± 1 desvio padrão
-        faixa_min = int(media - desvio)
-        faixa_max = int(media + desvio)
-
-        # Distribuição por faixas
-        faixas = {'< 150': 0, '150-175': 0, '176-200': 0, '201-225': 0, '> 225': 0}
-        for s in somas:
-            if s < 150:
-                faixas['< 150'] += 1
-            elif s <= 175:
-                faixas['150-175'] += 1
-            elif s <= 200:
-                faixas['176-200'] += 1
-            elif s <= 225:
-                faixas['201-225'] += 1
-            else:
-                faixas['> 225'] += 1
-
-        return {
-            'media': round(media, 1),
-            'min': min(somas),
-            'max': max(somas),
-            'desvio': round(desvio, 1),
-            'faixa_ideal': (faixa_min, faixa_max),
-            'distribuicao': faixas,
-            'historico': somas[-50:]  # Últimas 50
-        }
-
-    def analise_padroes(self) -> Dict[str, any]:
-        """Analisa padrões nos sorteios."""
-        consecutivos = 0
-        mesmo_final = 0
-        repetidos_anterior = 0
-
-        for i, c in enumerate(self.concursos):
-            dezenas = sorted(c.dezenas)
-
-            # Consecutivos
-            for j in range(len(dezenas) - 1):
-                if dezenas[j + 1] - dezenas[j] == 1:
-                    consecutivos += 1
-
-            # Mesmo final
-            finais = [d % 10 for d in dezenas]
-            if len(finais) != len(set(finais)):
-                mesmo_final += 1
-
-            # Repetidos do anterior
-            if i > 0:
-                anterior = set(self.concursos[i - 1].dezenas)
-                atual = set(dezenas)
-                if anterior & atual:
-                    repetidos_anterior += 1
-
-        total = len(self.concursos)
-        return {
-            'consecutivos': {
-                'total': consecutivos,
-                'media_por_sorteio': round(consecutivos / total, 2) if total > 0 else 0,
-                'percentual': round((consecutivos / (total * 5)) * 100, 1) if total > 0 else 0
-            },
-            'mesmo_final': {
-                'total': mesmo_final,
-                'percentual': round((mesmo_final / total) * 100, 1) if total > 0 else 0
-            },
-            'repetidos': {
-                'total': repetidos_anterior,
-                'percentual': round((repetidos_anterior / total) * 100, 1) if total > 0 else 0
-            }
-        }
-
-    def ciclos_atraso(self) -> Dict[int, Dict]:
-        """Calcula ciclos médios de atraso para cada número."""
-        aparicoes = {d: [] for d in range(1, 61)}
-
-        for i, c in enumerate(self.concursos):
-            for d in c.dezenas:
-                aparicoes[d].append(i)
-
-        ciclos = {}
-        for d in range(1, 61):
-            pos = aparicoes[d]
-            if len(pos) >= 2:
-                intervalos = [pos[i + 1] - pos[i] for i in range(len(pos) - 1)]
-                media = sum(intervalos) / len(intervalos)
-                ciclos[d] = {
-                    'media': round(media, 1),
-                    'min': min(intervalos),
-                    'max': max(intervalos),
-                    'ultimo_atraso': len(self.concursos) - 1 - pos[-1] if pos else 0,
-                    'aparicoes': len(pos)
-                }
-            else:
-                ciclos[d] = {
-                    'media': 0,
-                    'min': 0,
-                    'max': 0,
-                    'ultimo_atraso': len(self.concursos) if not pos else len(self.concursos) - 1 - pos[-1],
-                    'aparicoes': len(pos)
-                }
-
-        return ciclos
-
-    def analise_quadrantes(self) -> Dict[str, any]:
-        """Analisa distribuição por quadrantes (faixas de 15)."""
-        quadrantes = {
-            '01-15': 0,
-            '16-30': 0,
-            '31-45': 0,
-            '46-60': 0
-        }
-
-        distribuicoes = []
-
-        for c in self.concursos:
-            dist = [0, 0, 0, 0]
-            for d in c.dezenas:
-                if d <= 15:
-                    quadrantes['01-15'] += 1
-                    dist[0] += 1
-                elif d <= 30:
-                    quadrantes['16-30'] += 1
-                    dist[1] += 1
-                elif d <= 45:
-                    quadrantes['31-45'] += 1
-                    dist[2] += 1
-                else:
-                    quadrantes['46-60'] += 1
-                    dist[3] += 1
-            distribuicoes.append(tuple(dist))
-
-        # Padrão mais comum
-        from collections import Counter
-        padroes = Counter(distribuicoes)
-        mais_comum = padroes.most_common(5)
-
-        total = sum(quadrantes.values())
-        percentuais = {k: round((v / total) * 100, 1) if total > 0 else 0 for k, v in quadrantes.items()}
-
-        return {
-            'contagem': quadrantes,
-            'percentuais': percentuais,
-            'padroes_comuns': mais_comum,
-            'ideal': [1, 2, 2, 1]  # Distribuição ideal sugerida
-        }
+try:
+    from config import CACHE_CONCURSOS_DIR, DEBUG, INGESTAO_EXTERNA, METRICAS_ENDERECO, METRICAS_PORTA
+except ImportError:
+    CACHE_CONCURSOS_DIR = os.getenv("CACHE_CONCURSOS_DIR", "")
+    DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+    INGESTAO_EXTERNA = os.getenv("INGESTAO_EXTERNA", "false").lower() == "true"
+    METRICAS_PORTA = int(os.getenv("METRICAS_PORTA", "0"))
+    METRICAS_ENDERECO = os.getenv("METRICAS_ENDERECO", "127.0.0.1")
 
-    def simulacao_monte_carlo(self, num_simulacoes: int = 10000) -> Dict[str, any]:
-        """Simula milhares de jogos para calcular ROI esperado."""
-        import random
+# Importar registro canonico (append-only) de resultados
+import registro_concursos
 
-        # Probabilidades reais
-        prob = self.probabilidades_reais()
+# Importar exportacao em streaming
+from exportacao import gerar_excel_bytes
 
-        # Valores dos prêmios (médios)
-        premios = {
-            6: 50_000_000,  # Sena média
-            5: 50_000,       # Quina média
-            4: 1_000         # Quadra média
-        }
-
-        custo_jogo = 5.00
-        ganhos_total = 0
-        acertos = {4: 0, 5: 0, 6: 0}
-
-        # Simular
-        rng = random.Random()
-        for _ in range(num_simulacoes):
-            # Gerar jogo aleatório
-            jogo = set(rng.sample(range(1, 61), 6))
-
-            # Gerar resultado aleatório
-            resultado = set(rng.sample(range(1, 61), 6))
-
-            # Conferir
-            hits = len(jogo & resultado)
-            if hits >= 4:
-                acertos[hits] += 1
-                ganhos_total += premios.get(hits, 0)
-
-        custo_total = num_simulacoes * custo_jogo
-        roi = ((ganhos_total - custo_total) / custo_total) * 100 if custo_total > 0 else 0
-
-        return {
-            'simulacoes': num_simulacoes,
-            'custo_total': custo_total,
-            'ganhos_total': ganhos_total,
-            'lucro': ganhos_total - custo_total,
-            'roi': round(roi, 2),
-            'acertos': acertos,
-            'quadras_esperadas': round(num_simulacoes * prob['quadra']['probabilidade'], 2),
-            'quinas_esperadas': round(num_simulacoes * prob['quina']['probabilidade'], 4),
-            'senas_esperadas': round(num_simulacoes * prob['sena']['probabilidade'], 8)
-        }
-
-    def indice_confianca(self, dezenas: List[int]) -> Dict[str, any]:
-        """Calcula índice de confiança para um jogo."""
-        score = 0
-        fatores = {}
-
-        # 1. Frequência (0-20 pontos)
-        freq = self.calcular_frequencias()
-        media_freq = sum(freq.values()) / 60 if freq else 0
-        freq_jogo = sum(freq.get(d, 0) for d in dezenas) / 6
-        fator_freq = min(20, (freq_jogo / media_freq) * 10) if media_freq > 0 else 10
-        score += fator_freq
-        fatores['frequencia'] = round(fator_freq, 1)
-
-        # 2. Soma ideal (0-20 pontos)
-        soma_analise = self.analise_soma()
-        soma_jogo = sum(dezenas)
-        faixa_min, faixa_max = soma_analise['faixa_ideal']
-        if faixa_min <= soma_jogo <= faixa_max:
-            fator_soma = 20
-        else:
-            distancia = min(abs(soma_jogo - faixa_min), abs(soma_jogo - faixa_max))
-            fator_soma = max(0, 20 - distancia)
-        score += fator_soma
-        fatores['soma'] = round(fator_soma, 1)
-
-        # 3. Balanceamento par/ímpar (0-15 pontos)
-        pares = sum(1 for d in dezenas if d % 2 == 0)
-        if pares == 3:
-            fator_bal = 15
-        elif pares in [2, 4]:
-            fator_bal = 10
-        else:
-            fator_bal = 5
-        score += fator_bal
-        fatores['balanceamento'] = fator_bal
-
-        # 4. Distribuição por quadrante (0-15 pontos)
-        quads = [0, 0, 0, 0]
-        for d in dezenas:
-            if d <= 15: quads[0] += 1
-            elif d <= 30: quads[1] += 1
-            elif d <= 45: quads[2] += 1
-            else: quads[3] += 1
-
-        zeros = quads.count(0)
-        if zeros == 0:
-            fator_dist = 15
-        elif zeros == 1:
-            fator_dist = 10
-        else:
-            fator_dist = 5
-        score += fator_dist
-        fatores['distribuicao'] = fator_dist
-
-        # 5. Consecutivos moderados (0-15 pontos)
-        dezenas_ord = sorted(dezenas)
-        consecutivos = sum(1 for i in range(5) if dezenas_ord[i + 1] - dezenas_ord[i] == 1)
-        if consecutivos in [1, 2]:
-            fator_cons = 15
-        elif consecutivos == 0:
-            fator_cons = 10
-        else:
-            fator_cons = 5
-        score += fator_cons
-        fatores['consecutivos'] = fator_cons
-
-        # 6. Atraso dos números (0-15 pontos)
-        atrasos = self.calcular_atrasos()
-        media_atraso = sum(atrasos.get(d, 0) for d in dezenas) / 6
-        if 3 <= media_atraso <= 8:
-            fator_atraso = 15
-        elif media_atraso < 3:
-            fator_atraso = 10
-        else:
-            fator_atraso = 5
-        score += fator_atraso
-        fatores['atraso'] = fator_atraso
-
-        # Classificação
-        if score >= 85:
-            classificacao = "Excelente"
-            cor = "#22c55e"
-        elif score >= 70:
-            classificacao = "Bom"
-            cor = "#84cc16"
-        elif score >= 55:
-            classificacao = "Regular"
-            cor = "#eab308"
-        else:
-            classificacao = "Fraco"
-            cor = "#ef4444"
-
-        return {
-            'score': round(score, 1),
-            'maximo': 100,
-            'percentual': round(score, 1),
-            'classificacao': classificacao,
-            'cor': cor,
-            'fatores': fatores
-        }
-
-
-class GeradorJogos:
-    def __init__(self, analisador: AnalisadorMegaSena, rng: Optional[random.Random] = None):
-        self.analisador = analisador
-        # Usar seed combinando tempo + bytes aleatorios do sistema
-        seed = int.from_bytes(os.urandom(8), 'big') ^ time.time_ns()
-        self.rng = rng or random.Random(seed)
-
-    def _faixa(self, dezena: int) -> int:
-        for idx, (inicio, fim) in enumerate(FAIXAS):
-            if inicio <= dezena <= fim:
-                return idx
-        return -1
-
-    def _verificar_balanceamento(self, dezenas: List[int]) -> bool:
-        pares = sum(1 for d in dezenas if d % 2 == 0)
-        if pares != 3:
-            return False
-        faixas = [self._faixa(d) for d in dezenas]
-        for i in range(len(FAIXAS)):
-            count = faixas.count(i)
-            if count < 1 or count > 3:
-                return False
-        return True
-
-    def gerar_uniforme(self, numeros_fixos: Set[int] = None, numeros_removidos: Set[int] = None) -> List[int]:
-        numeros_fixos = numeros_fixos or set()
-        numeros_removidos = numeros_removidos or set()
-
-        disponiveis = [d for d in range(DEZENA_MIN, DEZENA_MAX + 1)
-                       if d not in numeros_removidos and d not in numeros_fixos]
-
-        faltam = TAMANHO_JOGO - len(numeros_fixos)
-        if faltam > len(disponiveis):
-            faltam = len(disponiveis)
+# Importar formato compacto de conjuntos de jogos
+from formato_jogos import (
+    PARQUET_DISPONIVEL, ConjuntoJogos, carregar_jogos, distribuicao_acertos as distribuicao_acertos_conjunto,
+    exportar_parquet, gerar_bytes_jogos, importar_parquet, jogos_para_mascaras
+)
 
-        escolhidos = list(numeros_fixos) + self.rng.sample(disponiveis, faltam)
-        return sorted(escolhidos)[:TAMANHO_JOGO]
+# Importar paginacao de listas grandes de jogos
+from paginacao_jogos import TAMANHOS_PAGINA, Pagina, filtrar_jogos, html_jogos, interpretar_busca, paginar
 
-    def gerar_por_scores(self, pesos: Dict[str, float], forcar_balanceamento: bool = False,
-                         numeros_fixos: Set[int] = None, numeros_removidos: Set[int] = None,
-                         max_tentativas: int = 500) -> List[int]:
-        numeros_fixos = numeros_fixos or set()
-        numeros_removidos = numeros_removidos or set()
+# Importar instrumentacao dos caminhos criticos
+from instrumentacao import coletor_atual, contar, cronometrado, iniciar_execucao, medir
 
-        scores_freq = self.analisador.scores_frequencia() if pesos.get('frequencia', 0) > 0 else {}
-        scores_markov = self.analisador.scores_markov() if pesos.get('markov', 0) > 0 else {}
-        scores_cooc = self.analisador.scores_coocorrencia() if pesos.get('coocorrencia', 0) > 0 else {}
-        scores_atraso = self.analisador.scores_atraso() if pesos.get('atraso', 0) > 0 else {}
+# Importar perfil opcional de reruns lentos
+from perfil_reruns import PerfilRerun
 
-        scores_combinados = {}
-        for d in range(DEZENA_MIN, DEZENA_MAX + 1):
-            if d in numeros_removidos:
-                scores_combinados[d] = 0
-            else:
-                score = ScoreDezena(
-                    dezena=d,
-                    frequencia=scores_freq.get(d, 0),
-                    markov=scores_markov.get(d, 0),
-                    coocorrencia=scores_cooc.get(d, 0),
-                    atraso=scores_atraso.get(d, 0)
-                )
-                scores_combinados[d] = score.score_total(pesos)
+# Importar metricas Prometheus (endpoint /metrics opcional)
+from metricas import iniciar_servidor
 
-        dezenas = [d for d in range(DEZENA_MIN, DEZENA_MAX + 1) if d not in numeros_removidos and d not in numeros_fixos]
-        pesos_escolha = [scores_combinados.get(d, 0) + 0.1 for d in dezenas]
+# Importar verificador compartilhado de novos concursos
+from verificador_atualizacao import VerificadorAtualizacao
 
-        faltam = TAMANHO_JOGO - len(numeros_fixos)
+# Importar busca paralela de fechamentos
+from fechamento import executar_busca_paralela, obter_pool
 
-        for _ in range(max_tentativas):
-            escolhidas: Set[int] = set(numeros_fixos)
-            tentativas_internas = 0
-            while len(escolhidas) < TAMANHO_JOGO and tentativas_internas < 100:
-                if dezenas and pesos_escolha:
-                    escolha = self.rng.choices(dezenas, weights=pesos_escolha, k=1)[0]
-                    escolhidas.add(escolha)
-                tentativas_internas += 1
+# Importar calculo exato de retorno
+from probabilidade_exata import analisar_lote
 
-            if len(escolhidas) < TAMANHO_JOGO:
-                continue
+# Importar simulacao das estrategias de geracao
+from simulacao_estrategias import Estrategia, simular_estrategia
 
-            jogo = sorted(escolhidas)
-            if not forcar_balanceamento or self._verificar_balanceamento(jogo):
-                return jogo
+# Importar back-test walk-forward
+from backtest import executar_backtest
 
-        return self.gerar_uniforme(numeros_fixos, numeros_removidos)
+# Importar indice invertido de premiacoes passadas
+from indice_acertos import IndiceAcertos
 
-    def gerar_jogos(self, quantidade: int, algoritmos: List[str], forcar_balanceamento: bool = False,
-                    numeros_fixos: Set[int] = None, numeros_removidos: Set[int] = None) -> Tuple[List[List[int]], List[str]]:
-        """
-        Gera jogos com lógica inteligente:
-        - Se quantidade <= algoritmos selecionados: 1 jogo PURO por algoritmo
-        - Se quantidade > algoritmos: primeiro 1 puro de cada, depois mistura
+# Importar snapshot imutavel das estatisticas
+from estatisticas import ARQUIVO_SNAPSHOT, SnapshotEstatisticas, carregar_snapshot, criar_snapshot, versao_dados
 
-        Retorna: (lista_jogos, lista_algoritmos_usados)
-        """
-        jogos = []
-        algoritmos_usados = []
-        jogos_gerados: Set[tuple] = set()
-
-        # Separar algoritmos de score dos outros
-        algoritmos_score = [a for a in algoritmos if a in ['frequencia', 'markov', 'coocorrencia', 'atraso']]
-        tem_balanceado = 'balanceado' in algoritmos
-        tem_uniforme = 'uniforme' in algoritmos
-
-        # FASE 1: Gerar 1 jogo PURO para cada algoritmo selecionado
-        for alg in algoritmos_score:
-            if len(jogos) >= quantidade:
-                break
-
-            pesos_puro = {
-                'frequencia': 1.0 if alg == 'frequencia' else 0,
-                'markov': 1.0 if alg == 'markov' else 0,
-                'coocorrencia': 1.0 if alg == 'coocorrencia' else 0,
-                'atraso': 1.0 if alg == 'atraso' else 0,
-            }
+# Importar gerenciador de tarefas em segundo plano
+from tarefas import GerenciadorTarefas, Tarefa, CANCELADA, ERRO
 
-            tentativas = 0
-            while tentativas < 50:
-                tentativas += 1
-                usar_bal = tem_balanceado or forcar_balanceamento
-                jogo = self.gerar_por_scores(pesos_puro, usar_bal, numeros_fixos, numeros_removidos)
-                jogo_tuple = tuple(jogo)
-                if jogo_tuple not in jogos_gerados:
-                    jogos_gerados.add(jogo_tuple)
-                    jogos.append(jogo)
-                    algoritmos_usados.append(alg.capitalize())
-                    break
-
-        # Jogo balanceado puro (se selecionado e ainda tem espaço)
-        if tem_balanceado and len(jogos) < quantidade and not algoritmos_score:
-            tentativas = 0
-            while tentativas < 50:
-                tentativas += 1
-                jogo = self.gerar_uniforme(numeros_fixos, numeros_removidos)
-                if self._verificar_balanceamento(jogo):
-                    jogo_tuple = tuple(jogo)
-                    if jogo_tuple not in jogos_gerados:
-                        jogos_gerados.add(jogo_tuple)
-                        jogos.append(jogo)
-                        algoritmos_usados.append("Balanceado")
-                        break
-
-        # Jogo uniforme puro (se selecionado e ainda tem espaço)
-        if tem_uniforme and len(jogos) < quantidade:
-            tentativas = 0
-            while tentativas < 50:
-                tentativas += 1
-                jogo = self.gerar_uniforme(numeros_fixos, numeros_removidos)
-                jogo_tuple = tuple(jogo)
-                if jogo_tuple not in jogos_gerados:
-                    jogos_gerados.add(jogo_tuple)
-                    jogos.append(jogo)
-                    algoritmos_usados.append("Aleatório")
-                    break
-
-        # FASE 2: Gerar jogos MISTURADOS (se ainda precisa de mais)
-        if len(jogos) < quantidade and algoritmos_score:
-            peso_base = 1.0 / len(algoritmos_score)
-            pesos_mix = {
-                'frequencia': peso_base if 'frequencia' in algoritmos_score else 0,
-                'markov': peso_base if 'markov' in algoritmos_score else 0,
-                'coocorrencia': peso_base if 'coocorrencia' in algoritmos_score else 0,
-                'atraso': peso_base if 'atraso' in algoritmos_score else 0,
-            }
+# Importar nucleo compartilhado (modelo, carga, analisador, geradores)
+from nucleo.modelo import DEZENA_MAX, DEZENA_MIN, Concurso, JogoSalvo
+from nucleo.carga import carregar_resultados_excel as ler_resultados_excel, concursos_de_registros, gravar_registro
+from nucleo.analisador import AnalisadorMegaSena
+from nucleo.gerador import GeradorFechamento, GeradorJogos
 
-            tentativas = 0
-            while len(jogos) < quantidade and tentativas < quantidade * 10:
-                tentativas += 1
-                usar_bal = tem_balanceado or forcar_balanceamento
-                jogo = self.gerar_por_scores(pesos_mix, usar_bal, numeros_fixos, numeros_removidos)
-                jogo_tuple = tuple(jogo)
-                if jogo_tuple not in jogos_gerados:
-                    jogos_gerados.add(jogo_tuple)
-                    jogos.append(jogo)
-                    algoritmos_usados.append("Misto")
-
-        # Fallback: completar com uniforme se ainda faltam jogos
-        tentativas = 0
-        while len(jogos) < quantidade and tentativas < quantidade * 5:
-            tentativas += 1
-            jogo = self.gerar_uniforme(numeros_fixos, numeros_removidos)
-            jogo_tuple = tuple(jogo)
-            if jogo_tuple not in jogos_gerados:
-                jogos_gerados.add(jogo_tuple)
-                jogos.append(jogo)
-                algoritmos_usados.append("Aleatório")
-
-        return jogos, algoritmos_usados
-
-
-class GeradorFechamento:
-    """Gera fechamentos/desdobramentos para garantir premiacoes."""
-
-    @staticmethod
-    def gerar_fechamento(dezenas_base: List[int], garantia: int = 4) -> List[List[int]]:
-        """
-        Gera um fechamento a partir de dezenas base.
-        garantia: 4 = garantir quadra, 5 = garantir quina, 6 = garantir sena
-        """
-        if len(dezenas_base) < 6:
-            return [sorted(dezenas_base)]
-
-        if len(dezenas_base) == 6:
-            return [sorted(dezenas_base)]
-
-        # Gerar todas as combinacoes de 6 numeros
-        todas_combinacoes = list(itertools.combinations(sorted(dezenas_base), 6))
-
-        if garantia == 6:
-            # Para garantir sena, precisa de todas as combinacoes
-            return [list(c) for c in todas_combinacoes]
-
-        # Fechamento otimizado para garantir quadra ou quina
-        jogos_selecionados = []
-        combinacoes_cobertas = set()
-
-        # Gerar subconjuntos que precisam ser cobertos
-        tamanho_cobertura = garantia
-        subconjuntos_necessarios = set(itertools.combinations(sorted(dezenas_base), tamanho_cobertura))
-
-        for combo in todas_combinacoes:
-            # Verificar quais subconjuntos esta combinacao cobre
-            subs_cobertos = set(itertools.combinations(combo, tamanho_cobertura))
-            novos_cobertos = subs_cobertos - combinacoes_cobertas
-
-            if novos_cobertos:
-                jogos_selecionados.append(list(combo))
-                combinacoes_cobertas.update(subs_cobertos)
-
-                if combinacoes_cobertas >= subconjuntos_necessarios:
-                    break
-
-        return jogos_selecionados
-
-    @staticmethod
-    def info_fechamento(num_dezenas: int) -> Dict[str, int]:
-        """Retorna informacoes sobre o fechamento."""
-        from math import comb
-        total_jogos = comb(num_dezenas, 6)
-
-        # Estimativas de jogos necessarios para cada garantia
-        # (valores aproximados baseados em tabelas de fechamento)
-        fechamentos = {
-            7: {'total': 7, 'quadra': 4, 'quina': 6, 'sena': 7},
-            8: {'total': 28, 'quadra': 6, 'quina': 12, 'sena': 28},
-            9: {'total': 84, 'quadra': 9, 'quina': 30, 'sena': 84},
-            10: {'total': 210, 'quadra': 14, 'quina': 50, 'sena': 210},
-            11: {'total': 462, 'quadra': 20, 'quina': 77, 'sena': 462},
-            12: {'total': 924, 'quadra': 27, 'quina': 132, 'sena': 924},
-            13: {'total': 1716, 'quadra': 35, 'quina': 210, 'sena': 1716},
-            14: {'total': 3003, 'quadra': 45, 'quina': 315, 'sena': 3003},
-            15: {'total': 5005, 'quadra': 56, 'quina': 455, 'sena': 5005},
-            16: {'total': 8008, 'quadra': 70, 'quina': 640, 'sena': 8008},
-        }
+# Importar estilos premium
+from styles import (
+    get_premium_styles,
+    criar_bolas_jogo,
+    criar_kpi_card,
+    criar_numeros_grandes,
+    mascara_dezenas,
+    volante_mascara,
+)
 
-        return fechamentos.get(num_dezenas, {'total': total_jogos, 'quadra': '?', 'quina': '?', 'sena': total_jogos})
+# Constantes
+ARQUIVO_JOGOS_SALVOS = "jogos_salvos.json"
 
 
 def carregar_jogos_salvos() -> List[JogoSalvo]:
@@ -877,7 +142,7 @@ def carregar_jogos_salvos() -> List[JogoSalvo]:
 def salvar_jogos(jogos: List[JogoSalvo]):
     """Salva jogos no Supabase (usado apenas para compatibilidade)."""
     # Esta funcao agora é usada apenas para operacoes de lote
-    # Jogos individuais sao salvos com salvar_jogo_db()
+    # Jogos individuais sao salvos com supabase_client.salvar_jogo()
     pass
 
 
@@ -886,6 +151,7 @@ def proximo_id_jogo(jogos: List[JogoSalvo]) -> int:
     return 0  # Supabase gera IDs automaticamente
 
 
+@cronometrado
 def buscar_concurso_caixa(numero: int = None) -> Dict:
     """Busca um concurso especifico ou o ultimo da API da Caixa."""
     try:
@@ -901,6 +167,7 @@ def buscar_concurso_caixa(numero: int = None) -> Dict:
     return None
 
 
+@cronometrado
 def buscar_todos_concursos_novos(ultimo_local: int, limite: int = 10) -> List[Dict]:
     """Busca concursos novos desde o ultimo local (maximo de 'limite' por vez)."""
     novos = []
@@ -953,19 +220,34 @@ def converter_concurso_caixa(dados: Dict) -> Dict:
         return None
 
 
-def atualizar_arquivo_resultados(caminho: str = "resultados.xlsx") -> Tuple[bool, str, int]:
+def caminho_registro(caminho: str = "resultados.xlsx") -> Path:
+    """Registro binario canonico ao lado do xlsx (resultados.xlsx -> resultados.bin)."""
+    return Path(caminho).with_suffix(".bin")
+
+
+def garantir_registro(caminho: str = "resultados.xlsx") -> Path:
     """
-    Atualiza o arquivo de resultados com novos concursos da Caixa.
+    Cria o registro a partir do xlsx existente na primeira vez (migracao unica).
+    A gravacao e atomica: sessoes simultaneas nunca veem um registro vazio ou pela metade.
+    Sem xlsx, o registro nasce no primeiro anexar().
+    """
+    registro = caminho_registro(caminho)
+    if not registro.exists() and Path(caminho).exists():
+        gravar_registro(registro, carregar_resultados_excel(caminho))
+    return registro
+
+
+@cronometrado
+def atualizar_arquivo_resultados(caminho: str = "resultados.xlsx",
+                                 exportar_xlsx: bool = False) -> Tuple[bool, str, int]:
+    """
+    Atualiza o registro de resultados com novos concursos da Caixa.
+    Os concursos sao anexados ao registro binario; o xlsx so e regravado com exportar_xlsx=True.
     Retorna: (sucesso, mensagem, quantidade_novos)
     """
     try:
-        # Carregar dados existentes
-        if Path(caminho).exists():
-            df = pd.read_excel(caminho)
-            ultimo_local = int(df['concurso'].max()) if 'concurso' in df.columns else 0
-        else:
-            df = pd.DataFrame(columns=['concurso', 'data', 'dezena1', 'dezena2', 'dezena3', 'dezena4', 'dezena5', 'dezena6'])
-            ultimo_local = 0
+        registro = garantir_registro(caminho)
+        ultimo_local = registro_concursos.ultimo_numero(registro)
 
         # Buscar novos concursos
         novos = buscar_todos_concursos_novos(ultimo_local)
@@ -973,23 +255,25 @@ def atualizar_arquivo_resultados(caminho: str = "resultados.xlsx") -> Tuple[bool
         if not novos:
             return True, "Base de dados ja esta atualizada!", 0
 
-        # Converter e adicionar novos concursos
+        # Converter novos concursos
         novos_convertidos = []
         for c in novos:
             convertido = converter_concurso_caixa(c)
-            if convertido:
-                novos_convertidos.append(convertido)
-
-        if novos_convertidos:
-            df_novos = pd.DataFrame(novos_convertidos)
-            df = pd.concat([df, df_novos], ignore_index=True)
-            df = df.drop_duplicates(subset=['concurso'], keep='last')
-            df = df.sort_values('concurso')
-
-            # Salvar arquivo
-            df.to_excel(caminho, index=False)
+            if not convertido:
+                continue
+            try:
+                data = dt.datetime.strptime(convertido['data'], "%d/%m/%Y").date()
+            except ValueError:
+                continue
+            dezenas = [convertido[f'dezena{i}'] for i in range(1, 7)]
+            if all(DEZENA_MIN <= d <= DEZENA_MAX for d in dezenas):
+                novos_convertidos.append((convertido['concurso'], data, dezenas))
 
-            return True, f"Adicionados {len(novos_convertidos)} novos concursos!", len(novos_convertidos)
+        adicionados = registro_concursos.anexar(registro, novos_convertidos)
+        if adicionados:
+            if exportar_xlsx:
+                registro_concursos.exportar_excel(registro, Path(caminho))
+            return True, f"Adicionados {adicionados} novos concursos!", adicionados
 
         return True, "Nenhum concurso novo encontrado.", 0
 
@@ -1008,103 +292,172 @@ def verificar_atualizacao_automatica(caminho: str = "resultados.xlsx") -> Tuple[
             return False, 0
 
         ultimo_disponivel = ultimo.get('numero', 0)
-
-        if Path(caminho).exists():
-            df = pd.read_excel(caminho)
-            ultimo_local = int(df['concurso'].max()) if 'concurso' in df.columns else 0
-        else:
-            ultimo_local = 0
+        # Apenas o cabecalho do registro e lido
+        ultimo_local = registro_concursos.ultimo_numero(garantir_registro(caminho))
 
         return ultimo_disponivel > ultimo_local, ultimo_disponivel
     except Exception:
         return False, 0
 
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
-def carregar_resultados_supabase(usar_ultimo_ano: bool = True) -> List[Concurso]:
-    """Carrega concursos do Supabase."""
+@cronometrado
+def buscar_resultados_supabase(usar_ultimo_ano: bool = True) -> List[Concurso]:
+    """Carrega concursos do Supabase (sem cache)."""
     try:
         if usar_ultimo_ano:
             dados = buscar_concursos_ultimo_ano()
         else:
             dados = buscar_todos_concursos()
 
-        concursos = []
-        for c in dados:
-            try:
-                numero = c.get('numero', 0)
-                data_str = c.get('data', '')
-
-                if isinstance(data_str, str):
-                    data = dt.datetime.strptime(data_str, "%Y-%m-%d").date()
-                else:
-                    data = data_str
-
-                dezenas = tuple(sorted([
-                    c.get('dezena1', 0),
-                    c.get('dezena2', 0),
-                    c.get('dezena3', 0),
-                    c.get('dezena4', 0),
-                    c.get('dezena5', 0),
-                    c.get('dezena6', 0),
-                ]))
-
-                if len(dezenas) == 6 and all(DEZENA_MIN <= d <= DEZENA_MAX for d in dezenas):
-                    concursos.append(Concurso(numero=numero, data=data, dezenas=dezenas))
-            except Exception:
-                continue
-
+        concursos = concursos_de_registros(dados)
+        contar("concursos_carregados", len(concursos))
         return concursos
     except Exception as e:
         st.error(f"Erro ao carregar do Supabase: {e}")
         return []
 
 
+@cronometrado
+def versao_supabase() -> Optional[int]:
+    """Numero do ultimo concurso no banco (consulta de uma linha)."""
+    ultimo = buscar_ultimo_concurso_db()
+    return ultimo['numero'] if ultimo else None
+
+
+@st.cache_resource
+def obter_cache_derivados() -> CacheDerivados:
+    """Snapshots e indices por versao do conjunto de dados."""
+    return CacheDerivados()
+
+
+@st.cache_resource
+def obter_cache_concursos() -> CacheConcursos:
+    """Cache de concursos do processo, compartilhado entre reruns e sessoes."""
+    return CacheConcursos(
+        buscar_resultados_supabase, versao_supabase, fabrica=Concurso,
+        diretorio_compartilhado=CACHE_CONCURSOS_DIR or None,
+        ao_descartar=obter_cache_derivados().descartar
+    )
+
+
+@st.cache_resource
+def obter_servidor_metricas():
+    """Servidor /metrics do processo (um para todas as sessoes); None se METRICAS_PORTA=0."""
+    if not METRICAS_PORTA:
+        return None
+    return iniciar_servidor(METRICAS_PORTA, METRICAS_ENDERECO)
+
+
+@st.cache_resource
+def obter_verificador_atualizacao() -> VerificadorAtualizacao:
+    """Verificacao de novos concursos na Caixa, uma por processo para todas as sessoes."""
+    return VerificadorAtualizacao(lambda: obter_cache_concursos().versao(True) or versao_supabase())
+
+
+def carregar_resultados_supabase(usar_ultimo_ano: bool = True) -> Tuple[Concurso, ...]:
+    """Concursos do Supabase via cache do processo (tupla somente leitura, sem copia)."""
+    return obter_cache_concursos().obter(usar_ultimo_ano)
+
+
 @st.cache_data
+@cronometrado
 def carregar_resultados_excel(caminho: str) -> List[Concurso]:
     """Fallback: Carrega concursos do Excel."""
-    df = pd.read_excel(caminho)
-    concursos = []
-
-    col_concurso = None
-    col_data = None
-    colunas_dezenas = []
-
-    for col in df.columns:
-        col_lower = str(col).lower().strip()
-        if col_lower == 'concurso':
-            col_concurso = col
-        elif col_lower in ('data', 'data do sorteio'):
-            col_data = col
-        elif 'dezena' in col_lower or 'bola' in col_lower:
-            colunas_dezenas.append(col)
-
-    colunas_dezenas = sorted(colunas_dezenas, key=lambda x: int(''.join(filter(str.isdigit, str(x))) or 0))
-
-    for _, linha in df.iterrows():
-        try:
-            numero = int(linha[col_concurso]) if col_concurso else 0
-            valor_data = linha[col_data]
-            if isinstance(valor_data, dt.datetime):
-                data = valor_data.date()
-            elif isinstance(valor_data, dt.date):
-                data = valor_data
-            else:
-                data = dt.datetime.strptime(str(valor_data), "%d/%m/%Y").date()
+    return ler_resultados_excel(Path(caminho))
 
-            dezenas = tuple(sorted(int(linha[c]) for c in colunas_dezenas[:6]))
 
-            if len(dezenas) == 6 and all(DEZENA_MIN <= d <= DEZENA_MAX for d in dezenas):
-                concursos.append(Concurso(numero=numero, data=data, dezenas=dezenas))
-        except Exception:
-            continue
+@st.cache_resource
+def obter_executor_processos() -> ProcessPoolExecutor:
+    """Pool de processos (fechamento, simulacoes), compartilhado entre reruns e sessoes."""
+    return obter_pool()
 
-    return concursos
 
+@cronometrado
+def obter_indice_acertos(versao: str, concursos: Sequence[Concurso]) -> IndiceAcertos:
+    """Indice invertido de premiacoes, reconstruido apenas quando o conjunto de dados muda."""
+    return obter_cache_derivados().obter(
+        versao, 'indice_acertos', lambda: IndiceAcertos(sorted(concursos, key=lambda c: c.data))
+    )
 
-def criar_volante_html(dezenas: List[int]) -> str:
-    """Cria um volante visual da Mega-Sena."""
-    html = """
+
+@cronometrado
+def obter_snapshot(versao: str, anos: Optional[int], concursos: Sequence[Concurso]) -> SnapshotEstatisticas:
+    """
+    Estatisticas de uma janela de anos (None = historico carregado inteiro).
+    Uma unica copia por servidor, compartilhada por todas as sessoes e descartada
+    junto com a versao dos dados; a janela tambem muda quando vira o dia.
+    """
+    hoje = dt.date.today()
+
+    def calcular() -> SnapshotEstatisticas:
+        filtrados = sorted(concursos, key=lambda c: c.data)
+        if anos is not None:
+            limite = hoje - dt.timedelta(days=anos * 365)
+            filtrados = [c for c in filtrados if c.data >= limite]
+        # Snapshot pre-calculado pela ingestao, se for exatamente destes concursos
+        if CACHE_CONCURSOS_DIR:
+            publicado = carregar_snapshot(Path(CACHE_CONCURSOS_DIR) / ARQUIVO_SNAPSHOT, Concurso)
+            if publicado is not None and publicado.versao == versao_dados(filtrados):
+                return publicado
+        return criar_snapshot(filtrados)
+
+    return obter_cache_derivados().obter(versao, ('snapshot', anos, hoje), calcular)
+
+
+@cronometrado
+def obter_analisador(concursos: Sequence[Concurso], anos: Optional[int] = None,
+                     versao: Optional[str] = None,
+                     indice_acertos: Optional[IndiceAcertos] = None) -> AnalisadorMegaSena:
+    """Analisador leve sobre o snapshot em cache da janela pedida."""
+    versao = versao or identificador_dados(concursos)
+    return AnalisadorMegaSena.de_snapshot(obter_snapshot(versao, anos, concursos), indice_acertos=indice_acertos)
+
+
+@st.cache_data
+def calcular_roi_exato(jogos: Tuple[Tuple[int, ...], ...]) -> Dict[str, Any]:
+    """Analise exata de um conjunto de jogos (memorizada pelos jogos)."""
+    return analisar_lote([list(j) for j in jogos])
+
+
+@st.cache_resource
+def obter_gerenciador_tarefas() -> GerenciadorTarefas:
+    """Fila de calculos longos, compartilhada entre reruns e sessoes."""
+    return GerenciadorTarefas(ttl=1800)
+
+
+@st.fragment(run_every=0.5)
+def progresso_tarefa(chave: str, texto: str, chave_cancelar: str):
+    """
+    Barra de progresso que se atualiza sozinha (so o fragmento reexecuta).
+    Quando a tarefa termina, pede um rerun da pagina para exibir o resultado.
+    """
+    tarefa = obter_gerenciador_tarefas().obter(chave)
+    if tarefa is None or tarefa.finalizada:
+        st.rerun()
+    st.progress(tarefa.progresso, text=texto)
+    if st.button("⛔ Cancelar", key=chave_cancelar):
+        tarefa.cancelar()
+
+
+def acompanhar_tarefa(tarefa: Optional[Tarefa], texto: str, chave_cancelar: str) -> bool:
+    """
+    Mostra o progresso de uma tarefa em andamento sem interromper o resto da pagina.
+    Retorna True quando a tarefa terminou (com resultado, cancelada ou com erro).
+    """
+    if tarefa is None:
+        return False
+    if tarefa.finalizada:
+        if tarefa.status == ERRO:
+            st.error(f"Erro no calculo: {tarefa.erro}")
+        elif tarefa.status == CANCELADA:
+            st.warning("Calculo cancelado. Exibindo resultado parcial.")
+        return True
+
+    progresso_tarefa(tarefa.chave, texto, chave_cancelar)
+    return False
+
+
+CSS_VOLANTE = """
     <style>
         .volante {
             display: grid;
@@ -1132,42 +485,126 @@ def criar_volante_html(dezenas: List[int]) -> str:
             box-shadow: 0 2px 4px rgba(0,0,0,0.3);
         }
     </style>
-    <div class="volante">
+"""
+
+
+def exibir_painel_instrumentacao(historico: int = 20):
+    """Painel de debug com os tempos do rerun atual e JSON dos ultimos reruns da sessao."""
+    coletor = coletor_atual()
+    if coletor is None:
+        return
+    execucoes = st.session_state.setdefault('instrumentacao_execucoes', [])
+    execucoes.append(coletor.para_dict())
+    del execucoes[:-historico]
+
+    with st.expander(f"⏱️ Instrumentação do rerun: {coletor.duracao_ms:.0f} ms", expanded=False):
+        resumo = coletor.resumo()
+        if resumo:
+            st.markdown("**Por ponto medido**")
+            st.dataframe(pd.DataFrame(resumo).round(2), hide_index=True, use_container_width=True)
+            st.markdown("**Linha do tempo**")
+            st.dataframe(pd.DataFrame([
+                {'trecho': "  " * t.profundidade + t.nome, 'inicio_ms': round(t.inicio_ms, 2),
+                 'duracao_ms': round(t.duracao_ms, 2), 'erro': t.erro}
+                for t in sorted(coletor.trechos, key=lambda t: t.inicio_ms)
+            ]), hide_index=True, use_container_width=True)
+        if coletor.contadores:
+            st.markdown("**Contadores**")
+            st.json(dict(coletor.contadores))
+        st.download_button(
+            "📥 Baixar JSON (últimos reruns)",
+            data=json.dumps(execucoes, ensure_ascii=False, indent=2),
+            file_name="instrumentacao.json",
+            mime="application/json"
+        )
+
+
+def parametros_sessao() -> Dict[str, Any]:
+    """Configuracao da sessao que influencia o custo do rerun (gravada junto com o perfil)."""
+    estado = st.session_state
+    checkboxes = {'chk_freq': 'frequencia', 'chk_markov': 'markov', 'chk_bal': 'balanceado',
+                  'chk_atraso': 'atraso', 'chk_cooc': 'coocorrencia', 'chk_unif': 'uniforme'}
+    return {
+        'anos': estado.get('anos_slider'),
+        'algoritmos': [alg for chave, alg in checkboxes.items() if estado.get(chave)],
+        'quantidade_jogos': estado.get('qtd_input'),
+        'jogos_na_sessao': len(estado.get('jogos_gerados', [])),
+        'fechamento_dezenas': len(estado.get('fechamento_dezenas') or []),
+        'fechamento_garantia': estado.get('fechamento_garantia'),
+        'fixos': len(estado.get('fixos_sel') or []),
+        'removidos': len(estado.get('removidos_sel') or []),
+        'tarefas': {chave: estado[chave] for chave in ('tarefa_fechamento', 'tarefa_monte_carlo', 'tarefa_backtest',
+                                                      'tarefa_simulador', 'tarefa_estrategia') if estado.get(chave)},
+    }
+
+
+def dados_instrumentacao() -> Dict[str, Any]:
+    coletor = coletor_atual()
+    return {'instrumentacao': coletor.para_dict()} if coletor else {}
+
+
+def criar_volante_html(dezenas: List[int]) -> str:
+    """Cria um volante visual da Mega-Sena (celulas pre-renderizadas, memoizadas pela mascara)."""
+    return f'{CSS_VOLANTE}<div class="volante">{volante_mascara(mascara_dezenas(dezenas), simples=True)}</div>'
+
+
+@cronometrado
+def controles_paginacao(chave: str, mascaras: np.ndarray) -> Pagina:
     """
+    Busca por dezenas e navegacao por paginas de uma lista de jogos.
+    O filtro roda sobre as mascaras; so os indices da pagina visivel sao devolvidos.
+    """
+    chave_pagina = f"{chave}_pagina"
 
-    for i in range(1, 61):
-        classe = "numero marcado" if i in dezenas else "numero"
-        html += f'<div class="{classe}">{i:02d}</div>'
+    def voltar_primeira_pagina():
+        st.session_state[chave_pagina] = 1
 
-    html += "</div>"
-    return html
+    col_b, col_t, col_p = st.columns([3, 1, 1])
+    with col_b:
+        busca = st.text_input("🔍 Buscar dezenas", key=f"{chave}_busca", on_change=voltar_primeira_pagina,
+                              placeholder="ex.: 05 12 -33 (com 05 e 12, sem 33)")
+    with col_t:
+        tamanho = st.selectbox("Jogos por página", TAMANHOS_PAGINA, key=f"{chave}_tamanho",
+                               on_change=voltar_primeira_pagina)
 
+    contem, exclui = interpretar_busca(busca)
+    indices = filtrar_jogos(mascaras, contem, exclui)
+    pagina = paginar(indices, st.session_state.get(chave_pagina, 1), tamanho)
+    # Mantem o widget dentro do intervalo valido quando o filtro reduz o total
+    st.session_state[chave_pagina] = pagina.numero
+
+    with col_p:
+        st.number_input(f"Página (de {pagina.total_paginas})", min_value=1,
+                        max_value=pagina.total_paginas, step=1, key=chave_pagina)
+
+    if pagina.total_filtrado:
+        st.caption(f"Mostrando {pagina.inicio + 1}–{pagina.inicio + len(pagina.indices)} "
+                   f"de {pagina.total_filtrado} jogos"
+                   + (f" (filtrados de {len(mascaras)})" if pagina.total_filtrado != len(mascaras) else ""))
+    else:
+        st.info("Nenhum jogo corresponde à busca.")
+    return pagina
 
-def gerar_excel_jogos(jogos: List[List[int]], algoritmos: List[str]) -> bytes:
-    """Gera arquivo Excel com os jogos."""
-    dados = []
-    for i, jogo in enumerate(jogos, 1):
-        linha = {'Jogo': i}
-        for j, d in enumerate(jogo, 1):
-            linha[f'Dezena {j}'] = d
-        linha['Pares'] = sum(1 for d in jogo if d % 2 == 0)
-        linha['Impares'] = 6 - linha['Pares']
-        dados.append(linha)
 
-    df = pd.DataFrame(dados)
+@cronometrado
+def gerar_excel_jogos(jogos: Iterable[List[int]], algoritmos: List[str]) -> bytes:
+    """Gera arquivo Excel com os jogos (escrita em streaming, memoria constante)."""
+    return gerar_excel_bytes(jogos, algoritmos)
 
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Jogos')
 
-        # Adicionar aba com info
-        info_df = pd.DataFrame({
-            'Informacao': ['Data de Geracao', 'Algoritmos Usados', 'Total de Jogos'],
-            'Valor': [dt.datetime.now().strftime('%d/%m/%Y %H:%M'), ', '.join(algoritmos), len(jogos)]
-        })
-        info_df.to_excel(writer, index=False, sheet_name='Info')
+@cronometrado
+def gerar_parquet_jogos(jogos: Iterable[List[int]], **metadados) -> bytes:
+    """Gera Parquet com os jogos (dezenas + mascara) e os metadados no schema."""
+    saida = io.BytesIO()
+    exportar_parquet(saida, jogos, **metadados)
+    return saida.getvalue()
 
-    return output.getvalue()
+
+def ler_conjunto_enviado(nome: str, dados: bytes) -> ConjuntoJogos:
+    """Carrega um conjunto de jogos enviado (.mjg ou .parquet)."""
+    if nome.lower().endswith(".parquet"):
+        return importar_parquet(dados)
+    return carregar_jogos(dados)
 
 
 def gerar_csv_jogos(jogos: List[List[int]]) -> str:
@@ -1185,6 +622,8 @@ def main():
         layout="wide",
         initial_sidebar_state="collapsed"
     )
+    iniciar_execucao("rerun")
+    obter_servidor_metricas()
 
     # Inicializar session state
     if 'jogos_gerados' not in st.session_state:
@@ -1211,31 +650,45 @@ def main():
 
     # Carregar dados do Supabase
     try:
-        concursos = carregar_resultados_supabase(usar_ultimo_ano=True)
+        with medir("main.carregar_concursos"):
+            concursos = carregar_resultados_supabase(usar_ultimo_ano=True)
+        if not concursos and INGESTAO_EXTERNA:
+            st.error("Nenhum concurso encontrado no banco. Aguardando o processo de ingestão.")
+            return
         if not concursos:
             st.warning("Nenhum concurso encontrado no banco. Sincronizando...")
             with st.spinner("🔄 Sincronizando com a Caixa..."):
                 novos, _, msg = sincronizar_com_caixa(dias_atras=365)
             if novos > 0:
-                st.cache_data.clear()
+                obter_cache_concursos().invalidar(True)
                 st.rerun()
             else:
                 st.error("Não foi possível carregar os dados.")
                 return
 
-        analisador_completo = AnalisadorMegaSena(concursos)
+        with medir("main.analisador_completo"):
+            identificador = obter_cache_concursos().identificador(True) or identificador_dados(concursos)
+            analisador_completo = obter_analisador(
+                concursos, versao=identificador, indice_acertos=obter_indice_acertos(identificador, concursos)
+            )
+
+        # Com ingestao externa, a pagina so informa (sem esperar pela Caixa); a sincronizacao roda fora dela
+        if INGESTAO_EXTERNA:
+            if obter_verificador_atualizacao().verificar_em_segundo_plano().ha_novos:
+                st.caption("🔄 Novo concurso disponível; os resultados serão atualizados em instantes.")
+            st.session_state.atualizacao_verificada = True
 
         # Verificar atualizações automaticamente
         if 'atualizacao_verificada' not in st.session_state:
             st.session_state.atualizacao_verificada = False
 
         if not st.session_state.atualizacao_verificada:
-            ha_novos, ultimo_local, ultimo_caixa = verificar_atualizacao()
-            if ha_novos:
+            if obter_verificador_atualizacao().verificar().ha_novos:
                 with st.spinner("🔄 Atualizando resultados..."):
                     novos, _, msg = sincronizar_com_caixa(dias_atras=30)
                 if novos > 0:
-                    st.cache_data.clear()
+                    # Descarta so os concursos e o que foi derivado deles
+                    obter_cache_concursos().invalidar(True)
                     st.session_state.atualizacao_verificada = True
                     st.rerun()
             st.session_state.atualizacao_verificada = True
@@ -1245,9 +698,11 @@ def main():
         st.info("Verifique as configurações no arquivo .env")
         return
 
+    gerenciador = obter_gerenciador_tarefas()
+
     # ===== CONTROLES INLINE (sem sidebar) =====
     # Filtrar dados por período padrão
-    analisador = analisador_completo.filtrar_por_anos(3)
+    analisador = obter_analisador(concursos, 3, identificador)
 
     # Variáveis de configuração com valores padrão
     anos = 3
@@ -1269,7 +724,7 @@ def main():
         with col_cfg1:
             st.markdown("**📅 Período**")
             anos = st.slider("Anos", 1, 10, 3, key="anos_slider")
-            analisador = analisador_completo.filtrar_por_anos(anos)
+            analisador = obter_analisador(concursos, anos, identificador)
             st.caption(f"📊 {len(analisador.concursos)} concursos")
 
         with col_cfg2:
@@ -1320,6 +775,20 @@ def main():
     numeros_fixos = set(numeros_fixos_sel)
     numeros_removidos = set(numeros_removidos_sel)
 
+    algoritmos_selecionados = []
+    if usar_frequencia:
+        algoritmos_selecionados.append('frequencia')
+    if usar_markov:
+        algoritmos_selecionados.append('markov')
+    if usar_coocorrencia:
+        algoritmos_selecionados.append('coocorrencia')
+    if usar_atraso:
+        algoritmos_selecionados.append('atraso')
+    if usar_balanceado:
+        algoritmos_selecionados.append('balanceado')
+    if usar_uniforme:
+        algoritmos_selecionados.append('uniforme')
+
     # Tabs principais
     tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
         "🎰 Gerar Jogos",
@@ -1331,7 +800,7 @@ def main():
         "✅ Conferir"
     ])
 
-    with tab1:
+    with tab1, medir("aba.gerar"):
         col1, col2 = st.columns([2, 1])
 
         with col1:
@@ -1342,19 +811,7 @@ def main():
                 st.warning(f"🔴 Numeros Removidos: {', '.join(f'{n:02d}' for n in sorted(numeros_removidos))}")
 
             if st.button("🍀 GERAR JOGOS", type="primary", use_container_width=True):
-                algoritmos = []
-                if usar_frequencia:
-                    algoritmos.append('frequencia')
-                if usar_markov:
-                    algoritmos.append('markov')
-                if usar_coocorrencia:
-                    algoritmos.append('coocorrencia')
-                if usar_atraso:
-                    algoritmos.append('atraso')
-                if usar_balanceado:
-                    algoritmos.append('balanceado')
-                if usar_uniforme:
-                    algoritmos.append('uniforme')
+                algoritmos = list(algoritmos_selecionados)
 
                 if not algoritmos:
                     st.warning("Selecione pelo menos um algoritmo!")
@@ -1363,6 +820,7 @@ def main():
                     jogos, algoritmos_por_jogo = gerador.gerar_jogos(
                         qtd_jogos, algoritmos, usar_balanceado, numeros_fixos, numeros_removidos
                     )
+                    contar("jogos_gerados", len(jogos))
 
                     st.session_state.jogos_gerados = jogos
                     st.session_state.algoritmos_por_jogo = algoritmos_por_jogo
@@ -1394,6 +852,14 @@ def main():
                         file_name=f"jogos_megasena_{dt.datetime.now().strftime('%Y%m%d_%H%M')}.csv",
                         mime="text/csv"
                     )
+                    st.download_button(
+                        label="📦 Baixar compacto (.mjg)",
+                        data=gerar_bytes_jogos(st.session_state.jogos_gerados,
+                                               algoritmos=st.session_state.algoritmos_usados,
+                                               criado_em=dt.datetime.now().isoformat()),
+                        file_name=f"jogos_megasena_{dt.datetime.now().strftime('%Y%m%d_%H%M')}.mjg",
+                        mime="application/octet-stream"
+                    )
 
                 with col_exp3:
                     if st.button("💾 Salvar Jogos"):
@@ -1503,7 +969,7 @@ def main():
                     pares_ult = sum(1 for d in analisador.ultimo_concurso.dezenas if d % 2 == 0)
                     st.markdown(criar_kpi_card(f"{pares_ult}/6", "Pares no Último", "⚖️"), unsafe_allow_html=True)
 
-    with tab2:
+    with tab2, medir("aba.estatisticas"):
         st.subheader("📊 Analise Estatistica")
 
         col1, col2, col3 = st.columns(3)
@@ -1533,6 +999,12 @@ def main():
                                    columns=['Par', 'Vezes juntos'])
             st.dataframe(df_pares, use_container_width=True, hide_index=True)
 
+            with st.expander("👨‍👩‍👦 Trios Frequentes"):
+                trios = analisador.trios_mais_frequentes(10)
+                df_trios = pd.DataFrame([("-".join(f"{d:02d}" for d in t), c) for t, c in trios],
+                                        columns=['Trio', 'Vezes juntos'])
+                st.dataframe(df_trios, use_container_width=True, hide_index=True)
+
         # Graficos
         st.subheader("📈 Graficos")
 
@@ -1557,7 +1029,7 @@ def main():
             else:
                 st.info("Sem dados de atraso para exibir.")
 
-    with tab3:
+    with tab3, medir("aba.analises"):
         st.subheader("🎲 Probabilidades e Analise Avancada")
 
         st.markdown("""
@@ -1678,15 +1150,42 @@ def main():
 
         st.divider()
 
+        # Retorno exato (forma fechada)
+        st.markdown("### 🧮 Retorno Esperado Exato")
+        st.markdown("Calculo analitico (hipergeometrico) do retorno de uma aposta simples.")
+        roi_exato = analisador_completo.roi_exato()
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Valor Esperado", f"R$ {roi_exato['valor_esperado']:,.2f}",
+                      help=f"Custo da aposta: R$ {roi_exato['custo']:,.2f}")
+        with col2:
+            st.metric("ROI Exato", f"{roi_exato['roi']:.2f}%")
+        with col3:
+            st.metric("Desvio Padrao", f"R$ {roi_exato['desvio']:,.2f}")
+
+        st.divider()
+
         # Simulacao Monte Carlo
         st.markdown("### 🎰 Simulacao Monte Carlo")
-        st.markdown("Simulacao de milhares de jogos para calcular o retorno esperado.")
+        st.markdown("Simulacao de milhares de jogos para comparar com o retorno exato acima.")
 
-        num_simulacoes = st.slider("Numero de simulacoes:", 1000, 50000, 10000, step=1000)
+        num_simulacoes = st.select_slider(
+            "Numero de simulacoes:",
+            options=[10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000],
+            value=100_000,
+            format_func=lambda x: f"{x:,}".replace(',', '.')
+        )
 
         if st.button("🎲 Executar Simulacao", key="btn_monte_carlo"):
-            with st.spinner("Executando simulacao..."):
-                resultado_mc = analisador_completo.simulacao_monte_carlo(num_simulacoes)
+            tarefa_mc = gerenciador.submeter(
+                "monte_carlo", analisador_completo.simulacao_monte_carlo, num_simulacoes=num_simulacoes
+            )
+            st.session_state.tarefa_monte_carlo = tarefa_mc.chave
+
+        tarefa_mc = gerenciador.obter(st.session_state.get('tarefa_monte_carlo'))
+        if acompanhar_tarefa(tarefa_mc, "Executando simulacao...", "cancelar_monte_carlo") and tarefa_mc.resultado:
+            resultado_mc = tarefa_mc.resultado
 
             col1, col2 = st.columns(2)
             with col1:
@@ -1707,6 +1206,52 @@ def main():
 
         st.divider()
 
+        # Back-test walk-forward
+        st.markdown("### 🔬 Back-test dos Algoritmos")
+        st.markdown("""
+        Para cada concurso do **historico completo**, gera jogos usando **apenas os concursos
+        anteriores** e confere contra o resultado real. O p-valor indica se o algoritmo
+        acertou mais que o acaso.
+        """)
+
+        col_bt1, col_bt2 = st.columns(2)
+        with col_bt1:
+            jogos_backtest = st.slider("Jogos por algoritmo em cada concurso:", 1, 50, 10, key="jogos_backtest")
+        with col_bt2:
+            inicio_backtest = st.slider("Concursos iniciais (historico minimo):", 10, 500, 100,
+                                        key="inicio_backtest")
+
+        if st.button("🔬 Executar Back-test", key="btn_backtest"):
+            # O ultimo ano (~150 concursos) nao da poder estatistico ao teste: usa todo o historico
+            historico = carregar_resultados_supabase(usar_ultimo_ano=False)
+            if len(historico) <= inicio_backtest:
+                st.warning("Historico insuficiente para o back-test.")
+            else:
+                tarefa_bt = gerenciador.submeter(
+                    "backtest", partial(executar_backtest, historico),
+                    contexto=(len(historico), historico[-1].numero),
+                    jogos_por_algoritmo=jogos_backtest, inicio=inicio_backtest
+                )
+                st.session_state.tarefa_backtest = tarefa_bt.chave
+
+        tarefa_bt = gerenciador.obter(st.session_state.get('tarefa_backtest'))
+        if acompanhar_tarefa(tarefa_bt, "Executando back-test...", "cancelar_backtest") and tarefa_bt.resultado:
+            df_bt = pd.DataFrame([
+                {
+                    'Algoritmo': alg.capitalize(),
+                    'Concursos': r['concursos'],
+                    'Media de acertos': round(r['media_acertos'], 4),
+                    'Acaso': round(r['media_nula'], 4),
+                    'Quadras+': sum(r['distribuicao'][k] for k in (4, 5, 6)),
+                    'Quadras+ esperadas': round(sum(r['esperado'][k] for k in (4, 5, 6)), 1),
+                    'p-valor': round(r['p_valor'], 4),
+                }
+                for alg, r in tarefa_bt.resultado.items()
+            ])
+            st.dataframe(df_bt, use_container_width=True, hide_index=True)
+
+        st.divider()
+
         # Indice de Confianca para um jogo
         st.markdown("### 📋 Indice de Confianca de um Jogo")
         st.markdown("Avalie a qualidade estatistica de um jogo especifico.")
@@ -1735,7 +1280,7 @@ def main():
             for fator, valor in ic['fatores'].items():
                 st.write(f"- **{fator.replace('_', ' ').title()}**: {valor:.1f}/100")
 
-    with tab4:
+    with tab4, medir("aba.fechamento"):
         st.subheader("🔒 Fechamento / Desdobramento")
 
         st.markdown("""
@@ -1750,15 +1295,17 @@ def main():
 
             todos_nums = [f"{i:02d}" for i in range(1, 61)]
             dezenas_fechamento_sel = st.multiselect(
-                "Selecione as dezenas (7 a 15 numeros):",
+                "Selecione as dezenas (7 a 20 numeros):",
                 options=todos_nums,
                 default=[],
-                help="Selecione entre 7 e 15 numeros para o fechamento"
+                key="fechamento_dezenas",
+                help="Selecione entre 7 e 20 numeros para o fechamento"
             )
 
             garantia = st.selectbox(
                 "Garantia minima:",
                 options=[4, 5, 6],
+                key="fechamento_garantia",
                 format_func=lambda x: {4: "Quadra (4 acertos)", 5: "Quina (5 acertos)", 6: "Sena (6 acertos)"}[x]
             )
 
@@ -1780,34 +1327,90 @@ def main():
 
             if len(dezenas_list) < 7:
                 st.warning("Minimo de 7 numeros para fechamento!")
-            elif len(dezenas_list) > 15:
-                st.warning("Maximo de 15 numeros para fechamento (para evitar muitos jogos)!")
+            elif len(dezenas_list) > 20:
+                st.warning("Maximo de 20 numeros para fechamento (para evitar muitos jogos)!")
+            elif garantia == 6 and len(dezenas_list) > 15:
+                st.warning("Garantia de sena com mais de 15 numeros gera jogos demais!")
             else:
                 st.info(f"📊 {len(dezenas_list)} numeros selecionados: {', '.join(f'{d:02d}' for d in sorted(dezenas_list))}")
 
                 if st.button("🔒 Gerar Fechamento", type="primary"):
-                    with st.spinner("Gerando fechamento..."):
-                        jogos_fechamento = GeradorFechamento.gerar_fechamento(dezenas_list, garantia)
-
-                    st.success(f"✅ Fechamento gerado com {len(jogos_fechamento)} jogos!")
-                    st.caption(f"Garantia: {'Quadra' if garantia == 4 else 'Quina' if garantia == 5 else 'Sena'}")
-
-                    # Exportar
-                    col_e1, col_e2 = st.columns(2)
-                    with col_e1:
-                        excel_fech = gerar_excel_jogos(jogos_fechamento, [f'Fechamento {garantia}'])
-                        st.download_button(
-                            "📥 Baixar Fechamento (Excel)",
-                            data=excel_fech,
-                            file_name=f"fechamento_{len(dezenas_list)}dez_{garantia}garantia.xlsx"
+                    if garantia == 6:
+                        # Sena exige todas as combinacoes: nao ha o que otimizar
+                        tarefa_fech = gerenciador.submeter(
+                            "fechamento_completo", GeradorFechamento.gerar_fechamento,
+                            dezenas_base=sorted(dezenas_list), garantia=garantia
                         )
+                    else:
+                        tarefa_fech = gerenciador.submeter(
+                            "fechamento", partial(executar_busca_paralela, executor=obter_executor_processos()),
+                            dezenas_base=sorted(dezenas_list), garantia=garantia
+                        )
+                    st.session_state.tarefa_fechamento = tarefa_fech.chave
+
+        # Acompanhar busca em andamento (sobrevive aos reruns)
+        tarefa_fech = gerenciador.obter(st.session_state.get('tarefa_fechamento'))
+        resultado_fech = None
+        if acompanhar_tarefa(tarefa_fech, f"🔄 Otimizando fechamento em {os.cpu_count()} processos...",
+                             "cancelar_fechamento") and tarefa_fech.resultado:
+            resultado_fech = {
+                'dezenas': tarefa_fech.params['dezenas_base'],
+                'garantia': tarefa_fech.params['garantia'],
+                'jogos': tarefa_fech.resultado
+            }
 
-                    # Exibir jogos
-                    for i, jogo in enumerate(jogos_fechamento, 1):
-                        numeros_html = "".join([f'<span class="numero-grande">{d:02d}</span>' for d in jogo])
-                        st.markdown(f"**Jogo {i:02d}:** {numeros_html}", unsafe_allow_html=True)
+        if resultado_fech:
+            jogos_fechamento = resultado_fech['jogos']
+            garantia_fech = resultado_fech['garantia']
+            num_dezenas_fech = len(resultado_fech['dezenas'])
+
+            st.success(f"✅ Fechamento gerado com {len(jogos_fechamento)} jogos!")
+            st.caption(f"Garantia: {'Quadra' if garantia_fech == 4 else 'Quina' if garantia_fech == 5 else 'Sena'}")
+
+            # Probabilidades exatas do fechamento
+            roi_fech = calcular_roi_exato(tuple(tuple(j) for j in jogos_fechamento))
+            if roi_fech['exato']:
+                col_p1, col_p2, col_p3, col_p4 = st.columns(4)
+                col_p1.metric("Chance de Quadra+", f"1 em {1 / roi_fech['prob_ao_menos'][4]:,.0f}".replace(',', '.'))
+                col_p2.metric("Chance de Quina+", f"1 em {1 / roi_fech['prob_ao_menos'][5]:,.0f}".replace(',', '.'))
+                col_p3.metric("Chance de Sena", f"1 em {1 / roi_fech['prob_ao_menos'][6]:,.0f}".replace(',', '.'))
+                col_p4.metric("ROI Exato", f"{roi_fech['roi']:.2f}%")
+
+            # Exportar
+            col_e1, col_e2 = st.columns(2)
+            with col_e1:
+                excel_fech = gerar_excel_jogos(jogos_fechamento, [f'Fechamento {garantia_fech}'])
+                st.download_button(
+                    "📥 Baixar Fechamento (Excel)",
+                    data=excel_fech,
+                    file_name=f"fechamento_{num_dezenas_fech}dez_{garantia_fech}garantia.xlsx"
+                )
+            with col_e2:
+                meta_fech = {'algoritmos': ['fechamento'], 'garantia': garantia_fech,
+                             'dezenas_base': tarefa_fech.params['dezenas_base']}
+                st.download_button(
+                    "📦 Baixar Fechamento (.mjg)",
+                    data=gerar_bytes_jogos(jogos_fechamento, **meta_fech),
+                    file_name=f"fechamento_{num_dezenas_fech}dez_{garantia_fech}garantia.mjg",
+                    mime="application/octet-stream"
+                )
+                if PARQUET_DISPONIVEL:
+                    st.download_button(
+                        "📊 Baixar Fechamento (Parquet)",
+                        data=gerar_parquet_jogos(jogos_fechamento, **meta_fech),
+                        file_name=f"fechamento_{num_dezenas_fech}dez_{garantia_fech}garantia.parquet",
+                        mime="application/octet-stream"
+                    )
+
+            # Exibir jogos: so a pagina visivel, num unico bloco HTML
+            pagina_fech = controles_paginacao("fechamento", jogos_para_mascaras(jogos_fechamento))
+            st.markdown(
+                html_jogos([jogos_fechamento[i] for i in pagina_fech.indices],
+                           [f"Jogo {i + 1:02d}" for i in pagina_fech.indices]),
+                unsafe_allow_html=True
+            )
 
-    with tab5:
+    with tab5, medir("aba.simulador"):
         st.subheader("🎯 Simulador de Jogos")
 
         st.markdown("""
@@ -1837,9 +1440,25 @@ def main():
             dezenas_sim = sorted(dezenas_simular_sel)
             st.info(f"🎲 Jogo: {' - '.join(f'{d:02d}' for d in dezenas_sim)}")
 
+            # Consulta instantanea no indice de todo o historico carregado
+            sorteado_em = analisador_completo.ja_sorteado(dezenas_sim)
+            if sorteado_em is not None:
+                st.success(f"🏆 Esta combinação já foi sorteada no concurso {sorteado_em}!")
+            premios_hist = analisador_completo.indice_acertos().resumo(dezenas_sim)
+            st.caption(f"Em {len(analisador_completo.concursos)} concursos: "
+                       f"{premios_hist[6]} sena(s), {premios_hist[5]} quina(s), {premios_hist[4]} quadra(s)")
+
             if st.button("🎯 Simular nos últimos concursos", type="primary"):
-                with st.spinner("Simulando..."):
-                    resultados = analisador_completo.simular_jogo(dezenas_sim, qtd_concursos)
+                tarefa_sim = gerenciador.submeter(
+                    "simulador", analisador_completo.simular_jogo, contexto=concursos[-1].numero,
+                    dezenas=dezenas_sim, ultimos_n=qtd_concursos
+                )
+                st.session_state.tarefa_simulador = tarefa_sim.chave
+
+            tarefa_sim = gerenciador.obter(st.session_state.get('tarefa_simulador'))
+            if (acompanhar_tarefa(tarefa_sim, "Simulando...", "cancelar_simulador")
+                    and tarefa_sim.resultado and tarefa_sim.params['dezenas'] == dezenas_sim):
+                resultados = tarefa_sim.resultado
 
                 st.markdown("---")
                 st.markdown("### 📊 Resultados da Simulação")
@@ -1872,7 +1491,62 @@ def main():
         elif len(dezenas_simular_sel) > 0:
             st.warning(f"Selecione exatamente 6 números! (Selecionados: {len(dezenas_simular_sel)})")
 
-    with tab6:
+        st.markdown("---")
+        st.markdown("### 🧪 Simular Estratégia")
+        st.markdown("""
+        Gera um lote de jogos com as **configurações atuais** (algoritmos, balanceamento,
+        fixos e excluídos) para cada sorteio simulado e confere os acertos.
+        """)
+
+        col_est1, col_est2 = st.columns([2, 1])
+        with col_est1:
+            st.caption(f"Algoritmos: {', '.join(algoritmos_selecionados) or 'nenhum'} | "
+                       f"{qtd_jogos} jogos por sorteio | {anos} anos de histórico")
+        with col_est2:
+            rodadas_estrategia = st.select_slider(
+                "Sorteios simulados:",
+                options=[1_000, 10_000, 100_000, 1_000_000],
+                value=10_000,
+                format_func=lambda x: f"{x:,}".replace(',', '.')
+            )
+
+        if st.button("🧪 Simular estratégia", disabled=not algoritmos_selecionados):
+            estrategia = Estrategia(
+                algoritmos=tuple(algoritmos_selecionados),
+                forcar_balanceamento=usar_balanceado,
+                numeros_fixos=tuple(sorted(numeros_fixos)),
+                numeros_removidos=tuple(sorted(numeros_removidos)),
+                jogos_por_rodada=qtd_jogos
+            )
+            tarefa_est = gerenciador.submeter(
+                "estrategia",
+                partial(simular_estrategia, analisador.concursos, executor=obter_executor_processos()),
+                contexto=(concursos[-1].numero, anos),
+                estrategia=estrategia, rodadas=rodadas_estrategia
+            )
+            st.session_state.tarefa_estrategia = tarefa_est.chave
+
+        tarefa_est = gerenciador.obter(st.session_state.get('tarefa_estrategia'))
+        if acompanhar_tarefa(tarefa_est, "Simulando estratégia...", "cancelar_estrategia") and tarefa_est.resultado:
+            res_est = tarefa_est.resultado
+            st.caption(f"{res_est['rodadas']:,} sorteios | {res_est['jogos']:,} jogos".replace(',', '.'))
+
+            col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+            col_r1.metric("🎯 Quadras", res_est['acertos'][4],
+                          help=f"Esperado (jogos uniformes): {res_est['acertos_esperados_uniforme'][4]:.1f}")
+            col_r2.metric("⭐ Quinas", res_est['acertos'][5],
+                          help=f"Esperado (jogos uniformes): {res_est['acertos_esperados_uniforme'][5]:.2f}")
+            col_r3.metric("🏆 Senas", res_est['acertos'][6],
+                          help=f"Esperado (jogos uniformes): {res_est['acertos_esperados_uniforme'][6]:.4f}")
+            col_r4.metric("ROI", f"{res_est['roi']:.2f}%", help=f"ROI exato de jogos uniformes: {res_est['roi_uniforme']:.2f}%")
+
+            df_melhor = pd.DataFrame([
+                {'Melhor acerto no lote': f'{k}', 'Sorteios': v}
+                for k, v in res_est['melhor_por_rodada'].items()
+            ])
+            st.bar_chart(df_melhor.set_index('Melhor acerto no lote'))
+
+    with tab6, medir("aba.meus_jogos"):
         st.subheader("💾 Meus Jogos Salvos")
 
         jogos_salvos = carregar_jogos_salvos()
@@ -1900,12 +1574,14 @@ def main():
 
             st.markdown("---")
 
-            for jogo in jogos_salvos:
+            pagina_salvos = controles_paginacao("salvos", jogos_para_mascaras([j.dezenas for j in jogos_salvos]))
+
+            for jogo in (jogos_salvos[i] for i in pagina_salvos.indices):
                 with st.container():
                     col_j1, col_j2, col_j3 = st.columns([3, 1, 1])
 
                     with col_j1:
-                        numeros_html = "".join([f'<span class="numero-grande">{d:02d}</span>' for d in jogo.dezenas])
+                        numeros_html = criar_numeros_grandes(jogo.dezenas)
                         st.markdown(f"**Jogo #{jogo.id}** - {numeros_html}", unsafe_allow_html=True)
                         st.caption(f"Criado em: {jogo.data_criacao[:10]} | Algoritmos: {', '.join(jogo.algoritmos)}")
 
@@ -1921,7 +1597,7 @@ def main():
 
                     st.divider()
 
-    with tab7:
+    with tab7, medir("aba.conferir"):
         st.subheader("✅ Conferir Jogos")
 
         st.markdown("Confira seus jogos contra os resultados dos sorteios.")
@@ -1958,13 +1634,14 @@ def main():
                     acertados = set(dezenas_conf) & concurso_conf.dezenas_set
 
                     # Exibir com destaque nos acertos
-                    numeros_html = ""
-                    for d in dezenas_conf:
-                        classe = "numero-grande numero-acerto" if d in acertados else "numero-grande"
-                        numeros_html += f'<span class="{classe}">{d:02d}</span>'
+                    numeros_html = criar_numeros_grandes(dezenas_conf, acertados)
 
                     st.markdown(numeros_html, unsafe_allow_html=True)
 
+                    sorteado_em = analisador_completo.ja_sorteado(dezenas_conf)
+                    if sorteado_em is not None:
+                        st.caption(f"Esta combinação já saiu no concurso {sorteado_em}.")
+
                     if acertos == 6:
                         st.balloons()
                         st.success(f"🏆 SENA! {acertos} acertos!")
@@ -1997,20 +1674,42 @@ def main():
                         acertos = jogo.acertos.get(concurso_conf.numero, 0)
                         acertados = set(jogo.dezenas) & concurso_conf.dezenas_set
 
-                        numeros_html = ""
-                        for d in jogo.dezenas:
-                            classe = "numero-grande numero-acerto" if d in acertados else "numero-grande"
-                            numeros_html += f'<span class="{classe}">{d:02d}</span>'
+                        numeros_html = criar_numeros_grandes(jogo.dezenas, acertados)
 
                         premio = "🏆 SENA!" if acertos == 6 else "⭐ QUINA!" if acertos == 5 else "🎯 QUADRA!" if acertos == 4 else ""
                         st.markdown(f"**Jogo #{jogo.id}:** {numeros_html} - **{acertos} acertos** {premio}", unsafe_allow_html=True)
             else:
                 st.info("Nenhum jogo salvo para conferir.")
 
+            st.markdown("### Conferir Arquivo de Jogos")
+            tipos_arquivo = ["mjg", "parquet"] if PARQUET_DISPONIVEL else ["mjg"]
+            arquivo_jogos = st.file_uploader("Conjunto de jogos (.mjg ou .parquet):", type=tipos_arquivo)
+            if arquivo_jogos is not None:
+                try:
+                    conjunto = ler_conjunto_enviado(arquivo_jogos.name, arquivo_jogos.getvalue())
+                except Exception as e:
+                    st.error(f"Arquivo inválido: {e}")
+                else:
+                    dist = distribuicao_acertos_conjunto(conjunto.mascaras, concurso_conf.dezenas)
+                    st.caption(f"{len(conjunto):,} jogos".replace(',', '.') +
+                               (f" | {', '.join(conjunto.metadados.get('algoritmos', []))}"
+                                if conjunto.metadados.get('algoritmos') else ""))
+                    col_a1, col_a2, col_a3 = st.columns(3)
+                    col_a1.metric("🏆 Senas", dist.get(6, 0))
+                    col_a2.metric("⭐ Quinas", dist.get(5, 0))
+                    col_a3.metric("🎯 Quadras", dist.get(4, 0))
+
     # Rodape com informacoes
     st.markdown("---")
     st.caption(f"📊 Base: {len(concursos)} concursos | Ultimo: {concursos[-1].numero} ({concursos[-1].data}) | Atualizacao automatica ativada")
 
 
 if __name__ == "__main__":
-    main()
+    # Sem PERFIL_RERUN_MS o perfil nao faz nada; com ele, reruns lentos ficam gravados em disco
+    with PerfilRerun(parametros=parametros_sessao, extras=dados_instrumentacao) as perfil:
+        main()
+    # Fora do main() para aparecer tambem quando a pagina termina cedo (ex.: erro no Supabase)
+    if DEBUG:
+        if perfil.gravado:
+            st.caption(f"🐢 Rerun lento: perfil gravado em {perfil.gravado}")
+        exibir_painel_instrumentacao()
@@ -0,0 +1,148 @@
+"""
+Back-test walk-forward dos algoritmos de score
+Para cada concurso t, usa apenas os concursos anteriores a t para gerar K jogos por algoritmo
+e confere contra o concurso t. O estado estatistico e atualizado incrementalmente
+(O(1) por concurso), evitando reconstruir o analisador a cada passo.
+"""
+
+import random
+from math import comb, erfc, sqrt
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from nucleo.gerador import GeradorJogos
+from nucleo.modelo import DEZENA_MAX, DEZENA_MIN, TAMANHO_JOGO
+
+ALGORITMOS_BACKTEST = ('frequencia', 'markov', 'coocorrencia', 'atraso', 'uniforme')
+
+# Indices (i < j) do triangulo superior, ja restritos a 1..60
+_PARES_I, _PARES_J = np.triu_indices(DEZENA_MAX + 1, 1)
+_MASCARA_PARES = _PARES_I >= DEZENA_MIN
+_PARES_I, _PARES_J = _PARES_I[_MASCARA_PARES], _PARES_J[_MASCARA_PARES]
+
+
+class EstadoIncremental:
+    """
+    Estatisticas acumuladas ate o ultimo concurso adicionado.
+    Expoe os mesmos metodos scores_* do AnalisadorMegaSena, para ser usado pelo GeradorJogos.
+    """
+
+    def __init__(self):
+        self.frequencias = np.zeros(DEZENA_MAX + 1, dtype=np.int64)
+        self.markov = np.zeros((DEZENA_MAX + 1, DEZENA_MAX + 1), dtype=np.int64)
+        self.coocorrencias = np.zeros((DEZENA_MAX + 1, DEZENA_MAX + 1), dtype=np.int64)
+        self.ultima_aparicao = np.full(DEZENA_MAX + 1, -1, dtype=np.int64)
+        self.total = 0
+        self.ultimo: Optional[np.ndarray] = None
+
+    def adicionar(self, dezenas: Sequence[int]):
+        """Incorpora um concurso ao estado."""
+        atual = np.array(sorted(dezenas), dtype=np.int64)
+        self.frequencias[atual] += 1
+        if self.ultimo is not None:
+            self.markov[np.ix_(self.ultimo, atual)] += 1
+        self.coocorrencias[np.ix_(atual, atual)] += 1
+        self.ultima_aparicao[atual] = self.total
+        self.total += 1
+        self.ultimo = atual
+
+    @staticmethod
+    def _normalizar(valores: np.ndarray) -> Dict[int, float]:
+        maximo = valores[DEZENA_MIN:].max()
+        maximo = maximo if maximo > 0 else 1
+        return {d: float(valores[d]) / maximo for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+
+    def scores_frequencia(self) -> Dict[int, float]:
+        return self._normalizar(self.frequencias)
+
+    def scores_markov(self) -> Dict[int, float]:
+        if self.ultimo is None:
+            return {d: 0.0 for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+        return self._normalizar(self.markov[self.ultimo].sum(axis=0))
+
+    def scores_coocorrencia(self) -> Dict[int, float]:
+        contagens = self.coocorrencias[_PARES_I, _PARES_J]
+        top = min(100, int((contagens > 0).sum()))
+        scores = np.zeros(DEZENA_MAX + 1, dtype=np.float64)
+        if top > 0:
+            idx = np.argpartition(-contagens, top - 1)[:top]
+            np.add.at(scores, _PARES_I[idx], contagens[idx])
+            np.add.at(scores, _PARES_J[idx], contagens[idx])
+        return self._normalizar(scores)
+
+    def scores_atraso(self) -> Dict[int, float]:
+        atrasos = np.where(self.ultima_aparicao >= 0, self.total - 1 - self.ultima_aparicao, self.total)
+        return self._normalizar(atrasos)
+
+
+def _p_valor_superior(z: float) -> float:
+    """P(Z >= z) da normal padrao."""
+    return 0.5 * erfc(z / sqrt(2))
+
+
+def executar_backtest(concursos: Sequence, algoritmos: Sequence[str] = ALGORITMOS_BACKTEST,
+                      jogos_por_algoritmo: int = 10, inicio: int = 100, semente: int = 0,
+                      progresso: Optional[Callable[[float], bool]] = None) -> Dict[str, Dict]:
+    """
+    Executa o back-test walk-forward.
+
+    Retorna, por algoritmo: distribuicao de acertos observada e esperada (hipergeometrica),
+    media de acertos por jogo, estatistica z e p-valor unilateral (acerta mais que o acaso?).
+    O teste usa a media de acertos de cada concurso, independentes sob a hipotese nula.
+    """
+    ordenados = sorted(concursos, key=lambda c: (c.data, c.numero))
+    rng = random.Random(semente)
+    estado = EstadoIncremental()
+
+    hist = {alg: np.zeros(TAMANHO_JOGO + 1, dtype=np.int64) for alg in algoritmos}
+    medias: Dict[str, List[float]] = {alg: [] for alg in algoritmos}
+
+    passos = max(0, len(ordenados) - inicio)
+    for t, concurso in enumerate(ordenados):
+        if t >= inicio:
+            passo = t - inicio
+            if progresso is not None and passo % 50 == 0 and progresso(passo / passos) is False:
+                break
+
+            sorteio = set(concurso.dezenas)
+            gerador = GeradorJogos(estado, rng=rng)
+            for alg in algoritmos:
+                acertos = []
+                for _ in range(jogos_por_algoritmo):
+                    if alg == 'uniforme':
+                        jogo = gerador.gerar_uniforme()
+                    else:
+                        jogo = gerador.gerar_por_scores({alg: 1.0})
+                    acertos.append(len(sorteio.intersection(jogo)))
+                hist[alg] += np.bincount(acertos, minlength=TAMANHO_JOGO + 1)
+                medias[alg].append(sum(acertos) / len(acertos))
+
+        estado.adicionar(concurso.dezenas)
+
+    media_nula = TAMANHO_JOGO * TAMANHO_JOGO / DEZENA_MAX
+    prob_nula = [comb(TAMANHO_JOGO, k) * comb(DEZENA_MAX - TAMANHO_JOGO, TAMANHO_JOGO - k) / comb(DEZENA_MAX, TAMANHO_JOGO)
+                 for k in range(TAMANHO_JOGO + 1)]
+
+    resultados = {}
+    for alg in algoritmos:
+        n = len(medias[alg])
+        total_jogos = int(hist[alg].sum())
+        if n > 1:
+            amostra = np.array(medias[alg])
+            erro = amostra.std(ddof=1) / sqrt(n)
+            z = (amostra.mean() - media_nula) / erro if erro > 0 else 0.0
+        else:
+            z = 0.0
+        resultados[alg] = {
+            'concursos': n,
+            'jogos': total_jogos,
+            'distribuicao': {k: int(hist[alg][k]) for k in range(TAMANHO_JOGO + 1)},
+            'esperado': {k: total_jogos * prob_nula[k] for k in range(TAMANHO_JOGO + 1)},
+            'media_acertos': float(np.mean(medias[alg])) if n else 0.0,
+            'media_nula': media_nula,
+            'z': float(z),
+            'p_valor': _p_valor_superior(float(z)),
+        }
+
+    return resultados
@@ -0,0 +1,4 @@
+"""
+Benchmarks dos caminhos criticos (carga, estatisticas, geracao, fechamento, simulacao)
+Execute a partir da raiz do projeto: python -m benchmarks.executar --help
+"""
@@ -0,0 +1,236 @@
+"""
+Suite de benchmarks dos caminhos criticos
+Mede carga (CSV, xlsx, registro binario), snapshot e cada estatistica do AnalisadorMegaSena,
+geracao de jogos, fechamentos de 7 a 20 dezenas, simulador, Monte Carlo e indice de confianca,
+sobre historicos sinteticos de 2.8k, 30k e 300k sorteios. Grava o resultado em JSON e, com
+--comparar, aponta regressoes contra um baseline salvo (codigo de saida 1).
+
+    python -m benchmarks.executar --tamanhos 2800 30000 --saida benchmarks/baseline.json
+    python -m benchmarks.executar --tamanhos 2800 30000 --comparar benchmarks/baseline.json
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.historico_sintetico import (
+    TAMANHOS_PADRAO, concursos_sinteticos, escrever_csv, escrever_excel, escrever_registro
+)
+
+REPETICOES = 5
+ORCAMENTO_POR_CASO = 10.0   # segundos; casos lentos param antes das repeticoes
+TOLERANCIA = 0.25           # 25% mais lento que o baseline = regressao
+PISO_MS = 1.0               # diferencas absolutas menores que isto sao ruido
+
+ALGORITMOS = ['frequencia', 'markov', 'coocorrencia', 'atraso']
+PESOS = {alg: 0.25 for alg in ALGORITMOS}
+JOGO_REFERENCIA = [4, 15, 23, 34, 42, 57]
+FECHAMENTO_DEZENAS = range(7, 21)
+SIMULACOES_MONTE_CARLO = 1_000_000
+
+# So metodos que trabalham alem do snapshot. Frequencias, atrasos, coocorrencias, Markov e
+# seus scores sao leituras do snapshot (custo coberto por analisador/criar_snapshot)
+ESTATISTICAS = [
+    'trios_mais_frequentes', 'quadras_mais_frequentes', 'analise_soma', 'analise_padroes',
+    'ciclos_atraso', 'analise_quadrantes',
+]
+
+
+@dataclass
+class Caso:
+    nome: str
+    funcao: Callable[[Any], Any]
+    preparar: Callable[[], Any] = lambda: None   # fora da medicao (ex.: analisador novo, sem caches)
+
+
+def medir(caso: Caso, repeticoes: int, orcamento: float) -> Dict[str, float]:
+    tempos: List[float] = []
+    while len(tempos) < repeticoes:
+        entrada = caso.preparar()
+        inicio = time.perf_counter()
+        caso.funcao(entrada)
+        tempos.append(time.perf_counter() - inicio)
+        if sum(tempos) > orcamento:
+            break
+    return {
+        'ms_min': round(min(tempos) * 1000, 3),
+        'ms_mediana': round(statistics.median(tempos) * 1000, 3),
+        'repeticoes': len(tempos),
+    }
+
+
+def casos_carga(diretorio: Path, quantidade: int, semente: int, incluir_excel: bool) -> List[Caso]:
+    from nucleo.carga import carregar_resultados_csv, carregar_resultados_excel, carregar_resultados_registro
+
+    csv_ = diretorio / f"resultados_{quantidade}.csv"
+    registro = diretorio / f"resultados_{quantidade}.bin"
+    escrever_csv(csv_, quantidade, semente)
+    escrever_registro(registro, quantidade, semente)
+    casos = [
+        Caso("carga/csv", lambda _: carregar_resultados_csv(csv_)),
+        Caso("carga/registro", lambda _: carregar_resultados_registro(registro)),
+    ]
+    if incluir_excel:
+        xlsx = diretorio / f"resultados_{quantidade}.xlsx"
+        escrever_excel(xlsx, quantidade, semente)
+        casos.append(Caso("carga/excel", lambda _: carregar_resultados_excel(xlsx)))
+    return casos
+
+
+def casos_historico(concursos: Sequence) -> List[Caso]:
+    from estatisticas import criar_snapshot
+    from indice_acertos import IndiceAcertos
+    from nucleo import AnalisadorMegaSena, GeradorJogos
+
+    snapshot = criar_snapshot(concursos)
+    indice = IndiceAcertos(snapshot.concursos)
+
+    def analisador():
+        # Analisador novo a cada repeticao: caches internos frios, snapshot e indice prontos
+        return AnalisadorMegaSena.de_snapshot(snapshot, indice_acertos=indice)
+
+    def gerador():
+        return GeradorJogos(analisador(), rng=random.Random(0))
+
+    casos = [
+        Caso("analisador/criar_snapshot", lambda _: criar_snapshot(concursos)),
+        Caso("analisador/indice_acertos", lambda _: IndiceAcertos(concursos)),
+    ]
+    casos += [Caso(f"estatisticas/{nome}", lambda a, nome=nome: getattr(a, nome)(), analisador)
+              for nome in ESTATISTICAS]
+    for quantidade in (50, 10_000):
+        casos.append(Caso(f"geracao/gerar_por_scores_{quantidade}",
+                          lambda g, q=quantidade: [g.gerar_por_scores(PESOS) for _ in range(q)], gerador))
+        casos.append(Caso(f"geracao/gerar_jogos_{quantidade}",
+                          lambda g, q=quantidade: g.gerar_jogos(q, ALGORITMOS), gerador))
+    casos += [
+        Caso("simulador/simular_jogo", lambda a: a.simular_jogo(JOGO_REFERENCIA, ultimos_n=len(concursos)),
+             analisador),
+        Caso("simulador/indice_confianca", lambda a: a.indice_confianca(JOGO_REFERENCIA), analisador),
+    ]
+    return casos
+
+
+def casos_globais() -> List[Caso]:
+    """Casos que nao dependem do tamanho do historico."""
+    from nucleo import AnalisadorMegaSena, GeradorFechamento
+
+    casos = [
+        Caso(f"fechamento/{n}_dezenas_garantia_{garantia}",
+             lambda _, n=n, g=garantia: GeradorFechamento.gerar_fechamento(list(range(1, n + 1)), g))
+        for n in FECHAMENTO_DEZENAS for garantia in (4, 5)
+    ]
+    casos.append(Caso(f"simulador/monte_carlo_{SIMULACOES_MONTE_CARLO}",
+                      lambda a: a.simulacao_monte_carlo(SIMULACOES_MONTE_CARLO, semente=0),
+                      lambda: AnalisadorMegaSena([])))
+    return casos
+
+
+def _metadados(tamanhos: Sequence[int], semente: int) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=10, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        'data': dt.datetime.now().isoformat(timespec="seconds"),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'tamanhos': list(tamanhos),
+        'semente': semente,
+    }
+
+
+def executar(tamanhos: Sequence[int], semente: int = 0, repeticoes: int = REPETICOES,
+             orcamento: float = ORCAMENTO_POR_CASO, incluir_excel: bool = True,
+             filtro: Optional[str] = None) -> Dict[str, Any]:
+    from nucleo import Concurso
+
+    resultados: Dict[str, Dict[str, float]] = {}
+
+    def rodar(prefixo: str, casos: List[Caso]):
+        for caso in casos:
+            nome = f"{prefixo}/{caso.nome}"
+            if filtro and filtro not in nome:
+                continue
+            resultados[nome] = medida = medir(caso, repeticoes, orcamento)
+            print(f"{nome:<60} {medida['ms_mediana']:>12.3f} ms (x{medida['repeticoes']})", flush=True)
+
+    rodar("global", casos_globais())
+    with tempfile.TemporaryDirectory() as diretorio:
+        for quantidade in tamanhos:
+            rodar(f"n={quantidade}", casos_carga(Path(diretorio), quantidade, semente, incluir_excel))
+            rodar(f"n={quantidade}", casos_historico(concursos_sinteticos(quantidade, Concurso, semente)))
+
+    return {'metadados': _metadados(tamanhos, semente), 'resultados': resultados}
+
+
+def comparar(atual: Dict[str, Any], baseline: Dict[str, Any], tolerancia: float = TOLERANCIA,
+             piso_ms: float = PISO_MS) -> List[str]:
+    """Imprime a comparacao caso a caso e devolve os nomes dos casos que regrediram."""
+    regressoes = []
+    base = baseline.get('resultados', {})
+    print(f"\n{'caso':<60} {'baseline':>12} {'atual':>12} {'razao':>7}")
+    for nome, medida in atual['resultados'].items():
+        if nome not in base:
+            print(f"{nome:<60} {'-':>12} {medida['ms_mediana']:>9.3f} ms {'novo':>7}")
+            continue
+        antes, agora = base[nome]['ms_mediana'], medida['ms_mediana']
+        razao = agora / antes if antes > 0 else float('inf')
+        regrediu = razao > 1 + tolerancia and agora - antes > piso_ms
+        if regrediu:
+            regressoes.append(nome)
+        print(f"{nome:<60} {antes:>9.3f} ms {agora:>9.3f} ms {razao:>6.2f}x" + ("  << REGRESSAO" if regrediu else ""))
+    return regressoes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos criticos do gerador Mega-Sena.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="Tamanhos do historico sintetico (padrão: 2800 30000 300000)")
+    parser.add_argument("--saida", type=Path, default=Path("benchmarks/resultado.json"),
+                        help="Arquivo JSON com os resultados (padrão: benchmarks/resultado.json)")
+    parser.add_argument("--comparar", type=Path, default=None,
+                        help="Baseline JSON; termina com código 1 se algum caso regrediu")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                        help="Fração de piora aceita em relação ao baseline (padrão: 0.25)")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES, help="Repetições por caso (padrão: 5)")
+    parser.add_argument("--sem-excel", action="store_true", help="Não mede a carga de xlsx (a mais lenta)")
+    parser.add_argument("--filtro", type=str, default=None, help="Só executa casos cujo nome contém o texto")
+    parser.add_argument("--semente", type=int, default=0, help="Semente do histórico sintético")
+    args = parser.parse_args()
+
+    atual = executar(args.tamanhos, args.semente, args.repeticoes,
+                     incluir_excel=not args.sem_excel, filtro=args.filtro)
+
+    args.saida.parent.mkdir(parents=True, exist_ok=True)
+    args.saida.write_text(json.dumps(atual, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados gravados em {args.saida}")
+
+    if args.comparar is not None:
+        baseline = json.loads(args.comparar.read_text(encoding="utf-8"))
+        regressoes = comparar(atual, baseline, args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} caso(s) mais lentos que o baseline (tolerância {args.tolerancia:.0%}).")
+            sys.exit(1)
+        print("\nNenhuma regressão em relação ao baseline.")
+
+
+if __name__ == "__main__":
+    main()
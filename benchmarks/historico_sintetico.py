@@ -0,0 +1,69 @@
+"""
+Historico sintetico de sorteios para benchmarks
+Sorteios uniformes e reprodutiveis (semente), com numeracao sequencial e duas datas por
+semana a partir do primeiro concurso. Gera tambem os arquivos de entrada
+(CSV, xlsx e registro binario) para medir a carga.
+"""
+
+import csv
+import datetime as dt
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+TAMANHOS_PADRAO = (2_800, 30_000, 300_000)
+PRIMEIRO_SORTEIO = dt.date(1996, 3, 11)
+TAMANHO_LOTE = 50_000
+
+
+def gerar_sorteios(quantidade: int, semente: int = 0) -> Tuple[np.ndarray, List[dt.date], np.ndarray]:
+    """(numeros, datas, dezenas n x 6 ordenadas) de 'quantidade' sorteios uniformes."""
+    rng = np.random.default_rng(semente)
+    dezenas = np.empty((quantidade, 6), dtype=np.int64)
+    for inicio in range(0, quantidade, TAMANHO_LOTE):
+        fim = min(inicio + TAMANHO_LOTE, quantidade)
+        # 6 menores de 60 chaves aleatorias = amostra sem reposicao, por linha
+        chaves = rng.random((fim - inicio, 60), dtype=np.float32)
+        dezenas[inicio:fim] = np.sort(np.argpartition(chaves, 6, axis=1)[:, :6], axis=1) + 1
+
+    # Intervalos alternados de 3 e 4 dias (dois sorteios por semana)
+    dias = np.cumsum(np.where(np.arange(quantidade) % 2 == 0, 3, 4)) - 3
+    datas = [PRIMEIRO_SORTEIO + dt.timedelta(days=int(d)) for d in dias]
+    return np.arange(1, quantidade + 1), datas, dezenas
+
+
+def concursos_sinteticos(quantidade: int, fabrica: Callable, semente: int = 0) -> List:
+    """Lista de concursos; fabrica(numero=, data=, dezenas=) cria cada objeto."""
+    numeros, datas, dezenas = gerar_sorteios(quantidade, semente)
+    return [fabrica(numero=int(n), data=d, dezenas=tuple(linha))
+            for n, d, linha in zip(numeros.tolist(), datas, dezenas.tolist())]
+
+
+def escrever_csv(caminho: Path, quantidade: int, semente: int = 0):
+    """CSV no layout do gerador de linha de comando (data, bola1..bola6)."""
+    numeros, datas, dezenas = gerar_sorteios(quantidade, semente)
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["concurso", "data"] + [f"bola{i}" for i in range(1, 7)])
+        for n, d, linha in zip(numeros.tolist(), datas, dezenas.tolist()):
+            escritor.writerow([n, d.isoformat(), *linha])
+
+
+def escrever_excel(caminho: Path, quantidade: int, semente: int = 0):
+    """xlsx no layout de resultados.xlsx (Concurso, Data, Dezena 1..6)."""
+    from exportacao import escrever_excel as escrever
+
+    numeros, datas, dezenas = gerar_sorteios(quantidade, semente)
+    linhas = ([n, d.strftime("%d/%m/%Y"), *linha]
+              for n, d, linha in zip(numeros.tolist(), datas, dezenas.tolist()))
+    escrever(caminho, {'Resultados': (['Concurso', 'Data'] + [f'Dezena {i}' for i in range(1, 7)], linhas)})
+
+
+def escrever_registro(caminho: Path, quantidade: int, semente: int = 0):
+    """Registro binario append-only (registro_concursos)."""
+    import registro_concursos
+
+    numeros, datas, dezenas = gerar_sorteios(quantidade, semente)
+    registro_concursos.criar(caminho)
+    registro_concursos.anexar(caminho, zip(numeros.tolist(), datas, dezenas.tolist()))
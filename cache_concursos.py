@@ -0,0 +1,287 @@
+"""
+Cache de concursos por processo (read-through)
+Uma unica copia imutavel dos concursos por processo, compartilhada por todas as sessoes.
+Acessos concorrentes com cache vazio disparam uma so busca (singleflight); a invalidacao
+acontece quando aparece um numero de concurso novo, nao por TTL cego.
+Opcionalmente publica os dados num arquivo binario mapeado em memoria, para que outros
+processos do servidor reaproveitem a mesma busca.
+
+Resultados derivados (snapshots, indices) ficam em CacheDerivados, agrupados pela versao
+do conjunto de dados (ultimo numero + hash do conteudo): quando os concursos mudam, so as
+entradas da versao antiga sao descartadas.
+"""
+
+import datetime as dt
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from estatisticas import versao_dados
+from metricas import CACHE
+
+# Cabecalho do arquivo compartilhado: [ultimo numero, dia (ordinal), linhas, reservado]
+_CABECALHO = 4
+# Cada linha: numero, data (ordinal), 6 dezenas
+_COLUNAS = 8
+
+
+@dataclass
+class _Entrada:
+    concursos: Tuple
+    versao: Optional[int]
+    dia: dt.date
+    verificado_em: float
+    identificador: str = ""
+
+
+def identificador_dados(concursos: Sequence) -> str:
+    """Versao de um conjunto de concursos: ultimo numero + hash do conteudo."""
+    ultimo = concursos[-1].numero if concursos else 0
+    return f"{ultimo}:{versao_dados(concursos)[:16]}"
+
+
+def _dia_anterior(antiga: Hashable, nova: Hashable) -> bool:
+    """True se as chaves diferem so pela data final e a antiga e de um dia anterior."""
+    return (isinstance(antiga, tuple) and isinstance(nova, tuple) and len(antiga) == len(nova) > 0
+            and isinstance(antiga[-1], dt.date) and isinstance(nova[-1], dt.date)
+            and antiga[:-1] == nova[:-1] and antiga[-1] < nova[-1])
+
+
+class CacheDerivados:
+    """
+    Valores calculados a partir de um conjunto de concursos, agrupados pela versao dele.
+    descartar(versao) remove so o que foi derivado daquela versao.
+
+    Chaves terminadas em data (ex.: ('snapshot', anos, hoje)) valem por dia: ao guardar a
+    chave de um dia novo, as do mesmo prefixo com datas anteriores sao descartadas.
+    Cada chave e calculada uma so vez, mesmo com acessos simultaneos (singleflight).
+    """
+
+    def __init__(self, nome: str = "derivados"):
+        self.nome = nome
+        self._valores: Dict[str, Dict[Hashable, Any]] = {}
+        self._em_voo: Dict[Tuple[str, Hashable], threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, versao: str, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        while True:
+            with self._lock:
+                por_versao = self._valores.get(versao)
+                if por_versao is not None and chave in por_versao:
+                    CACHE.incrementar(cache=self.nome, resultado="hit")
+                    return por_versao[chave]
+                evento = self._em_voo.get((versao, chave))
+                lider = evento is None
+                if lider:
+                    evento = self._em_voo[(versao, chave)] = threading.Event()
+
+            if not lider:
+                # Outra thread ja esta calculando: espera e relê (ou calcula, se ela falhou)
+                evento.wait()
+                continue
+
+            CACHE.incrementar(cache=self.nome, resultado="miss")
+            try:
+                valor = calcular()
+                with self._lock:
+                    por_versao = self._valores.setdefault(versao, {})
+                    for antiga in [c for c in por_versao if _dia_anterior(c, chave)]:
+                        del por_versao[antiga]
+                    por_versao[chave] = valor
+                return valor
+            finally:
+                with self._lock:
+                    del self._em_voo[(versao, chave)]
+                evento.set()
+
+    def descartar(self, versao: str):
+        with self._lock:
+            self._valores.pop(versao, None)
+
+    def versoes(self) -> Dict[str, int]:
+        """Versoes em cache e quantidade de entradas de cada uma."""
+        with self._lock:
+            return {v: len(entradas) for v, entradas in self._valores.items()}
+
+
+def arquivo_compartilhado(diretorio: Path, chave: Hashable) -> Path:
+    """Caminho do arquivo compartilhado de uma chave (usado tambem pela ingestao)."""
+    return Path(diretorio) / f"concursos_{chave}.bin"
+
+
+def exportar_binario(caminho: Path, concursos: Sequence, versao: int):
+    """Grava os concursos no formato do arquivo compartilhado (escrita atomica)."""
+    dados = np.array([[c.numero, c.data.toordinal(), *c.dezenas] for c in concursos],
+                     dtype=np.int64).reshape(-1, _COLUNAS)
+    cabecalho = np.array([versao, dt.date.today().toordinal(), len(dados), 0], dtype=np.int64)
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(cabecalho.tobytes())
+        f.write(dados.tobytes())
+    os.replace(temporario, caminho)
+
+
+def ler_binario(caminho: Path) -> Optional[Tuple[int, dt.date, np.ndarray]]:
+    """(ultimo numero, dia da gravacao, linhas mapeadas somente leitura) ou None."""
+    try:
+        cabecalho = np.fromfile(caminho, dtype=np.int64, count=_CABECALHO)
+        if len(cabecalho) < _CABECALHO:
+            return None
+        linhas = int(cabecalho[2])
+        if linhas == 0:
+            return int(cabecalho[0]), dt.date.fromordinal(int(cabecalho[1])), np.zeros((0, _COLUNAS), dtype=np.int64)
+        dados = np.memmap(caminho, dtype=np.int64, mode="r", offset=_CABECALHO * 8, shape=(linhas, _COLUNAS))
+        return int(cabecalho[0]), dt.date.fromordinal(int(cabecalho[1])), dados
+    except (OSError, ValueError):
+        return None
+
+
+class CacheConcursos:
+    """
+    Cache read-through de concursos, por chave (ex.: usar_ultimo_ano).
+
+    carregar(chave) busca a lista completa; versao_atual() devolve o numero do ultimo
+    concurso na fonte (consulta barata), verificada no maximo a cada 'intervalo_verificacao'
+    segundos. Os concursos devolvidos sao uma tupla de objetos imutaveis: nao ha copia por sessao.
+    """
+
+    def __init__(self, carregar: Callable[[Hashable], Sequence], versao_atual: Callable[[], Optional[int]],
+                 fabrica: Optional[Callable] = None, intervalo_verificacao: float = 60.0,
+                 diretorio_compartilhado: Optional[str] = None,
+                 ao_descartar: Optional[Callable[[str], None]] = None, nome: str = "concursos"):
+        self.nome = nome
+        self._carregar = carregar
+        self._ao_descartar = ao_descartar
+        self._versao_atual = versao_atual
+        self._fabrica = fabrica
+        self.intervalo_verificacao = intervalo_verificacao
+        self._diretorio = Path(diretorio_compartilhado) if diretorio_compartilhado else None
+        self._entradas: Dict[Hashable, _Entrada] = {}
+        self._em_voo: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _valida(self, entrada: Optional[_Entrada]) -> bool:
+        return (entrada is not None and entrada.dia == dt.date.today()
+                and time.monotonic() - entrada.verificado_em < self.intervalo_verificacao)
+
+    def obter(self, chave: Hashable = True) -> Tuple:
+        """Concursos da chave; no maximo uma busca simultanea por chave."""
+        while True:
+            with self._lock:
+                entrada = self._entradas.get(chave)
+                if self._valida(entrada):
+                    CACHE.incrementar(cache=self.nome, resultado="hit")
+                    return entrada.concursos
+                evento = self._em_voo.get(chave)
+                lider = evento is None
+                if lider:
+                    evento = self._em_voo[chave] = threading.Event()
+
+            if not lider:
+                # Outra thread ja esta buscando: espera e relê a entrada
+                evento.wait()
+                continue
+
+            CACHE.incrementar(cache=self.nome, resultado="miss")
+            try:
+                return self._atualizar(chave, entrada)
+            finally:
+                with self._lock:
+                    del self._em_voo[chave]
+                evento.set()
+
+    def invalidar(self, chave: Optional[Hashable] = None):
+        """Descarta uma chave (ou todas) e seus derivados; a proxima leitura busca de novo."""
+        with self._lock:
+            if chave is None:
+                removidas = list(self._entradas.values())
+                self._entradas.clear()
+            else:
+                removidas = [e for e in [self._entradas.pop(chave, None)] if e is not None]
+        for entrada in removidas:
+            self._descartar_derivados(entrada)
+
+    def identificador(self, chave: Hashable = True) -> Optional[str]:
+        """Versao (ultimo numero + hash) dos concursos em cache para a chave."""
+        entrada = self._entradas.get(chave)
+        return entrada.identificador if entrada else None
+
+    def _descartar_derivados(self, entrada: _Entrada):
+        if self._ao_descartar is not None and entrada.identificador:
+            self._ao_descartar(entrada.identificador)
+
+    def versao(self, chave: Hashable = True) -> Optional[int]:
+        """Numero do ultimo concurso em cache para a chave (None se vazio)."""
+        entrada = self._entradas.get(chave)
+        return entrada.versao if entrada else None
+
+    def _atualizar(self, chave: Hashable, entrada: Optional[_Entrada]) -> Tuple:
+        try:
+            versao = self._versao_atual()
+        except Exception:
+            versao = None
+
+        hoje = dt.date.today()
+        if entrada is not None and entrada.dia == hoje and (versao is None or versao == entrada.versao):
+            # Nada mudou (ou a fonte nao respondeu): continua servindo a mesma tupla
+            entrada.verificado_em = time.monotonic()
+            return entrada.concursos
+
+        concursos = self._ler_compartilhado(chave, versao, hoje)
+        if concursos is None:
+            concursos = tuple(self._carregar(chave))
+            if concursos and versao is not None:
+                self._publicar(chave, concursos, versao)
+
+        if not concursos and entrada is not None:
+            # A busca falhou (o carregador devolve vazio): segue com a entrada anterior
+            # e so tenta de novo depois do intervalo de verificacao
+            with self._lock:
+                entrada.dia = hoje
+                entrada.verificado_em = time.monotonic()
+            return entrada.concursos
+
+        if concursos:
+            nova = _Entrada(concursos, versao if versao is not None else concursos[-1].numero, hoje,
+                            time.monotonic(), identificador_dados(concursos))
+            with self._lock:
+                anterior = self._entradas.get(chave)
+                self._entradas[chave] = nova
+            if anterior is not None and anterior.identificador != nova.identificador:
+                self._descartar_derivados(anterior)
+        return concursos
+
+    def _arquivo(self, chave: Hashable) -> Optional[Path]:
+        if self._diretorio is None:
+            return None
+        return arquivo_compartilhado(self._diretorio, chave)
+
+    def _ler_compartilhado(self, chave: Hashable, versao: Optional[int], hoje: dt.date) -> Optional[Tuple]:
+        arquivo = self._arquivo(chave)
+        if arquivo is None or self._fabrica is None or versao is None:
+            return None
+        lido = ler_binario(arquivo)
+        if lido is None or lido[0] != versao or lido[1] != hoje:
+            return None
+        return tuple(
+            self._fabrica(numero=int(linha[0]), data=dt.date.fromordinal(int(linha[1])),
+                          dezenas=tuple(int(d) for d in linha[2:]))
+            for linha in lido[2]
+        )
+
+    def _publicar(self, chave: Hashable, concursos: Tuple, versao: int):
+        arquivo = self._arquivo(chave)
+        if arquivo is None:
+            return
+        try:
+            exportar_binario(arquivo, concursos, versao)
+        except OSError as e:
+            print(f"Erro ao publicar cache de concursos: {e}")
@@ -4,10 +4,23 @@ Configure suas credenciais do Supabase aqui
 """
 
 import os
-from dotenv import load_dotenv
+from pathlib import Path
 
-# Carregar variáveis de ambiente
-load_dotenv()
+
+def _arquivo_env():
+    """Primeiro .env a partir da pasta deste arquivo, subindo ate a raiz (como o load_dotenv)."""
+    pasta = Path(__file__).resolve().parent
+    for candidata in (pasta, *pasta.parents):
+        if (candidata / ".env").is_file():
+            return candidata / ".env"
+    return None
+
+
+# Carregar variáveis de ambiente (python-dotenv só é importado se houver um .env)
+_ENV = _arquivo_env()
+if _ENV is not None:
+    from dotenv import load_dotenv
+    load_dotenv(_ENV)
 
 # Configurações do Supabase
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
@@ -20,6 +33,21 @@ APP_ICON = "🍀"
 # Configurações de desenvolvimento
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
+# Diretório para compartilhar o cache de concursos entre processos (vazio = desativado)
+CACHE_CONCURSOS_DIR = os.getenv("CACHE_CONCURSOS_DIR", "")
+
+# Sincronização feita pelo processo de ingestão (ingestao.py) em vez da página
+INGESTAO_EXTERNA = os.getenv("INGESTAO_EXTERNA", "false").lower() == "true"
+
+# Endpoint Prometheus /metrics (porta 0 = desativado)
+METRICAS_PORTA = int(os.getenv("METRICAS_PORTA", "0"))
+METRICAS_ENDERECO = os.getenv("METRICAS_ENDERECO", "127.0.0.1")
+
+# Perfil de reruns lentos: grava o perfil quando o rerun passa de PERFIL_RERUN_MS (0 = desativado)
+PERFIL_RERUN_MS = float(os.getenv("PERFIL_RERUN_MS", "0"))
+PERFIL_RERUN_DIR = os.getenv("PERFIL_RERUN_DIR", "perfis_reruns")
+PERFIL_RERUN_MODO = os.getenv("PERFIL_RERUN_MODO", "amostragem")  # ou "cprofile"
+
 # URLs da API da Caixa
 API_CAIXA_BASE = "https://servicebus2.caixa.gov.br/portaldeloterias/api/megasena"
 API_CAIXA_LATEST = f"{API_CAIXA_BASE}/latest"  # Último concurso
@@ -0,0 +1,125 @@
+"""
+Snapshot imutavel das estatisticas do historico
+Todas as contagens usadas pelos scores (frequencia, atraso, coocorrencia, Markov) calculadas
+uma vez em arrays somente leitura, com um hash do conteudo. Pode ser guardado em cache e
+compartilhado entre sessoes e threads sem copia.
+"""
+
+import datetime as dt
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from instrumentacao import cronometrado
+from matrizes import matriz_coocorrencia, matriz_dezenas, matriz_incidencia, matriz_markov
+
+DEZENA_MAX = 60
+
+# Nome do snapshot publicado pela ingestao no diretorio compartilhado
+ARQUIVO_SNAPSHOT = "snapshot.npz"
+
+
+def _somente_leitura(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class SnapshotEstatisticas:
+    concursos: Tuple                 # Concursos (frozen) em ordem cronologica
+    versao: str                      # sha256 de numeros + dezenas
+    dezenas: np.ndarray              # n x 6, ordenadas
+    incidencia: np.ndarray           # n x 61, uint8 (0/1)
+    frequencias: np.ndarray          # 61, contagem por dezena
+    atrasos: np.ndarray              # 61, concursos desde a ultima aparicao
+    coocorrencias: np.ndarray        # 61 x 61, simetrica
+    markov: np.ndarray               # 61 x 61, transicoes com lag 1
+
+    # Identidade pelo conteudo: os arrays nao entram na comparacao nem no hash
+    def __eq__(self, outro) -> bool:
+        if not isinstance(outro, SnapshotEstatisticas):
+            return NotImplemented
+        return self.versao == outro.versao
+
+    def __hash__(self) -> int:
+        return hash(self.versao)
+
+    @property
+    def total(self) -> int:
+        return len(self.concursos)
+
+    @property
+    def ultimo_numero(self) -> Optional[int]:
+        return self.concursos[-1].numero if self.concursos else None
+
+
+def versao_dados(concursos: Sequence) -> str:
+    """Hash do conteudo (numero e dezenas de cada concurso)."""
+    h = hashlib.sha256()
+    h.update(np.array([c.numero for c in concursos], dtype=np.int64).tobytes())
+    h.update(matriz_dezenas(concursos).tobytes())
+    return h.hexdigest()
+
+
+@cronometrado("analisador.criar_snapshot")
+def criar_snapshot(concursos: Sequence) -> SnapshotEstatisticas:
+    """Calcula o snapshot a partir de concursos ja em ordem cronologica."""
+    dezenas = matriz_dezenas(concursos)
+    incidencia = matriz_incidencia(dezenas)
+    n = len(concursos)
+
+    atrasos = np.zeros(DEZENA_MAX + 1, dtype=np.int64)
+    if n:
+        # Atraso = posicao da ultima aparicao contada a partir do fim (n se nunca saiu)
+        atrasos = np.where(incidencia.any(axis=0), np.argmax(incidencia[::-1], axis=0), n).astype(np.int64)
+        atrasos[0] = 0
+
+    return SnapshotEstatisticas(
+        concursos=tuple(concursos),
+        versao=versao_dados(concursos),
+        dezenas=_somente_leitura(dezenas),
+        incidencia=_somente_leitura(incidencia),
+        frequencias=_somente_leitura(incidencia.sum(axis=0).astype(np.int64)),
+        atrasos=_somente_leitura(atrasos),
+        coocorrencias=_somente_leitura(matriz_coocorrencia(incidencia)),
+        markov=_somente_leitura(matriz_markov(incidencia, 1)),
+    )
+
+
+def salvar_snapshot(caminho: Path, snapshot: SnapshotEstatisticas):
+    """Grava o snapshot (.npz, sem pickle) e troca o arquivo atomicamente."""
+    arrays = {f.name: getattr(snapshot, f.name) for f in fields(snapshot)
+              if isinstance(getattr(snapshot, f.name), np.ndarray)}
+    linhas = np.array([[c.numero, c.data.toordinal()] for c in snapshot.concursos], dtype=np.int64).reshape(-1, 2)
+
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".npz")
+    with os.fdopen(fd, "wb") as f:
+        np.savez(f, versao=np.array(snapshot.versao), concursos=linhas, **arrays)
+    os.replace(temporario, caminho)
+
+
+def carregar_snapshot(caminho: Path, fabrica: Callable) -> Optional[SnapshotEstatisticas]:
+    """Le um snapshot gravado por salvar_snapshot; fabrica(numero=, data=, dezenas=) recria os concursos."""
+    try:
+        with np.load(caminho, allow_pickle=False) as dados:
+            valores = {nome: _somente_leitura(dados[nome].copy()) for nome in dados.files
+                       if nome not in ('versao', 'concursos')}
+            # Snapshots antigos gravavam a incidencia em float64
+            valores['incidencia'] = _somente_leitura(valores['incidencia'].astype(np.uint8))
+            versao = str(dados['versao'])
+            linhas = dados['concursos']
+    except (OSError, KeyError, ValueError):
+        return None
+
+    concursos = tuple(
+        fabrica(numero=int(numero), data=dt.date.fromordinal(int(ordinal)), dezenas=tuple(int(d) for d in dezenas))
+        for (numero, ordinal), dezenas in zip(linhas, valores['dezenas'])
+    )
+    return SnapshotEstatisticas(concursos=concursos, versao=versao, **valores)
@@ -0,0 +1,247 @@
+"""
+Busca paralela de fechamentos (desdobramentos) da Mega-Sena
+Executa varias buscas locais com sementes independentes em processos separados
+e mantem o melhor fechamento (menor quantidade de jogos) encontrado
+"""
+
+import itertools
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from metricas import JOGOS_GERADOS
+
+TAMANHO_JOGO = 6
+
+# Pool e manager compartilhados entre reruns (criados sob demanda)
+_pool: Optional[ProcessPoolExecutor] = None
+_manager = None
+_lock = threading.Lock()
+
+
+def fechamento_guloso(dezenas_base: Sequence[int], garantia: int = 4) -> List[List[int]]:
+    """Fechamento deterministico: percorre as combinacoes em ordem e mantem as que cobrem algo novo."""
+    base = sorted(dezenas_base)
+    if len(base) <= TAMANHO_JOGO:
+        return [base]
+
+    todas_combinacoes = list(itertools.combinations(base, TAMANHO_JOGO))
+    if garantia >= TAMANHO_JOGO:
+        return [list(c) for c in todas_combinacoes]
+
+    jogos_selecionados = []
+    combinacoes_cobertas = set()
+    subconjuntos_necessarios = set(itertools.combinations(base, garantia))
+
+    for combo in todas_combinacoes:
+        subs_cobertos = set(itertools.combinations(combo, garantia))
+        if subs_cobertos - combinacoes_cobertas:
+            jogos_selecionados.append(list(combo))
+            combinacoes_cobertas.update(subs_cobertos)
+            if combinacoes_cobertas >= subconjuntos_necessarios:
+                break
+
+    return jogos_selecionados
+
+
+def verificar_fechamento(jogos: Sequence[Sequence[int]], dezenas_base: Sequence[int], garantia: int) -> bool:
+    """Confere se todo subconjunto de 'garantia' dezenas da base esta contido em algum jogo."""
+    cobertos = set()
+    for jogo in jogos:
+        cobertos.update(itertools.combinations(sorted(jogo), garantia))
+    return all(s in cobertos for s in itertools.combinations(sorted(dezenas_base), garantia))
+
+
+def _construir_fechamento(base: Tuple[int, ...], garantia: int, rng: random.Random) -> List[Tuple[int, ...]]:
+    """
+    Construcao gulosa aleatorizada: parte de um subconjunto ainda descoberto
+    e completa o jogo com as dezenas que cobrem mais subconjuntos novos.
+    """
+    pendentes = list(itertools.combinations(base, garantia))
+    rng.shuffle(pendentes)
+    cobertos = set()
+    jogos = []
+
+    for alvo in pendentes:
+        if alvo in cobertos:
+            continue
+
+        jogo = list(alvo)
+        while len(jogo) < TAMANHO_JOGO:
+            melhor = None
+            melhor_ganho = -1.0
+            for d in base:
+                if d in jogo:
+                    continue
+                ganho = 0
+                for resto in itertools.combinations(jogo, garantia - 1):
+                    if tuple(sorted(resto + (d,))) not in cobertos:
+                        ganho += 1
+                # Desempate aleatorio entre candidatos equivalentes
+                ganho += rng.random() * 0.5
+                if ganho > melhor_ganho:
+                    melhor, melhor_ganho = d, ganho
+            jogo.append(melhor)
+
+        jogo = tuple(sorted(jogo))
+        jogos.append(jogo)
+        cobertos.update(itertools.combinations(jogo, garantia))
+
+    return jogos
+
+
+def _remover_redundantes(jogos: List[Tuple[int, ...]], garantia: int, rng: random.Random) -> List[Tuple[int, ...]]:
+    """Remove jogos cujos subconjuntos ja estao todos cobertos por outros jogos."""
+    contagem: Dict[Tuple[int, ...], int] = {}
+    for jogo in jogos:
+        for s in itertools.combinations(jogo, garantia):
+            contagem[s] = contagem.get(s, 0) + 1
+
+    ordem = list(jogos)
+    rng.shuffle(ordem)
+    mantidos = []
+    for jogo in ordem:
+        subs = list(itertools.combinations(jogo, garantia))
+        if all(contagem[s] > 1 for s in subs):
+            for s in subs:
+                contagem[s] -= 1
+        else:
+            mantidos.append(jogo)
+
+    return sorted(mantidos)
+
+
+def buscar_fechamento(dezenas_base: Sequence[int], garantia: int = 4, semente: Optional[int] = None,
+                      tempo_limite: float = 5.0, max_iteracoes: int = 200,
+                      cancelar=None) -> List[List[int]]:
+    """
+    Busca local com reinicios aleatorios (executada em cada worker).
+
+    Repete construcao gulosa + remocao de redundantes ate esgotar o tempo,
+    as iteracoes ou ate 'cancelar' (Event) ser sinalizado. Retorna o melhor fechamento.
+    """
+    base = tuple(sorted(dezenas_base))
+    if len(base) <= TAMANHO_JOGO or garantia >= TAMANHO_JOGO:
+        return fechamento_guloso(base, garantia)
+
+    rng = random.Random(semente)
+    inicio = time.monotonic()
+    melhor = [tuple(j) for j in fechamento_guloso(base, garantia)]
+
+    for _ in range(max_iteracoes):
+        if cancelar is not None and cancelar.is_set():
+            break
+        if time.monotonic() - inicio > tempo_limite:
+            break
+
+        jogos = _construir_fechamento(base, garantia, rng)
+        jogos = _remover_redundantes(jogos, garantia, rng)
+        if len(jogos) < len(melhor):
+            melhor = jogos
+
+    return [list(j) for j in melhor]
+
+
+def obter_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Retorna o pool de processos compartilhado (um por processo do servidor)."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            # 'spawn' evita herdar threads do servidor web via fork
+            contexto = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), mp_context=contexto)
+        return _pool
+
+
+def _obter_manager():
+    global _manager
+    with _lock:
+        if _manager is None:
+            _manager = multiprocessing.get_context("spawn").Manager()
+        return _manager
+
+
+class BuscaFechamentoParalela:
+    """Acompanha uma busca de fechamento distribuida entre varios workers."""
+
+    def __init__(self, dezenas_base: Sequence[int], garantia: int = 4,
+                 executor: Optional[ProcessPoolExecutor] = None, workers: Optional[int] = None,
+                 tempo_limite: float = 5.0, semente: Optional[int] = None):
+        self.dezenas_base = sorted(dezenas_base)
+        self.garantia = garantia
+        self.executor = executor or obter_pool()
+        self.workers = workers or os.cpu_count() or 1
+        self.tempo_limite = tempo_limite
+        self.semente = semente if semente is not None else random.SystemRandom().randrange(2 ** 32)
+        self.futuros: List[Future] = []
+        self._evento_cancelar = None
+        self.cancelada = False
+
+    def iniciar(self) -> 'BuscaFechamentoParalela':
+        """Submete um worker por semente derivada da semente principal."""
+        self._evento_cancelar = _obter_manager().Event()
+        for i in range(self.workers):
+            self.futuros.append(self.executor.submit(
+                buscar_fechamento, self.dezenas_base, self.garantia,
+                self.semente + i, self.tempo_limite, 200, self._evento_cancelar
+            ))
+        return self
+
+    def progresso(self) -> float:
+        if not self.futuros:
+            return 0.0
+        return sum(1 for f in self.futuros if f.done()) / len(self.futuros)
+
+    def concluida(self) -> bool:
+        return all(f.done() for f in self.futuros)
+
+    def cancelar(self):
+        """Sinaliza os workers em execucao e descarta os que ainda nao comecaram."""
+        self.cancelada = True
+        if self._evento_cancelar is not None:
+            self._evento_cancelar.set()
+        for f in self.futuros:
+            f.cancel()
+
+    def resultado(self) -> List[List[int]]:
+        """Melhor fechamento entre os workers concluidos (guloso se nenhum terminou)."""
+        melhor = None
+        for f in self.futuros:
+            if not f.done() or f.cancelled() or f.exception() is not None:
+                continue
+            jogos = f.result()
+            if melhor is None or len(jogos) < len(melhor):
+                melhor = jogos
+        return melhor if melhor is not None else fechamento_guloso(self.dezenas_base, self.garantia)
+
+
+def executar_busca_paralela(dezenas_base: Sequence[int], garantia: int = 4,
+                            executor: Optional[ProcessPoolExecutor] = None, tempo_limite: float = 5.0,
+                            progresso: Optional[Callable[[float], bool]] = None) -> List[List[int]]:
+    """
+    Executa a busca paralela ate o fim, reportando o progresso.
+    Se 'progresso' retornar False, cancela os workers e devolve o melhor ate o momento.
+    """
+    if len(dezenas_base) <= TAMANHO_JOGO or garantia >= TAMANHO_JOGO:
+        jogos = fechamento_guloso(dezenas_base, garantia)
+        JOGOS_GERADOS.incrementar(len(jogos), tipo="fechamento")
+        return jogos
+
+    busca = BuscaFechamentoParalela(dezenas_base, garantia, executor=executor,
+                                    tempo_limite=tempo_limite).iniciar()
+    while not busca.concluida():
+        if progresso is not None and progresso(busca.progresso()) is False:
+            busca.cancelar()
+            break
+        time.sleep(0.1)
+
+    # Workers cancelados em execucao ainda entregam o melhor que encontraram
+    while not busca.concluida():
+        time.sleep(0.05)
+    jogos = busca.resultado()
+    JOGOS_GERADOS.incrementar(len(jogos), tipo="fechamento")
+    return jogos
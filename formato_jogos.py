@@ -0,0 +1,158 @@
+"""
+Formato compacto de conjuntos de jogos
+Cada jogo e guardado como uma mascara de 60 bits (8 bytes, bit d-1 = dezena d), precedida
+de um cabecalho com metadados em JSON (algoritmos, semente, garantia...). Um milhao de jogos
+ocupa 8 MB e carrega como um unico array NumPy, pronto para conferir com popcount.
+Exportacao Parquet (dezenas + mascara) opcional, para analises externas.
+"""
+
+import importlib.util
+import io
+import json
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Sequence, Union
+
+import numpy as np
+
+from monte_carlo import contar_bits
+
+MAGICO = b"MSJG"
+VERSAO_FORMATO = 1
+DEZENA_MAX = 60
+TAMANHO_JOGO = 6
+
+# magico, versao do formato, quantidade de jogos, tamanho dos metadados (bytes)
+_CABECALHO = struct.Struct("<4sIqI")
+
+_POTENCIAS = np.uint64(1) << np.arange(DEZENA_MAX, dtype=np.uint64)
+
+Destino = Union[str, Path, BinaryIO]
+
+# Parquet depende do pyarrow, que e opcional
+PARQUET_DISPONIVEL = importlib.util.find_spec("pyarrow") is not None
+
+
+@dataclass
+class ConjuntoJogos:
+    mascaras: np.ndarray                       # uint64, um jogo por elemento
+    metadados: Dict = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.mascaras)
+
+    def jogos(self) -> List[List[int]]:
+        return mascaras_para_jogos(self.mascaras)
+
+
+def jogos_para_mascaras(jogos: Iterable[Sequence[int]]) -> np.ndarray:
+    """Converte jogos (listas de dezenas 1..60) em mascaras uint64."""
+    lista = list(jogos)
+    if not lista:
+        return np.zeros(0, dtype=np.uint64)
+    if all(len(j) == TAMANHO_JOGO for j in lista):
+        dezenas = np.array(lista, dtype=np.uint64) - np.uint64(1)
+        return np.bitwise_or.reduce(np.uint64(1) << dezenas, axis=1)
+    return np.array([sum(1 << (d - 1) for d in j) for j in lista], dtype=np.uint64)
+
+
+def mascaras_para_jogos(mascaras: np.ndarray) -> List[List[int]]:
+    """Inverso de jogos_para_mascaras (dezenas em ordem crescente)."""
+    bits = (mascaras[:, None] & _POTENCIAS[None, :]) != 0
+    return [list(np.flatnonzero(linha) + 1) for linha in bits]
+
+
+def _abrir(destino: Destino, modo: str):
+    if isinstance(destino, (str, Path)):
+        return open(destino, modo)
+    return destino
+
+
+def salvar_jogos(destino: Destino, jogos: Iterable[Sequence[int]], **metadados):
+    """Grava o conjunto no formato binario compacto (.mjg)."""
+    mascaras = jogos_para_mascaras(jogos)
+    meta = json.dumps(metadados, ensure_ascii=False, default=str).encode("utf-8")
+    arquivo = _abrir(destino, "wb")
+    try:
+        arquivo.write(_CABECALHO.pack(MAGICO, VERSAO_FORMATO, len(mascaras), len(meta)))
+        arquivo.write(meta)
+        arquivo.write(mascaras.astype("<u8").tobytes())
+    finally:
+        if arquivo is not destino:
+            arquivo.close()
+
+
+def gerar_bytes_jogos(jogos: Iterable[Sequence[int]], **metadados) -> bytes:
+    saida = io.BytesIO()
+    salvar_jogos(saida, jogos, **metadados)
+    return saida.getvalue()
+
+
+def carregar_jogos(origem: Union[Destino, bytes]) -> ConjuntoJogos:
+    """Le um arquivo .mjg (caminho, arquivo aberto ou bytes)."""
+    if isinstance(origem, (bytes, bytearray)):
+        origem = io.BytesIO(origem)
+    arquivo = _abrir(origem, "rb")
+    try:
+        bruto = arquivo.read(_CABECALHO.size)
+        if len(bruto) < _CABECALHO.size:
+            raise ValueError("Arquivo de jogos truncado")
+        magico, versao, quantidade, tamanho_meta = _CABECALHO.unpack(bruto)
+        if magico != MAGICO or versao != VERSAO_FORMATO:
+            raise ValueError("Arquivo nao esta no formato de jogos")
+        metadados = json.loads(arquivo.read(tamanho_meta).decode("utf-8")) if tamanho_meta else {}
+        mascaras = np.frombuffer(arquivo.read(quantidade * 8), dtype="<u8").astype(np.uint64)
+    finally:
+        if arquivo is not origem:
+            arquivo.close()
+    if len(mascaras) != quantidade:
+        raise ValueError("Arquivo de jogos truncado")
+    return ConjuntoJogos(mascaras, metadados)
+
+
+def exportar_parquet(destino: Destino, jogos: Iterable[Sequence[int]], **metadados):
+    """Parquet com colunas dezena1..6 (uint8) e mascara (uint64); metadados no schema."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    mascaras = jogos_para_mascaras(jogos)
+    bits = (mascaras[:, None] & _POTENCIAS[None, :]) != 0
+    colunas = {'mascara': pa.array(mascaras, type=pa.uint64())}
+    if len(mascaras) and (bits.sum(axis=1) == TAMANHO_JOGO).all():
+        dezenas = np.nonzero(bits)[1].reshape(-1, TAMANHO_JOGO).astype(np.uint8) + 1
+        for i in range(TAMANHO_JOGO):
+            colunas[f'dezena{i + 1}'] = pa.array(dezenas[:, i], type=pa.uint8())
+
+    tabela = pa.table(colunas)
+    meta = json.dumps(metadados, ensure_ascii=False, default=str).encode("utf-8")
+    tabela = tabela.replace_schema_metadata({b'megasena': meta})
+    pq.write_table(tabela, destino, compression="zstd")
+
+
+def importar_parquet(origem: Union[Destino, bytes]) -> ConjuntoJogos:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if isinstance(origem, (bytes, bytearray)):
+        origem = pa.BufferReader(origem)
+    tabela = pq.read_table(origem, columns=['mascara'])
+    bruto = (tabela.schema.metadata or {}).get(b'megasena')
+    metadados = json.loads(bruto.decode("utf-8")) if bruto else {}
+    mascaras = tabela.column('mascara').to_numpy().astype(np.uint64)
+    return ConjuntoJogos(mascaras, metadados)
+
+
+def mascara_sorteio(dezenas: Sequence[int]) -> np.uint64:
+    return np.uint64(sum(1 << (d - 1) for d in dezenas))
+
+
+def conferir(mascaras: np.ndarray, dezenas_sorteadas: Sequence[int]) -> np.ndarray:
+    """Acertos de cada jogo contra um sorteio."""
+    return contar_bits(mascaras & mascara_sorteio(dezenas_sorteadas)).astype(np.int64)
+
+
+def distribuicao_acertos(mascaras: np.ndarray, dezenas_sorteadas: Sequence[int]) -> Dict[int, int]:
+    """Quantidade de jogos por numero de acertos (0..6) contra um sorteio."""
+    contagem = np.bincount(conferir(mascaras, dezenas_sorteadas), minlength=TAMANHO_JOGO + 1)
+    return {k: int(contagem[k]) for k in range(len(contagem))}
@@ -0,0 +1,91 @@
+"""
+Indice invertido de quadras, quinas e senas ja sorteadas
+Cada subconjunto de 4 e 5 dezenas (e o jogo completo de 6) de cada concurso e codificado
+pelo seu rank combinatorio e aponta para os concursos que o contem.
+Responder "este jogo ja fez quadra/quina?" custa 15 + 6 consultas em vez de varrer o historico.
+"""
+
+import itertools
+from math import comb
+from typing import Dict, List, Optional, Sequence
+
+DEZENA_MAX = 60
+TAMANHO_JOGO = 6
+
+# comb(n, k) pre-calculado para o rank combinatorio
+_COMB = [[comb(n, k) for k in range(TAMANHO_JOGO + 1)] for n in range(DEZENA_MAX + 1)]
+
+
+def rank_combinacao(dezenas: Sequence[int]) -> int:
+    """Rank colexicografico de um conjunto de dezenas (1..60); unico para cada tamanho."""
+    return sum(_COMB[d - 1][i + 1] for i, d in enumerate(sorted(dezenas)))
+
+
+def desfazer_rank(rank: int, k: int) -> List[int]:
+    """Inverso de rank_combinacao: as k dezenas (crescentes) com esse rank."""
+    dezenas = []
+    for i in range(k, 0, -1):
+        d = i
+        while d < DEZENA_MAX and _COMB[d][i] <= rank:
+            d += 1
+        rank -= _COMB[d - 1][i]
+        dezenas.append(d)
+    return dezenas[::-1]
+
+
+class IndiceAcertos:
+    """Indice k-subconjunto -> posicoes dos concursos que o contem (k = 4, 5, 6)."""
+
+    def __init__(self, concursos: Sequence = ()):
+        self.concursos: List = []
+        self._indices: Dict[int, Dict[int, List[int]]] = {4: {}, 5: {}, 6: {}}
+        for c in concursos:
+            self.adicionar(c)
+
+    def adicionar(self, concurso):
+        """Indexa um concurso (deve ser adicionado em ordem cronologica)."""
+        posicao = len(self.concursos)
+        self.concursos.append(concurso)
+        for k, indice in self._indices.items():
+            for sub in itertools.combinations(sorted(concurso.dezenas), k):
+                indice.setdefault(rank_combinacao(sub), []).append(posicao)
+
+    def ja_sorteado(self, dezenas: Sequence[int]) -> Optional[int]:
+        """Numero do concurso em que esta combinacao de 6 dezenas saiu (None se nunca saiu)."""
+        posicoes = self._indices[6].get(rank_combinacao(dezenas))
+        return self.concursos[posicoes[0]].numero if posicoes else None
+
+    def premiacoes(self, dezenas: Sequence[int], ultimos_n: Optional[int] = None) -> List[Dict]:
+        """
+        Concursos em que o jogo teria feito 4+ acertos, do mais antigo ao mais recente.
+        'ultimos_n' restringe aos N concursos mais recentes.
+        """
+        minimo = max(0, len(self.concursos) - ultimos_n) if ultimos_n else 0
+        acertos: Dict[int, int] = {}
+        for k in (4, 5, 6):
+            if len(dezenas) < k:
+                break
+            for sub in itertools.combinations(sorted(dezenas), k):
+                for posicao in self._indices[k].get(rank_combinacao(sub), ()):
+                    if posicao >= minimo:
+                        acertos[posicao] = max(acertos.get(posicao, 0), k)
+
+        detalhes = []
+        for posicao in sorted(acertos):
+            c = self.concursos[posicao]
+            # Jogos com mais de 6 dezenas podem acertar alem de k: conta exata
+            total = len(set(dezenas) & set(c.dezenas)) if len(dezenas) > TAMANHO_JOGO else acertos[posicao]
+            detalhes.append({
+                'concurso': c.numero,
+                'data': c.data.isoformat(),
+                'acertos': total,
+                'dezenas_sorteadas': list(c.dezenas)
+            })
+        return detalhes
+
+    def resumo(self, dezenas: Sequence[int], ultimos_n: Optional[int] = None) -> Dict[int, int]:
+        """Quantidade de concursos com 4, 5 e 6 acertos."""
+        contagem = {4: 0, 5: 0, 6: 0}
+        for det in self.premiacoes(dezenas, ultimos_n):
+            contagem[min(det['acertos'], TAMANHO_JOGO)] += 1
+        return contagem
@@ -0,0 +1,117 @@
+"""
+Ingestao agendada de resultados da Mega-Sena
+Processo independente da interface: verifica a Caixa, grava os concursos novos no Supabase
+em lote, recalcula o snapshot de estatisticas e publica concursos e snapshot no diretorio
+compartilhado com troca atomica. Com a ingestao rodando (INGESTAO_EXTERNA=true), o carregamento
+da pagina nunca espera pela API da Caixa.
+
+Uso:
+    python ingestao.py --diretorio cache            # laco continuo
+    python ingestao.py --diretorio cache --uma-vez  # um ciclo (ex.: cron)
+    python ingestao.py --metricas-porta 9465        # expoe /metrics para o Prometheus
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from cache_concursos import arquivo_compartilhado, exportar_binario
+from estatisticas import ARQUIVO_SNAPSHOT, criar_snapshot, salvar_snapshot
+from nucleo.carga import concursos_de_registros
+from supabase_client import buscar_concursos_ultimo_ano, buscar_ultimo_concurso, sincronizar_com_caixa
+from verificador_atualizacao import VerificadorAtualizacao
+
+try:
+    from config import CACHE_CONCURSOS_DIR, METRICAS_ENDERECO, METRICAS_PORTA
+except ImportError:
+    CACHE_CONCURSOS_DIR = os.getenv("CACHE_CONCURSOS_DIR", "")
+    METRICAS_PORTA = int(os.getenv("METRICAS_PORTA", "0"))
+    METRICAS_ENDERECO = os.getenv("METRICAS_ENDERECO", "127.0.0.1")
+
+
+def ultimo_numero_local() -> int:
+    ultimo = buscar_ultimo_concurso()
+    return ultimo['numero'] if ultimo else 0
+
+
+def publicar(diretorio: Path) -> int:
+    """Carrega os concursos do banco e publica concursos + snapshot. Retorna o ultimo numero."""
+    concursos = sorted(concursos_de_registros(buscar_concursos_ultimo_ano()), key=lambda c: c.data)
+    if not concursos:
+        print("Nenhum concurso no banco; nada publicado.")
+        return 0
+
+    ultimo = concursos[-1].numero
+    salvar_snapshot(diretorio / ARQUIVO_SNAPSHOT, criar_snapshot(concursos))
+    exportar_binario(arquivo_compartilhado(diretorio, True), concursos, ultimo)
+    return ultimo
+
+
+def executar_ciclo(verificador: VerificadorAtualizacao, diretorio: Path, dias_atras: int,
+                   forcar: bool = False) -> bool:
+    """Um ciclo de ingestao. Retorna True se algo novo foi publicado."""
+    estado = verificador.verificar(forcar=forcar)
+    publicado = arquivo_compartilhado(diretorio, True).exists()
+    if not estado.ha_novos and publicado:
+        return False
+
+    if estado.ha_novos:
+        novos, _, msg = sincronizar_com_caixa(dias_atras=dias_atras)
+        print(msg)
+        if novos == 0 and publicado:
+            return False
+
+    inicio = time.perf_counter()
+    ultimo = publicar(diretorio)
+    print(f"Publicado ate o concurso {ultimo} em {time.perf_counter() - inicio:.2f}s")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingestao agendada de resultados da Mega-Sena.")
+    parser.add_argument(
+        "--diretorio",
+        type=Path,
+        default=Path(CACHE_CONCURSOS_DIR or "cache"),
+        help="Diretório compartilhado com a interface (padrão: CACHE_CONCURSOS_DIR ou ./cache)",
+    )
+    parser.add_argument("--intervalo", type=float, default=300, help="Segundos entre verificações (padrão: 300)")
+    parser.add_argument("--dias", type=int, default=30, help="Quantos dias para trás sincronizar (padrão: 30)")
+    parser.add_argument("--uma-vez", action="store_true", help="Executa um único ciclo e termina")
+    parser.add_argument("--metricas-porta", type=int, default=METRICAS_PORTA,
+                        help="Porta do endpoint Prometheus /metrics (padrão: METRICAS_PORTA; 0 = desativado)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Mostra o tempo de import por módulo e o tempo total da execução")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from perfil_inicializacao import perfilar_inicializacao
+        sys.exit(perfilar_inicializacao(sys.argv))
+
+    if args.metricas_porta:
+        from metricas import iniciar_servidor
+        iniciar_servidor(args.metricas_porta, METRICAS_ENDERECO)
+
+    verificador = VerificadorAtualizacao(ultimo_numero_local, intervalo=args.intervalo)
+
+    try:
+        executar_ciclo(verificador, args.diretorio, args.dias, forcar=True)
+    except Exception as e:
+        print(f"Erro no ciclo de ingestao: {e}")
+        if args.uma_vez:
+            sys.exit(1)
+    if args.uma_vez:
+        return
+
+    while True:
+        time.sleep(args.intervalo)
+        try:
+            executar_ciclo(verificador, args.diretorio, args.dias)
+        except Exception as e:
+            print(f"Erro no ciclo de ingestao: {e}")
+
+
+if __name__ == "__main__":
+    main()
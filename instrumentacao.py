@@ -0,0 +1,195 @@
+"""
+Instrumentacao leve dos caminhos criticos
+Cronometros monotonicos (decorator ou context manager) e contadores agrupados por execucao
+da pagina. Com a instrumentacao desligada (padrao fora de DEBUG) cada ponto medido custa so
+a verificacao de uma flag; ligada, os trechos vao para o coletor da execucao atual (um por
+thread/contexto), exibido no painel de debug e exportavel em JSON.
+Observadores (ex.: metricas.py) recebem cada medicao (nome, segundos, erro) mesmo fora de DEBUG.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+try:
+    from config import DEBUG
+except ImportError:
+    DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+_ativo = DEBUG
+_observadores: List[Callable[[str, float, bool], None]] = []
+# Mede algo? (coletor ligado ou algum observador registrado)
+_medindo = _ativo
+
+
+@dataclass
+class Trecho:
+    nome: str
+    inicio_ms: float      # relativo ao inicio da execucao
+    duracao_ms: float
+    profundidade: int
+    erro: bool = False
+
+
+class Coletor:
+    """Trechos e contadores de uma execucao (um rerun da pagina, um ciclo da ingestao...)."""
+
+    def __init__(self, rotulo: str = ""):
+        self.rotulo = rotulo
+        self.criado_em = time.time()
+        self.inicio = time.perf_counter()
+        self.trechos: List[Trecho] = []
+        self.contadores: Dict[str, int] = defaultdict(int)
+        self._profundidade = 0
+
+    @property
+    def duracao_ms(self) -> float:
+        return (time.perf_counter() - self.inicio) * 1000
+
+    def resumo(self) -> List[Dict]:
+        """Por nome: chamadas, tempo total e maximo (ms), do mais caro para o mais barato."""
+        agregado: Dict[str, Dict] = {}
+        for t in self.trechos:
+            item = agregado.setdefault(t.nome, {'nome': t.nome, 'chamadas': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            item['chamadas'] += 1
+            item['total_ms'] += t.duracao_ms
+            item['max_ms'] = max(item['max_ms'], t.duracao_ms)
+        return sorted(agregado.values(), key=lambda i: -i['total_ms'])
+
+    def para_dict(self) -> Dict:
+        return {
+            'rotulo': self.rotulo,
+            'criado_em': self.criado_em,
+            'duracao_ms': round(self.duracao_ms, 3),
+            'trechos': [asdict(t) for t in self.trechos],
+            'contadores': dict(self.contadores),
+        }
+
+    def para_json(self) -> str:
+        return json.dumps(self.para_dict(), ensure_ascii=False, indent=2)
+
+
+_coletor: contextvars.ContextVar[Optional[Coletor]] = contextvars.ContextVar("coletor_instrumentacao", default=None)
+
+
+def _recalcular():
+    global _medindo
+    _medindo = _ativo or bool(_observadores)
+
+
+def ativar(ligado: bool = True):
+    global _ativo
+    _ativo = ligado
+    _recalcular()
+
+
+def observar(callback: Callable[[str, float, bool], None]):
+    """Registra callback(nome, duracao_segundos, erro) chamado a cada trecho medido."""
+    if callback not in _observadores:
+        _observadores.append(callback)
+    _recalcular()
+
+
+def parar_de_observar(callback: Callable[[str, float, bool], None]):
+    if callback in _observadores:
+        _observadores.remove(callback)
+    _recalcular()
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+def iniciar_execucao(rotulo: str = "") -> Optional[Coletor]:
+    """Novo coletor para o contexto atual (None se a instrumentacao esta desligada)."""
+    if not _ativo:
+        return None
+    coletor = Coletor(rotulo)
+    _coletor.set(coletor)
+    return coletor
+
+
+def coletor_atual() -> Optional[Coletor]:
+    return _coletor.get() if _ativo else None
+
+
+def contar(nome: str, quantidade: int = 1):
+    if _ativo:
+        coletor = _coletor.get()
+        if coletor is not None:
+            coletor.contadores[nome] += quantidade
+
+
+@contextmanager
+def _medir(coletor: Optional[Coletor], nome: str):
+    inicio = time.perf_counter()
+    if coletor is not None:
+        coletor._profundidade += 1
+    erro = False
+    try:
+        yield
+    except Exception:
+        # So Exception conta como erro: st.rerun()/st.stop() (RerunException, StopException)
+        # e outros desvios de controle derivam de BaseException e passam sem marcar o trecho
+        erro = True
+        raise
+    finally:
+        fim = time.perf_counter()
+        if coletor is not None:
+            coletor._profundidade -= 1
+            coletor.trechos.append(Trecho(nome, (inicio - coletor.inicio) * 1000, (fim - inicio) * 1000,
+                                          coletor._profundidade, erro))
+        for callback in _observadores:
+            callback(nome, fim - inicio, erro)
+
+
+class _Nulo:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _Nulo()
+
+
+def medir(nome: str):
+    """Context manager que cronometra o bloco no coletor atual (sem efeito se desligado)."""
+    if not _medindo:
+        return _NULO
+    coletor = _coletor.get() if _ativo else None
+    if coletor is None and not _observadores:
+        return _NULO
+    return _medir(coletor, nome)
+
+
+def cronometrado(nome_ou_funcao=None):
+    """
+    Decorator: @cronometrado ou @cronometrado("nome"). Sem nome, usa modulo.funcao.
+    Com a instrumentacao desligada, a chamada passa direto para a funcao.
+    """
+    def decorar(funcao: Callable, nome: Optional[str] = None) -> Callable:
+        nome = nome or f"{funcao.__module__}.{funcao.__qualname__}"
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not _medindo:
+                return funcao(*args, **kwargs)
+            coletor = _coletor.get() if _ativo else None
+            if coletor is None and not _observadores:
+                return funcao(*args, **kwargs)
+            with _medir(coletor, nome):
+                return funcao(*args, **kwargs)
+
+        return envolvida
+
+    if callable(nome_ou_funcao):
+        return decorar(nome_ou_funcao)
+    return lambda funcao: decorar(funcao, nome_ou_funcao)
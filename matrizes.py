@@ -0,0 +1,98 @@
+"""
+Estatisticas do historico em forma matricial (NumPy)
+Matriz de incidencia concursos x dezenas, coocorrencia densa de pares e contagens
+esparsas de trios/quadras indexadas pelo rank combinatorio
+"""
+
+import itertools
+from math import comb
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from indice_acertos import desfazer_rank
+
+DEZENA_MIN = 1
+DEZENA_MAX = 60
+TAMANHO_JOGO = 6
+
+# Tabela comb(n, k) como array, para calcular ranks vetorizados
+_TABELA_COMB = np.array([[comb(n, k) for k in range(TAMANHO_JOGO + 1)] for n in range(DEZENA_MAX + 1)],
+                        dtype=np.int64)
+
+# Indices (i < j) do triangulo superior, ja restritos a 1..60
+_PARES_I, _PARES_J = np.triu_indices(DEZENA_MAX + 1, 1)
+_MASCARA_PARES = _PARES_I >= DEZENA_MIN
+_PARES_I, _PARES_J = _PARES_I[_MASCARA_PARES], _PARES_J[_MASCARA_PARES]
+
+
+def matriz_dezenas(concursos: Sequence) -> np.ndarray:
+    """Dezenas de cada concurso, ordenadas, como array (n x 6)."""
+    if not concursos:
+        return np.zeros((0, TAMANHO_JOGO), dtype=np.int64)
+    return np.sort(np.array([c.dezenas for c in concursos], dtype=np.int64), axis=1)
+
+
+def matriz_incidencia(dezenas: np.ndarray) -> np.ndarray:
+    """
+    X[t, d] = 1 se a dezena d saiu no concurso t (coluna 0 sempre zero).
+    Em uint8 (1 byte por celula); os produtos convertem para float64 so na hora, para usar BLAS.
+    """
+    x = np.zeros((len(dezenas), DEZENA_MAX + 1), dtype=np.uint8)
+    np.put_along_axis(x, dezenas, 1, axis=1)
+    return x
+
+
+def matriz_coocorrencia(incidencia: np.ndarray) -> np.ndarray:
+    """Contagem simetrica de pares (Xt . X) com a diagonal zerada."""
+    x = incidencia.astype(np.float64, copy=False)
+    cooc = (x.T @ x).astype(np.int64)
+    np.fill_diagonal(cooc, 0)
+    return cooc
+
+
+def top_pares(cooc: np.ndarray, top_n: int) -> List[Tuple[Tuple[int, int], int]]:
+    """Os top_n pares mais frequentes, por selecao parcial (argpartition)."""
+    contagens = cooc[_PARES_I, _PARES_J]
+    top = min(top_n, int((contagens > 0).sum()))
+    if top <= 0:
+        return []
+    idx = np.argpartition(-contagens, top - 1)[:top]
+    idx = idx[np.lexsort((idx, -contagens[idx]))]
+    return [((int(_PARES_I[i]), int(_PARES_J[i])), int(contagens[i])) for i in idx]
+
+
+def contagens_subconjuntos(dezenas: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantas vezes cada k-subconjunto ja saiu junto.
+    Retorna (ranks ordenados, contagens): so os subconjuntos que ocorreram sao guardados.
+    """
+    posicoes = np.array(list(itertools.combinations(range(TAMANHO_JOGO), k)), dtype=np.int64)
+    subs = dezenas[:, posicoes]  # n x C(6, k) x k, cada linha ja crescente
+    ranks = _TABELA_COMB[subs - 1, np.arange(1, k + 1)].sum(axis=2).ravel()
+    return np.unique(ranks, return_counts=True)
+
+
+def top_subconjuntos(ranks: np.ndarray, contagens: np.ndarray, k: int,
+                     top_n: int) -> List[Tuple[Tuple[int, ...], int]]:
+    """Os top_n k-subconjuntos mais frequentes de contagens_subconjuntos."""
+    top = min(top_n, len(contagens))
+    if top <= 0:
+        return []
+    idx = np.argpartition(-contagens, top - 1)[:top]
+    idx = idx[np.lexsort((ranks[idx], -contagens[idx]))]
+    return [(tuple(desfazer_rank(int(ranks[i]), k)), int(contagens[i])) for i in idx]
+
+
+def matriz_markov(incidencia: np.ndarray, lag: int = 1) -> np.ndarray:
+    """M[i, j] = vezes que a dezena j saiu 'lag' concursos depois da dezena i (X[:-lag]t . X[lag:])."""
+    if len(incidencia) <= lag:
+        return np.zeros((DEZENA_MAX + 1, DEZENA_MAX + 1), dtype=np.int64)
+    x = incidencia.astype(np.float64, copy=False)
+    return (x[:-lag].T @ x[lag:]).astype(np.int64)
+
+
+def normalizar_linhas(matriz: np.ndarray) -> np.ndarray:
+    """Matriz de transicao: cada linha com soma 1 (linhas vazias ficam zeradas)."""
+    somas = matriz.sum(axis=1, keepdims=True)
+    return np.divide(matriz, somas, out=np.zeros(matriz.shape, dtype=np.float64), where=somas > 0)
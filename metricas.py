@@ -0,0 +1,276 @@
+"""
+Metricas no formato de exposicao do Prometheus (texto 0.0.4)
+Registro de contadores e histogramas com rotulos, alimentado pela instrumentacao (cada chamada
+cronometrada ao Supabase, a Caixa, reconstrucao do analisador e geracao de jogos) e por
+contadores diretos (acertos/faltas de cache, jogos gerados). Um servidor HTTP lateral, numa
+thread do proprio processo, serve GET /metrics; para testar localmente:
+
+    python metricas.py --porta 9464      # demonstracao com chamadas sinteticas
+    curl http://127.0.0.1:9464/metrics
+"""
+
+import argparse
+import bisect
+import math
+import os
+import threading
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import instrumentacao
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+try:
+    from config import METRICAS_ENDERECO, METRICAS_PORTA
+except ImportError:
+    METRICAS_PORTA = int(os.getenv("METRICAS_PORTA", "0"))
+    METRICAS_ENDERECO = os.getenv("METRICAS_ENDERECO", "127.0.0.1")
+
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+BALDES_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _formatar_rotulos(rotulos: Rotulos, extra: Optional[Tuple[str, str]] = None) -> str:
+    pares = list(rotulos) + ([extra] if extra else [])
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in pares) + "}"
+
+
+def _formatar_valor(valor: float) -> str:
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor)) if not float(valor).is_integer() else str(int(valor))
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos: Dict[str, str]) -> Rotulos:
+        if set(rotulos) != set(self.rotulos):
+            raise ValueError(f"{self.nome}: rotulos esperados {self.rotulos}, recebidos {tuple(rotulos)}")
+        return tuple((k, str(rotulos[k])) for k in self.rotulos)
+
+    def linhas(self) -> Iterator[str]:
+        yield f"# HELP {self.nome} {self.ajuda}"
+        yield f"# TYPE {self.nome} {self.tipo}"
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()):
+        super().__init__(nome, ajuda, rotulos)
+        self._valores: Dict[Rotulos, float] = {}
+
+    def incrementar(self, valor: float = 1.0, **rotulos):
+        if valor < 0:
+            raise ValueError("contadores so aumentam")
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def valor(self, **rotulos) -> float:
+        return self._valores.get(self._chave(rotulos), 0.0)
+
+    def linhas(self) -> Iterator[str]:
+        yield from super().linhas()
+        with self._lock:
+            valores = sorted(self._valores.items())
+        for rotulos, valor in valores:
+            yield f"{self.nome}{_formatar_rotulos(rotulos)} {_formatar_valor(valor)}"
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                 baldes: Sequence[float] = BALDES_PADRAO):
+        super().__init__(nome, ajuda, rotulos)
+        self.baldes = tuple(sorted(baldes))
+        # por rotulos: [contagem por balde (nao acumulada) + estouro, soma]
+        self._series: Dict[Rotulos, List] = {}
+
+    def observar(self, valor: float, **rotulos):
+        chave = self._chave(rotulos)
+        posicao = bisect.bisect_left(self.baldes, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.baldes) + 1), 0.0]
+            serie[0][posicao] += 1
+            serie[1] += valor
+
+    def contagem(self, **rotulos) -> int:
+        serie = self._series.get(self._chave(rotulos))
+        return sum(serie[0]) if serie else 0
+
+    def linhas(self) -> Iterator[str]:
+        yield from super().linhas()
+        with self._lock:
+            series = sorted((k, (list(v[0]), v[1])) for k, v in self._series.items())
+        for rotulos, (contagens, soma) in series:
+            acumulado = 0
+            for limite, contagem in zip(self.baldes + (math.inf,), contagens):
+                acumulado += contagem
+                yield f"{self.nome}_bucket{_formatar_rotulos(rotulos, ('le', _formatar_valor(limite)))} {acumulado}"
+            yield f"{self.nome}_sum{_formatar_rotulos(rotulos)} {_formatar_valor(soma)}"
+            yield f"{self.nome}_count{_formatar_rotulos(rotulos)} {acumulado}"
+
+
+class Registro:
+    """Metricas do processo; contador()/histograma() devolvem a existente se o nome ja foi registrado."""
+
+    def __init__(self):
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+
+    def _obter(self, classe, nome: str, ajuda: str, rotulos: Sequence[str], **kwargs):
+        with self._lock:
+            metrica = self._metricas.get(nome)
+            if metrica is None:
+                metrica = self._metricas[nome] = classe(nome, ajuda, rotulos, **kwargs)
+            elif not isinstance(metrica, classe) or metrica.rotulos != tuple(rotulos):
+                raise ValueError(f"Metrica {nome} ja registrada com outro tipo ou rotulos")
+            return metrica
+
+    def contador(self, nome: str, ajuda: str, rotulos: Sequence[str] = ()) -> Contador:
+        return self._obter(Contador, nome, ajuda, rotulos)
+
+    def histograma(self, nome: str, ajuda: str, rotulos: Sequence[str] = (),
+                   baldes: Sequence[float] = BALDES_PADRAO) -> Histograma:
+        return self._obter(Histograma, nome, ajuda, rotulos, baldes=baldes)
+
+    def exposicao(self) -> str:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        return "\n".join(linha for m in metricas for linha in m.linhas()) + "\n"
+
+
+REGISTRO = Registro()
+
+OPERACOES = REGISTRO.contador(
+    "megasena_operacoes_total", "Chamadas instrumentadas por operacao e resultado.", ("servico", "operacao", "resultado"))
+DURACAO = REGISTRO.histograma(
+    "megasena_operacao_duracao_segundos", "Duracao das chamadas instrumentadas.", ("servico", "operacao"))
+CACHE = REGISTRO.contador(
+    "megasena_cache_total", "Consultas aos caches de concursos e derivados.", ("cache", "resultado"))
+JOGOS_GERADOS = REGISTRO.contador(
+    "megasena_jogos_gerados_total", "Jogos gerados por tipo de geracao.", ("tipo",))
+
+
+# Geracao de jogos e exportacao de arquivos, por prefixo explicito do nome da operacao
+# (um "gerar" no nome, como em gerar_excel_jogos, nao faz da exportacao uma geracao)
+_PREFIXOS_GERADOR = ("nucleo.gerador.", "GeradorJogos.", "GeradorFechamento.")
+_PREFIXOS_EXPORTACAO = ("exportacao.", "app_web.gerar_excel_jogos", "app_web.gerar_parquet_jogos")
+
+
+def _servico(operacao: str) -> str:
+    """Agrupa operacoes pelo servico externo/componente que elas representam."""
+    if operacao.startswith("supabase_client.") and "caixa" not in operacao:
+        return "supabase"
+    if "caixa" in operacao:
+        return "caixa"
+    if operacao.startswith("analisador.") or "analisador" in operacao or "snapshot" in operacao:
+        return "analisador"
+    if operacao.startswith(_PREFIXOS_GERADOR):
+        return "gerador"
+    if operacao.startswith(_PREFIXOS_EXPORTACAO):
+        return "exportacao"
+    return "app"
+
+
+def _normalizar(nome: str) -> str:
+    # A pagina do Streamlit roda como __main__
+    return "app_web." + nome[len("__main__."):] if nome.startswith("__main__.") else nome
+
+
+def _observar_operacao(nome: str, duracao: float, erro: bool):
+    operacao = _normalizar(nome)
+    servico = _servico(operacao)
+    OPERACOES.incrementar(servico=servico, operacao=operacao, resultado="erro" if erro else "ok")
+    DURACAO.observar(duracao, servico=servico, operacao=operacao)
+
+
+def habilitar():
+    """Passa a registrar as chamadas cronometradas pela instrumentacao."""
+    instrumentacao.observar(_observar_operacao)
+
+
+def _manipulador(registro: Registro):
+    # http.server so e importado quando o servidor sobe (custo de import fora do caminho frio)
+    from http.server import BaseHTTPRequestHandler
+
+    class Manipulador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            corpo = registro.exposicao().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", TIPO_CONTEUDO)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass  # sem log por requisicao (o Prometheus consulta a cada poucos segundos)
+
+    return Manipulador
+
+
+def iniciar_servidor(porta: int = METRICAS_PORTA, endereco: str = METRICAS_ENDERECO,
+                     registro: Registro = REGISTRO) -> Optional["ThreadingHTTPServer"]:
+    """Sobe o servidor /metrics numa thread daemon e habilita a coleta. None se a porta falhar."""
+    from http.server import ThreadingHTTPServer
+
+    try:
+        servidor = ThreadingHTTPServer((endereco, porta), _manipulador(registro))
+    except OSError as e:
+        print(f"Erro ao iniciar servidor de metricas em {endereco}:{porta}: {e}")
+        return None
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="servidor-metricas", daemon=True).start()
+    habilitar()
+    return servidor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor de metricas com chamadas sinteticas (teste local).")
+    parser.add_argument("--porta", type=int, default=METRICAS_PORTA or 9464, help="Porta HTTP (padrão: 9464)")
+    parser.add_argument("--endereco", type=str, default=METRICAS_ENDERECO, help="Endereço (padrão: 127.0.0.1)")
+    args = parser.parse_args()
+
+    import random
+    import time
+
+    servidor = iniciar_servidor(args.porta, args.endereco)
+    if servidor is None:
+        raise SystemExit(1)
+    print(f"Metricas em http://{args.endereco}:{servidor.server_port}/metrics (Ctrl+C para sair)")
+
+    @instrumentacao.cronometrado("supabase_client.demo_consulta")
+    def consulta():
+        time.sleep(random.uniform(0.001, 0.05))
+
+    while True:
+        consulta()
+        CACHE.incrementar(cache="demo", resultado=random.choice(("hit", "hit", "hit", "miss")))
+        time.sleep(0.5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Motor vetorizado de Monte Carlo da Mega-Sena (NumPy)
+Sorteia jogos e resultados como mascaras de 60 bits e conta acertos com popcount,
+processando em lotes para manter a memoria limitada
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+
+DEZENA_MAX = 60
+TAMANHO_JOGO = 6
+
+_UM = np.uint64(1)
+
+# Tabela de bits por byte (fallback para NumPy < 2.0, sem np.bitwise_count)
+_BITS_POR_BYTE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def contar_bits(mascaras: np.ndarray) -> np.ndarray:
+    """Popcount vetorizado de um array uint64."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(mascaras)
+    bytes_ = mascaras.view(np.uint8).reshape(-1, 8)
+    return _BITS_POR_BYTE[bytes_].sum(axis=1, dtype=np.uint8)
+
+
+def sortear_mascaras(rng: np.random.Generator, quantidade: int,
+                     tamanho: int = TAMANHO_JOGO, universo: int = DEZENA_MAX) -> np.ndarray:
+    """
+    Sorteia 'quantidade' subconjuntos uniformes de 'tamanho' dezenas como mascaras de bits
+    (bit i = dezena i + 1), usando o algoritmo de Floyd vetorizado: 'tamanho' passos
+    de inteiros aleatorios, sem ordenacao.
+    """
+    mascaras = np.zeros(quantidade, dtype=np.uint64)
+    for j in range(universo - tamanho, universo):
+        t = rng.integers(0, j + 1, quantidade, dtype=np.uint64)
+        bit = _UM << t
+        mascaras |= np.where((mascaras & bit) != 0, _UM << np.uint64(j), bit)
+    return mascaras
+
+
+def simular_acertos(num_simulacoes: int, semente: Optional[int] = None, tamanho_lote: int = 500_000,
+                    progresso: Optional[Callable[[float], bool]] = None) -> np.ndarray:
+    """
+    Simula pares (jogo, resultado) aleatorios e retorna o histograma de acertos (indices 0..6).
+    A soma do histograma e o numero de simulacoes efetivamente executadas
+    (menor que o pedido se 'progresso' retornar False).
+    """
+    rng = np.random.default_rng(semente)
+    histograma = np.zeros(TAMANHO_JOGO + 1, dtype=np.int64)
+    executadas = 0
+
+    while executadas < num_simulacoes:
+        if progresso is not None and progresso(executadas / num_simulacoes) is False:
+            break
+        lote = min(tamanho_lote, num_simulacoes - executadas)
+        jogos = sortear_mascaras(rng, lote)
+        resultados = sortear_mascaras(rng, lote)
+        histograma += np.bincount(contar_bits(jogos & resultados), minlength=TAMANHO_JOGO + 1)
+        executadas += lote
+
+    return histograma
@@ -0,0 +1,64 @@
+"""
+Nucleo da Mega-Sena, sem dependencia de interface (Streamlit)
+Modelo de dados, carga de resultados, analisador, geradores, fechamentos e simuladores usados
+pela interface web (app_web.py), pelo app de terminal (mega_sena_app.py), pela linha de
+comando (gerador_megasena.py), pela ingestao e pelos benchmarks.
+
+    from nucleo import AnalisadorMegaSena, GeradorJogos, carregar_resultados
+    concursos = carregar_resultados(Path("resultados.xlsx"))
+    jogos, algoritmos = GeradorJogos(AnalisadorMegaSena(concursos)).gerar_jogos(10, ["frequencia", "markov"])
+
+Dependencias: o pacote nao e autocontido. So nucleo.modelo e nucleo.frequencia usam apenas a
+biblioteca padrao; os demais importam modulos planos da raiz do repositorio, que precisa
+estar no sys.path (rodar da raiz ou com PYTHONPATH):
+    nucleo.carga       registro_concursos (e pandas/NumPy para xlsx)
+    nucleo.analisador  estatisticas, matrizes, indice_acertos, formato_jogos, monte_carlo,
+                       probabilidade_exata
+    nucleo.gerador     instrumentacao, metricas, fechamento
+Os motores pesados (fechamento, simulacao_estrategias, backtest, estatisticas, matrizes)
+continuam nesses modulos e sao reexportados aqui.
+
+Os nomes sao carregados sob demanda: 'from nucleo.modelo import Concurso' ou
+'from nucleo import carregar_resultados' nao importam NumPy.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'nucleo.modelo': (
+        'DEZENA_MIN', 'DEZENA_MAX', 'TAMANHO_JOGO', 'FAIXAS', 'Concurso', 'JogoSalvo', 'ScoreDezena',
+        'dezenas_validas', 'faixa', 'jogo_balanceado', 'filtrar_por_anos',
+    ),
+    'nucleo.carga': (
+        'PANDAS_DISPONIVEL', 'parse_data', 'carregar_resultados', 'carregar_resultados_csv',
+        'carregar_resultados_excel', 'carregar_resultados_registro', 'concursos_de_registros',
+        'gravar_registro', 'registro_em_dia',
+    ),
+    'nucleo.frequencia': ('frequencias', 'gerar_lote'),
+    'nucleo.analisador': ('AnalisadorMegaSena',),
+    'nucleo.gerador': ('GeradorJogos', 'GeradorFechamento'),
+    'fechamento': ('fechamento_guloso', 'executar_busca_paralela', 'BuscaFechamentoParalela'),
+    'simulacao_estrategias': ('Estrategia', 'simular_estrategia'),
+    'backtest': ('executar_backtest',),
+    'estatisticas': ('SnapshotEstatisticas', 'criar_snapshot', 'versao_dados', 'salvar_snapshot', 'carregar_snapshot'),
+    'matrizes': (
+        'matriz_dezenas', 'matriz_incidencia', 'matriz_coocorrencia', 'matriz_markov', 'normalizar_linhas',
+        'top_pares', 'contagens_subconjuntos', 'top_subconjuntos',
+    ),
+}
+_ORIGEM = {nome: modulo for modulo, nomes in _EXPORTS.items() for nome in nomes}
+
+__all__ = sorted(_ORIGEM)
+
+
+def __getattr__(nome: str):
+    modulo = _ORIGEM.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module 'nucleo' has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(modulo), nome)
+    globals()[nome] = valor
+    return valor
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,519 @@
+"""
+Analisador estatistico dos concursos
+Frequencias, atrasos, Markov, coocorrencias e subconjuntos vem do snapshot imutavel
+(estatisticas.py, NumPy); simulacao vetorizada, retorno exato e premiacoes passadas pelo
+indice invertido. Usado igualmente pela interface web, pelo app de terminal e pelos workers.
+"""
+
+import datetime as dt
+from collections import Counter, defaultdict
+from math import comb
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from estatisticas import SnapshotEstatisticas, criar_snapshot
+from formato_jogos import ConjuntoJogos, distribuicao_acertos as distribuicao_acertos_conjunto
+from indice_acertos import IndiceAcertos
+from matrizes import contagens_subconjuntos, matriz_markov, normalizar_linhas, top_pares, top_subconjuntos
+from monte_carlo import simular_acertos
+from nucleo.modelo import DEZENA_MAX, DEZENA_MIN, Concurso
+from probabilidade_exata import CUSTO_JOGO, PREMIOS_MEDIOS, analisar_jogo, analisar_lote
+
+
+class AnalisadorMegaSena:
+    def __init__(self, concursos: List[Concurso], indice_acertos: Optional[IndiceAcertos] = None,
+                 snapshot: Optional[SnapshotEstatisticas] = None):
+        if snapshot is not None:
+            self.concursos = list(snapshot.concursos)
+        else:
+            self.concursos = sorted(concursos, key=lambda c: c.data)
+        self.ultimo_concurso = self.concursos[-1] if self.concursos else None
+        self._snapshot = snapshot
+        self._matriz_markov: Dict[int, np.ndarray] = {}
+        self._subconjuntos: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._indice_acertos = indice_acertos
+
+    @classmethod
+    def de_snapshot(cls, snapshot: SnapshotEstatisticas,
+                    indice_acertos: Optional[IndiceAcertos] = None) -> 'AnalisadorMegaSena':
+        """Analisador leve sobre um snapshot ja calculado (compartilhado entre sessoes)."""
+        return cls([], indice_acertos=indice_acertos, snapshot=snapshot)
+
+    def estatisticas(self) -> SnapshotEstatisticas:
+        """Snapshot imutavel das contagens; calculado na primeira chamada se nao foi fornecido."""
+        if self._snapshot is None:
+            self._snapshot = criar_snapshot(self.concursos)
+        return self._snapshot
+
+    def filtrar_por_anos(self, anos: int) -> 'AnalisadorMegaSena':
+        limite = dt.date.today() - dt.timedelta(days=anos * 365)
+        filtrados = [c for c in self.concursos if c.data >= limite]
+        return AnalisadorMegaSena(filtrados)
+
+    def calcular_frequencias(self) -> Dict[int, int]:
+        frequencias = self.estatisticas().frequencias
+        return {d: int(frequencias[d]) for d in range(DEZENA_MIN, DEZENA_MAX + 1) if frequencias[d] > 0}
+
+    def scores_frequencia(self) -> Dict[int, float]:
+        freq = self.calcular_frequencias()
+        if not freq:
+            return {d: 0.0 for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+        max_freq = max(freq.values()) if freq else 1
+        return {d: freq.get(d, 0) / max_freq for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+
+    def calcular_matriz_markov(self, lag: int = 1) -> np.ndarray:
+        """Contagens 61x61 de transicoes dezena i -> dezena j com defasagem de 'lag' concursos."""
+        if lag == 1:
+            return self.estatisticas().markov
+        if lag not in self._matriz_markov:
+            self._matriz_markov[lag] = matriz_markov(self.matriz_incidencia(), lag)
+        return self._matriz_markov[lag]
+
+    def matriz_transicao(self, lag: int = 1) -> np.ndarray:
+        """Matriz de transicao normalizada por linha."""
+        return normalizar_linhas(self.calcular_matriz_markov(lag))
+
+    def scores_markov(self, dezenas_referencia: Optional[Set[int]] = None,
+                      passos: int = 1, lag: int = 1) -> Dict[int, float]:
+        """
+        Soma das transicoes a partir das dezenas de referencia. Com passos > 1,
+        propaga o resultado pela matriz de transicao elevada a (passos - 1).
+        """
+        if dezenas_referencia is None:
+            if self.ultimo_concurso is None:
+                return {d: 0.0 for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+            dezenas_referencia = self.ultimo_concurso.dezenas_set
+
+        scores = self.calcular_matriz_markov(lag)[sorted(dezenas_referencia)].sum(axis=0).astype(np.float64)
+        if passos > 1:
+            scores = scores @ np.linalg.matrix_power(self.matriz_transicao(lag), passos - 1)
+
+        max_score = scores[DEZENA_MIN:].max()
+        max_score = max_score if max_score > 0 else 1
+        return {d: float(scores[d]) / max_score for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+
+    def matriz_incidencia(self) -> np.ndarray:
+        """Matriz concursos x dezenas (0/1), base das estatisticas matriciais."""
+        return self.estatisticas().incidencia
+
+    def calcular_coocorrencias(self) -> np.ndarray:
+        """Matriz simetrica 61x61 (indexada pela dezena) de vezes que cada par saiu junto."""
+        return self.estatisticas().coocorrencias
+
+    def scores_coocorrencia(self) -> Dict[int, float]:
+        scores = defaultdict(float)
+        for (d1, d2), contagem in top_pares(self.calcular_coocorrencias(), 100):
+            scores[d1] += contagem
+            scores[d2] += contagem
+        max_score = max(scores.values()) if scores else 1
+        return {d: scores.get(d, 0) / max_score for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+
+    def pares_mais_frequentes(self, top_n: int = 20) -> List[Tuple[Tuple[int, int], int]]:
+        return top_pares(self.calcular_coocorrencias(), top_n)
+
+    def contagens_subconjuntos(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Contagens esparsas dos k-subconjuntos sorteados (ranks ordenados, contagens)."""
+        if k not in self._subconjuntos:
+            self._subconjuntos[k] = contagens_subconjuntos(self.estatisticas().dezenas, k)
+        return self._subconjuntos[k]
+
+    def trios_mais_frequentes(self, top_n: int = 10) -> List[Tuple[Tuple[int, ...], int]]:
+        return top_subconjuntos(*self.contagens_subconjuntos(3), 3, top_n)
+
+    def quadras_mais_frequentes(self, top_n: int = 10) -> List[Tuple[Tuple[int, ...], int]]:
+        return top_subconjuntos(*self.contagens_subconjuntos(4), 4, top_n)
+
+    def calcular_atrasos(self) -> Dict[int, int]:
+        atrasos = self.estatisticas().atrasos
+        return {d: int(atrasos[d]) for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+
+    def scores_atraso(self) -> Dict[int, float]:
+        atrasos = self.calcular_atrasos()
+        max_atraso = max(atrasos.values()) if atrasos else 1
+        return {d: atrasos.get(d, 0) / max_atraso for d in range(DEZENA_MIN, DEZENA_MAX + 1)}
+
+    def dezenas_mais_atrasadas(self, top_n: int = 10) -> List[Tuple[int, int]]:
+        atrasos = self.calcular_atrasos()
+        return sorted(atrasos.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+    def conferir_jogo(self, dezenas: List[int], concurso: Concurso) -> int:
+        """Retorna quantidade de acertos do jogo no concurso."""
+        return len(set(dezenas) & concurso.dezenas_set)
+
+    def conferir_conjunto(self, conjunto: ConjuntoJogos, ultimos_n: int = 1) -> List[Dict]:
+        """Distribuicao de acertos de um conjunto de jogos em cada um dos ultimos N concursos."""
+        return [
+            {
+                'concurso': c.numero,
+                'data': c.data.isoformat(),
+                'acertos': distribuicao_acertos_conjunto(conjunto.mascaras, c.dezenas)
+            }
+            for c in reversed(self.concursos[-ultimos_n:])
+        ]
+
+    def indice_acertos(self) -> IndiceAcertos:
+        """Indice invertido de quadras/quinas/senas (construido uma vez)."""
+        if self._indice_acertos is None:
+            self._indice_acertos = IndiceAcertos(self.concursos)
+        return self._indice_acertos
+
+    def premiacoes_passadas(self, dezenas: List[int], ultimos_n: Optional[int] = None) -> List[Dict]:
+        """Concursos em que o jogo teria feito 4+ acertos (15 + 6 consultas ao indice)."""
+        return self.indice_acertos().premiacoes(dezenas, ultimos_n)
+
+    def ja_sorteado(self, dezenas: List[int]) -> Optional[int]:
+        """Numero do concurso em que esta combinacao saiu, ou None."""
+        return self.indice_acertos().ja_sorteado(dezenas)
+
+    def simular_jogo(self, dezenas: List[int], ultimos_n: int = 100,
+                     progresso: Optional[Callable[[float], bool]] = None) -> Dict[str, any]:
+        """Simula um jogo nos ultimos N concursos."""
+        concursos_sim = self.concursos[-ultimos_n:] if len(self.concursos) > ultimos_n else self.concursos
+        resultados = {
+            'total_concursos': len(concursos_sim),
+            'acertos': {0: 0, 1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0},
+            'detalhes': []
+        }
+
+        for i, c in enumerate(concursos_sim):
+            if progresso is not None and i % 500 == 0 and progresso(i / len(concursos_sim)) is False:
+                break
+            resultados['acertos'][self.conferir_jogo(dezenas, c)] += 1
+
+        # Premiacoes pelo indice invertido, sem guardar detalhes durante a varredura
+        resultados['detalhes'] = self.premiacoes_passadas(dezenas, len(concursos_sim))
+        return resultados
+
+    # ============== ANÁLISES ESTATÍSTICAS AVANÇADAS ==============
+
+    def probabilidades_reais(self) -> Dict[str, Dict]:
+        """Calcula probabilidades reais da Mega-Sena."""
+        total_combinacoes = comb(60, 6)  # 50.063.860
+
+        return {
+            'sena': {
+                'chance': 1,
+                'total': total_combinacoes,
+                'probabilidade': 1 / total_combinacoes,
+                'percentual': (1 / total_combinacoes) * 100,
+                'texto': f"1 em {total_combinacoes:,}".replace(',', '.')
+            },
+            'quina': {
+                'chance': comb(6, 5) * comb(54, 1),
+                'total': total_combinacoes,
+                'probabilidade': (comb(6, 5) * comb(54, 1)) / total_combinacoes,
+                'percentual': ((comb(6, 5) * comb(54, 1)) / total_combinacoes) * 100,
+                'texto': f"1 em {total_combinacoes // (comb(6, 5) * comb(54, 1)):,}".replace(',', '.')
+            },
+            'quadra': {
+                'chance': comb(6, 4) * comb(54, 2),
+                'total': total_combinacoes,
+                'probabilidade': (comb(6, 4) * comb(54, 2)) / total_combinacoes,
+                'percentual': ((comb(6, 4) * comb(54, 2)) / total_combinacoes) * 100,
+                'texto': f"1 em {total_combinacoes // (comb(6, 4) * comb(54, 2)):,}".replace(',', '.')
+            }
+        }
+
+    def analise_soma(self) -> Dict[str, any]:
+        """Analisa a soma dos números sorteados."""
+        somas = [sum(c.dezenas) for c in self.concursos]
+
+        if not somas:
+            return {'media': 0, 'min': 0, 'max': 0, 'faixa_ideal': (0, 0)}
+
+        media = sum(somas) / len(somas)
+        desvio = (sum((s - media) ** 2 for s in somas) / len(somas)) ** 0.5
+
+        # Faixa ideal = média ± 1 desvio padrão
+        faixa_min = int(media - desvio)
+        faixa_max = int(media + desvio)
+
+        # Distribuição por faixas
+        faixas = {'< 150': 0, '150-175': 0, '176-200': 0, '201-225': 0, '> 225': 0}
+        for s in somas:
+            if s < 150:
+                faixas['< 150'] += 1
+            elif s <= 175:
+                faixas['150-175'] += 1
+            elif s <= 200:
+                faixas['176-200'] += 1
+            elif s <= 225:
+                faixas['201-225'] += 1
+            else:
+                faixas['> 225'] += 1
+
+        return {
+            'media': round(media, 1),
+            'min': min(somas),
+            'max': max(somas),
+            'desvio': round(desvio, 1),
+            'faixa_ideal': (faixa_min, faixa_max),
+            'distribuicao': faixas,
+            'historico': somas[-50:]  # Últimas 50
+        }
+
+    def analise_padroes(self) -> Dict[str, any]:
+        """Analisa padrões nos sorteios."""
+        consecutivos = 0
+        mesmo_final = 0
+        repetidos_anterior = 0
+
+        for i, c in enumerate(self.concursos):
+            dezenas = sorted(c.dezenas)
+
+            # Consecutivos
+            for j in range(len(dezenas) - 1):
+                if dezenas[j + 1] - dezenas[j] == 1:
+                    consecutivos += 1
+
+            # Mesmo final
+            finais = [d % 10 for d in dezenas]
+            if len(finais) != len(set(finais)):
+                mesmo_final += 1
+
+            # Repetidos do anterior
+            if i > 0:
+                anterior = set(self.concursos[i - 1].dezenas)
+                atual = set(dezenas)
+                if anterior & atual:
+                    repetidos_anterior += 1
+
+        total = len(self.concursos)
+        return {
+            'consecutivos': {
+                'total': consecutivos,
+                'media_por_sorteio': round(consecutivos / total, 2) if total > 0 else 0,
+                'percentual': round((consecutivos / (total * 5)) * 100, 1) if total > 0 else 0
+            },
+            'mesmo_final': {
+                'total': mesmo_final,
+                'percentual': round((mesmo_final / total) * 100, 1) if total > 0 else 0
+            },
+            'repetidos': {
+                'total': repetidos_anterior,
+                'percentual': round((repetidos_anterior / total) * 100, 1) if total > 0 else 0
+            }
+        }
+
+    def ciclos_atraso(self) -> Dict[int, Dict]:
+        """Calcula ciclos médios de atraso para cada número."""
+        aparicoes = {d: [] for d in range(1, 61)}
+
+        for i, c in enumerate(self.concursos):
+            for d in c.dezenas:
+                aparicoes[d].append(i)
+
+        ciclos = {}
+        for d in range(1, 61):
+            pos = aparicoes[d]
+            if len(pos) >= 2:
+                intervalos = [pos[i + 1] - pos[i] for i in range(len(pos) - 1)]
+                media = sum(intervalos) / len(intervalos)
+                ciclos[d] = {
+                    'media': round(media, 1),
+                    'min': min(intervalos),
+                    'max': max(intervalos),
+                    'ultimo_atraso': len(self.concursos) - 1 - pos[-1] if pos else 0,
+                    'aparicoes': len(pos)
+                }
+            else:
+                ciclos[d] = {
+                    'media': 0,
+                    'min': 0,
+                    'max': 0,
+                    'ultimo_atraso': len(self.concursos) if not pos else len(self.concursos) - 1 - pos[-1],
+                    'aparicoes': len(pos)
+                }
+
+        return ciclos
+
+    def analise_quadrantes(self) -> Dict[str, any]:
+        """Analisa distribuição por quadrantes (faixas de 15)."""
+        quadrantes = {
+            '01-15': 0,
+            '16-30': 0,
+            '31-45': 0,
+            '46-60': 0
+        }
+
+        distribuicoes = []
+
+        for c in self.concursos:
+            dist = [0, 0, 0, 0]
+            for d in c.dezenas:
+                if d <= 15:
+                    quadrantes['01-15'] += 1
+                    dist[0] += 1
+                elif d <= 30:
+                    quadrantes['16-30'] += 1
+                    dist[1] += 1
+                elif d <= 45:
+                    quadrantes['31-45'] += 1
+                    dist[2] += 1
+                else:
+                    quadrantes['46-60'] += 1
+                    dist[3] += 1
+            distribuicoes.append(tuple(dist))
+
+        # Padrão mais comum
+        padroes = Counter(distribuicoes)
+        mais_comum = padroes.most_common(5)
+
+        total = sum(quadrantes.values())
+        percentuais = {k: round((v / total) * 100, 1) if total > 0 else 0 for k, v in quadrantes.items()}
+
+        return {
+            'contagem': quadrantes,
+            'percentuais': percentuais,
+            'padroes_comuns': mais_comum,
+            'ideal': [1, 2, 2, 1]  # Distribuição ideal sugerida
+        }
+
+    def simulacao_monte_carlo(self, num_simulacoes: int = 10000,
+                              progresso: Optional[Callable[[float], bool]] = None,
+                              semente: Optional[int] = None) -> Dict[str, any]:
+        """
+        Simula milhares (ou milhoes) de jogos para calcular ROI esperado.
+        Usa o motor vetorizado (mascaras de bits + popcount) em lotes de memoria limitada.
+        'progresso' recebe a fracao concluida; se retornar False a simulacao para
+        e o resultado parcial e devolvido.
+        """
+        # Probabilidades reais
+        prob = self.probabilidades_reais()
+
+        premios = PREMIOS_MEDIOS
+        custo_jogo = CUSTO_JOGO
+
+        # Simular
+        histograma = simular_acertos(num_simulacoes, semente=semente, progresso=progresso)
+        executadas = int(histograma.sum())
+
+        acertos = {hits: int(histograma[hits]) for hits in (4, 5, 6)}
+        ganhos_total = sum(premios[hits] * qtd for hits, qtd in acertos.items())
+
+        num_simulacoes = executadas
+        custo_total = num_simulacoes * custo_jogo
+        roi = ((ganhos_total - custo_total) / custo_total) * 100 if custo_total > 0 else 0
+
+        return {
+            'simulacoes': num_simulacoes,
+            'custo_total': custo_total,
+            'ganhos_total': ganhos_total,
+            'lucro': ganhos_total - custo_total,
+            'roi': round(roi, 2),
+            'acertos': acertos,
+            'quadras_esperadas': round(num_simulacoes * prob['quadra']['probabilidade'], 2),
+            'quinas_esperadas': round(num_simulacoes * prob['quina']['probabilidade'], 4),
+            'senas_esperadas': round(num_simulacoes * prob['sena']['probabilidade'], 8)
+        }
+
+    def roi_exato(self, jogos: Optional[List[List[int]]] = None) -> Dict[str, Any]:
+        """
+        Retorno exato (hipergeometrico) de um bilhete ou de um conjunto de bilhetes.
+        Substitui a simulacao sempre que existe forma fechada.
+        """
+        if not jogos:
+            return analisar_jogo()
+        return analisar_lote(jogos)
+
+    def indice_confianca(self, dezenas: List[int]) -> Dict[str, any]:
+        """Calcula índice de confiança para um jogo."""
+        score = 0
+        fatores = {}
+
+        # 1. Frequência (0-20 pontos)
+        freq = self.calcular_frequencias()
+        media_freq = sum(freq.values()) / 60 if freq else 0
+        freq_jogo = sum(freq.get(d, 0) for d in dezenas) / 6
+        fator_freq = min(20, (freq_jogo / media_freq) * 10) if media_freq > 0 else 10
+        score += fator_freq
+        fatores['frequencia'] = round(fator_freq, 1)
+
+        # 2. Soma ideal (0-20 pontos)
+        soma_analise = self.analise_soma()
+        soma_jogo = sum(dezenas)
+        faixa_min, faixa_max = soma_analise['faixa_ideal']
+        if faixa_min <= soma_jogo <= faixa_max:
+            fator_soma = 20
+        else:
+            distancia = min(abs(soma_jogo - faixa_min), abs(soma_jogo - faixa_max))
+            fator_soma = max(0, 20 - distancia)
+        score += fator_soma
+        fatores['soma'] = round(fator_soma, 1)
+
+        # 3. Balanceamento par/ímpar (0-15 pontos)
+        pares = sum(1 for d in dezenas if d % 2 == 0)
+        if pares == 3:
+            fator_bal = 15
+        elif pares in [2, 4]:
+            fator_bal = 10
+        else:
+            fator_bal = 5
+        score += fator_bal
+        fatores['balanceamento'] = fator_bal
+
+        # 4. Distribuição por quadrante (0-15 pontos)
+        quads = [0, 0, 0, 0]
+        for d in dezenas:
+            if d <= 15: quads[0] += 1
+            elif d <= 30: quads[1] += 1
+            elif d <= 45: quads[2] += 1
+            else: quads[3] += 1
+
+        zeros = quads.count(0)
+        if zeros == 0:
+            fator_dist = 15
+        elif zeros == 1:
+            fator_dist = 10
+        else:
+            fator_dist = 5
+        score += fator_dist
+        fatores['distribuicao'] = fator_dist
+
+        # 5. Consecutivos moderados (0-15 pontos)
+        dezenas_ord = sorted(dezenas)
+        consecutivos = sum(1 for i in range(5) if dezenas_ord[i + 1] - dezenas_ord[i] == 1)
+        if consecutivos in [1, 2]:
+            fator_cons = 15
+        elif consecutivos == 0:
+            fator_cons = 10
+        else:
+            fator_cons = 5
+        score += fator_cons
+        fatores['consecutivos'] = fator_cons
+
+        # 6. Atraso dos números (0-15 pontos)
+        atrasos = self.calcular_atrasos()
+        media_atraso = sum(atrasos.get(d, 0) for d in dezenas) / 6
+        if 3 <= media_atraso <= 8:
+            fator_atraso = 15
+        elif media_atraso < 3:
+            fator_atraso = 10
+        else:
+            fator_atraso = 5
+        score += fator_atraso
+        fatores['atraso'] = fator_atraso
+
+        # Classificação
+        if score >= 85:
+            classificacao = "Excelente"
+            cor = "#22c55e"
+        elif score >= 70:
+            classificacao = "Bom"
+            cor = "#84cc16"
+        elif score >= 55:
+            classificacao = "Regular"
+            cor = "#eab308"
+        else:
+            classificacao = "Fraco"
+            cor = "#ef4444"
+
+        return {
+            'score': round(score, 1),
+            'maximo': 100,
+            'percentual': round(score, 1),
+            'classificacao': classificacao,
+            'cor': cor,
+            'fatores': fatores
+        }
@@ -0,0 +1,180 @@
+"""
+Carga de resultados
+Registro binario, Excel, CSV e linhas do Supabase viram a mesma lista de Concurso.
+pandas so e importado ao ler xlsx; o registro e o CSV usam apenas a biblioteca padrao.
+"""
+
+import csv
+import datetime as dt
+import importlib.util
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from nucleo.modelo import DEZENA_MAX, DEZENA_MIN, TAMANHO_JOGO, Concurso, dezenas_validas
+
+PANDAS_DISPONIVEL = importlib.util.find_spec("pandas") is not None
+
+FORMATOS_DATA = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y")
+COLUNAS_CSV = ["bola1", "bola2", "bola3", "bola4", "bola5", "bola6"]
+
+
+def parse_data(valor: str) -> dt.date:
+    valor = valor.strip()
+    for fmt in FORMATOS_DATA:
+        try:
+            return dt.datetime.strptime(valor, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Formato de data não reconhecido: {valor}")
+
+
+def _data_celula(valor) -> Optional[dt.date]:
+    if isinstance(valor, dt.datetime):
+        return valor.date()
+    if isinstance(valor, dt.date):
+        return valor
+    try:
+        return parse_data(str(valor))
+    except ValueError:
+        return None
+
+
+def carregar_resultados_csv(caminho: Path) -> List[Concurso]:
+    """CSV com colunas data, bola1..bola6 (e concurso, se houver)."""
+    concursos: List[Concurso] = []
+    with Path(caminho).open("r", newline="", encoding="utf-8") as f:
+        for linha in csv.DictReader(f):
+            try:
+                data = parse_data(linha["data"])
+                dezenas = tuple(sorted(int(linha[c]) for c in COLUNAS_CSV))
+                numero = int(linha.get("concurso") or 0)
+            except Exception:
+                continue
+            if dezenas_validas(dezenas):
+                concursos.append(Concurso(numero=numero, data=data, dezenas=dezenas))
+    return concursos
+
+
+def carregar_resultados_excel(caminho: Path) -> List[Concurso]:
+    """
+    Planilha com colunas Concurso, Data e Dezena 1..6 (ou Bola 1..6).
+    Conversao e validacao por coluna (sem iterrows); linhas invalidas sao ignoradas.
+    """
+    if not PANDAS_DISPONIVEL:
+        raise ImportError("pandas não instalado. Execute: pip install pandas openpyxl")
+    import numpy as np
+    import pandas as pd
+
+    df = pd.read_excel(caminho)
+
+    col_concurso = None
+    col_data = None
+    colunas_dezenas = []
+    for col in df.columns:
+        col_lower = str(col).lower().strip()
+        if col_lower == 'concurso':
+            col_concurso = col
+        elif col_lower in ('data', 'data do sorteio'):
+            col_data = col
+        elif 'dezena' in col_lower or 'bola' in col_lower:
+            colunas_dezenas.append(col)
+    colunas_dezenas = sorted(colunas_dezenas, key=lambda x: int(''.join(filter(str.isdigit, str(x))) or 0))
+
+    if col_data is None or len(colunas_dezenas) < TAMANHO_JOGO:
+        raise ValueError(f"Colunas esperadas não encontradas. Encontradas: {df.columns.tolist()}")
+
+    dezenas = df[colunas_dezenas[:TAMANHO_JOGO]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    numeros = (pd.to_numeric(df[col_concurso], errors="coerce").to_numpy(dtype=np.float64)
+               if col_concurso is not None else np.zeros(len(df)))
+    datas = df[col_data].map(_data_celula)
+
+    validas = ~np.isnan(dezenas).any(axis=1) & ~np.isnan(numeros) & datas.notna().to_numpy()
+    dezenas = np.sort(np.where(validas[:, None], dezenas, 0).astype(np.int64), axis=1)
+    validas &= ((dezenas >= DEZENA_MIN) & (dezenas <= DEZENA_MAX)).all(axis=1)
+    validas &= (np.diff(dezenas, axis=1) > 0).all(axis=1)
+
+    return [
+        Concurso(numero=int(numero), data=data, dezenas=tuple(int(d) for d in linha))
+        for numero, data, linha in zip(numeros[validas], datas[validas], dezenas[validas])
+    ]
+
+
+def carregar_resultados_registro(caminho: Path) -> List[Concurso]:
+    """Registro binario (sem pandas nem NumPy)."""
+    from registro_concursos import ler_concursos
+
+    return ler_concursos(caminho, Concurso)
+
+
+def gravar_registro(caminho: Path, concursos: Iterable[Concurso]) -> bool:
+    """
+    (Re)cria o registro binario com os concursos (migracao unica a partir do xlsx/CSV).
+    Concursos sem numero (CSV sem coluna concurso) nao cabem no registro: nada e gravado.
+    A escrita e atomica; retorna True se o registro foi gravado.
+    """
+    import registro_concursos
+
+    concursos = list(concursos)
+    if not concursos or any(c.numero <= 0 for c in concursos):
+        return False
+    caminho = Path(caminho)
+    # Temporario unico por chamada: gravacoes simultaneas nao se atropelam, a ultima troca vence
+    fd, nome = tempfile.mkstemp(dir=caminho.parent, prefix=caminho.name, suffix=".tmp")
+    os.close(fd)
+    temporario = Path(nome)
+    try:
+        registro_concursos.criar(temporario)
+        registro_concursos.anexar(temporario, [(c.numero, c.data, c.dezenas) for c in concursos])
+        os.replace(temporario, caminho)
+    except OSError as e:
+        print(f"Erro ao gravar registro de concursos: {e}")
+        temporario.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def registro_em_dia(caminho: Path) -> bool:
+    """
+    True se o registro binario ao lado do arquivo existe e nao e mais antigo que ele
+    (um xlsx/CSV substituido a mao invalida o registro ate ele ser regravado).
+    """
+    caminho = Path(caminho)
+    registro = caminho.with_suffix(".bin")
+    if not registro.exists():
+        return False
+    if registro == caminho or not caminho.exists():
+        return True
+    return registro.stat().st_mtime >= caminho.stat().st_mtime
+
+
+def carregar_resultados(caminho: Path, usar_registro: bool = True) -> List[Concurso]:
+    """
+    Detecta o formato pelo sufixo. Com usar_registro, o registro binario ao lado do arquivo
+    (resultados.xlsx -> resultados.bin) tem prioridade quando existe e esta em dia.
+    """
+    caminho = Path(caminho)
+    sufixo = caminho.suffix.lower()
+    registro = caminho.with_suffix(".bin")
+    if sufixo == ".bin" or (usar_registro and registro_em_dia(caminho)):
+        return carregar_resultados_registro(registro)
+    if sufixo in (".xlsx", ".xls"):
+        return carregar_resultados_excel(caminho)
+    return carregar_resultados_csv(caminho)
+
+
+def concursos_de_registros(dados: Iterable[Dict]) -> List[Concurso]:
+    """Linhas do banco (numero, data, dezena1..dezena6) -> concursos validos."""
+    concursos = []
+    for c in dados:
+        try:
+            data = c.get('data', '')
+            if isinstance(data, str):
+                data = dt.datetime.strptime(data, "%Y-%m-%d").date()
+            dezenas = tuple(sorted(int(c.get(f'dezena{i}', 0)) for i in range(1, TAMANHO_JOGO + 1)))
+            if dezenas_validas(dezenas):
+                concursos.append(Concurso(numero=c.get('numero', 0), data=data, dezenas=dezenas))
+        except Exception:
+            continue
+    return concursos
@@ -0,0 +1,61 @@
+"""
+Geradores leves por frequencia
+Uniforme, ponderado pela frequencia e balanceado, so com a biblioteca padrao: e o caminho
+da linha de comando, que precisa iniciar rapido sem NumPy.
+"""
+
+import random
+from typing import Iterable, List, Set
+
+from nucleo.modelo import DEZENA_MAX, DEZENA_MIN, TAMANHO_JOGO, Concurso, jogo_balanceado
+
+MODOS = ("uniforme", "ponderado", "balanceado", "mix")
+
+
+def frequencias(concursos: Iterable[Concurso]) -> List[int]:
+    freq = [0] * (DEZENA_MAX + 1)
+    for c in concursos:
+        for d in c.dezenas:
+            freq[d] += 1
+    return freq
+
+
+def gerar_uniforme(rng: random.Random) -> List[int]:
+    return sorted(rng.sample(range(DEZENA_MIN, DEZENA_MAX + 1), TAMANHO_JOGO))
+
+
+def _escolher_com_peso(freq: List[int], rng: random.Random) -> int:
+    pesos = [freq[i] + 1 for i in range(DEZENA_MIN, DEZENA_MAX + 1)]
+    # random.choices usa população + pesos alinhados
+    return rng.choices(population=range(DEZENA_MIN, DEZENA_MAX + 1), weights=pesos, k=1)[0]
+
+
+def gerar_ponderado(freq: List[int], rng: random.Random) -> List[int]:
+    dezenas: Set[int] = set()
+    while len(dezenas) < TAMANHO_JOGO:
+        dezenas.add(_escolher_com_peso(freq, rng))
+    return sorted(dezenas)
+
+
+def gerar_balanceado(freq: List[int], rng: random.Random, max_tentativas: int = 500) -> List[int]:
+    for _ in range(max_tentativas):
+        dezenas = gerar_ponderado(freq, rng)
+        if jogo_balanceado(dezenas):
+            return dezenas
+    # fallback para o melhor disponível
+    return gerar_ponderado(freq, rng)
+
+
+def gerar_lote(modo: str, qtd: int, freq: List[int], rng: random.Random) -> List[List[int]]:
+    """'qtd' jogos no modo pedido; 'mix' alterna balanceado/ponderado/uniforme."""
+    geradores = {
+        "uniforme": lambda: gerar_uniforme(rng),
+        "ponderado": lambda: gerar_ponderado(freq, rng),
+        "balanceado": lambda: gerar_balanceado(freq, rng),
+    }
+    if modo == "mix":
+        sequencia = ["balanceado", "ponderado", "uniforme"]
+        return [geradores[sequencia[i % len(sequencia)]]() for i in range(qtd)]
+    if modo not in geradores:
+        raise ValueError(f"Modo inválido: {modo}")
+    return [geradores[modo]() for _ in range(qtd)]
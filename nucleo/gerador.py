@@ -0,0 +1,261 @@
+"""
+Geracao de jogos e fechamentos
+GeradorJogos combina os scores do analisador (ou de qualquer objeto com os mesmos metodos
+scores_*, como o estado incremental do back-test) e gera lotes sem repeticao.
+GeradorFechamento expoe o motor de fechamentos (fechamento.py).
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from fechamento import BuscaFechamentoParalela, fechamento_guloso
+from instrumentacao import cronometrado
+from metricas import JOGOS_GERADOS
+from nucleo.modelo import DEZENA_MAX, DEZENA_MIN, TAMANHO_JOGO, ScoreDezena, faixa, jogo_balanceado
+
+if TYPE_CHECKING:
+    from nucleo.analisador import AnalisadorMegaSena
+
+
+class GeradorJogos:
+    def __init__(self, analisador: "AnalisadorMegaSena", rng: Optional[random.Random] = None):
+        self.analisador = analisador
+        # Usar seed combinando tempo + bytes aleatorios do sistema
+        seed = int.from_bytes(os.urandom(8), 'big') ^ time.time_ns()
+        self.rng = rng or random.Random(seed)
+        self._cache_pesos: Dict[tuple, Tuple[List[int], List[float]]] = {}
+
+    def _faixa(self, dezena: int) -> int:
+        return faixa(dezena)
+
+    def _verificar_balanceamento(self, dezenas: List[int]) -> bool:
+        return jogo_balanceado(dezenas)
+
+    def gerar_uniforme(self, numeros_fixos: Set[int] = None, numeros_removidos: Set[int] = None) -> List[int]:
+        numeros_fixos = numeros_fixos or set()
+        numeros_removidos = numeros_removidos or set()
+
+        disponiveis = [d for d in range(DEZENA_MIN, DEZENA_MAX + 1)
+                       if d not in numeros_removidos and d not in numeros_fixos]
+
+        faltam = TAMANHO_JOGO - len(numeros_fixos)
+        if faltam > len(disponiveis):
+            faltam = len(disponiveis)
+
+        escolhidos = list(numeros_fixos) + self.rng.sample(disponiveis, faltam)
+        return sorted(escolhidos)[:TAMANHO_JOGO]
+
+    def _pesos_escolha(self, pesos: Dict[str, float], numeros_fixos: Set[int],
+                       numeros_removidos: Set[int]) -> Tuple[List[int], List[float]]:
+        """Dezenas candidatas e pesos de sorteio, memorizados por combinacao de parametros."""
+        chave = (tuple(sorted(pesos.items())), frozenset(numeros_fixos), frozenset(numeros_removidos))
+        if chave in self._cache_pesos:
+            return self._cache_pesos[chave]
+
+        scores_freq = self.analisador.scores_frequencia() if pesos.get('frequencia', 0) > 0 else {}
+        scores_markov = self.analisador.scores_markov() if pesos.get('markov', 0) > 0 else {}
+        scores_cooc = self.analisador.scores_coocorrencia() if pesos.get('coocorrencia', 0) > 0 else {}
+        scores_atraso = self.analisador.scores_atraso() if pesos.get('atraso', 0) > 0 else {}
+
+        scores_combinados = {}
+        for d in range(DEZENA_MIN, DEZENA_MAX + 1):
+            if d in numeros_removidos:
+                scores_combinados[d] = 0
+            else:
+                score = ScoreDezena(
+                    dezena=d,
+                    frequencia=scores_freq.get(d, 0),
+                    markov=scores_markov.get(d, 0),
+                    coocorrencia=scores_cooc.get(d, 0),
+                    atraso=scores_atraso.get(d, 0)
+                )
+                scores_combinados[d] = score.score_total(pesos)
+
+        dezenas = [d for d in range(DEZENA_MIN, DEZENA_MAX + 1) if d not in numeros_removidos and d not in numeros_fixos]
+        pesos_escolha = [scores_combinados.get(d, 0) + 0.1 for d in dezenas]
+
+        self._cache_pesos[chave] = (dezenas, pesos_escolha)
+        return dezenas, pesos_escolha
+
+    def gerar_por_scores(self, pesos: Dict[str, float], forcar_balanceamento: bool = False,
+                         numeros_fixos: Set[int] = None, numeros_removidos: Set[int] = None,
+                         max_tentativas: int = 500) -> List[int]:
+        numeros_fixos = numeros_fixos or set()
+        numeros_removidos = numeros_removidos or set()
+
+        dezenas, pesos_escolha = self._pesos_escolha(pesos, numeros_fixos, numeros_removidos)
+
+        for _ in range(max_tentativas):
+            escolhidas: Set[int] = set(numeros_fixos)
+            tentativas_internas = 0
+            while len(escolhidas) < TAMANHO_JOGO and tentativas_internas < 100:
+                if dezenas and pesos_escolha:
+                    escolha = self.rng.choices(dezenas, weights=pesos_escolha, k=1)[0]
+                    escolhidas.add(escolha)
+                tentativas_internas += 1
+
+            if len(escolhidas) < TAMANHO_JOGO:
+                continue
+
+            jogo = sorted(escolhidas)
+            if not forcar_balanceamento or self._verificar_balanceamento(jogo):
+                return jogo
+
+        return self.gerar_uniforme(numeros_fixos, numeros_removidos)
+
+    @cronometrado
+    def gerar_jogos(self, quantidade: int, algoritmos: List[str], forcar_balanceamento: bool = False,
+                    numeros_fixos: Set[int] = None, numeros_removidos: Set[int] = None) -> Tuple[List[List[int]], List[str]]:
+        """
+        Gera jogos com lógica inteligente:
+        - Se quantidade <= algoritmos selecionados: 1 jogo PURO por algoritmo
+        - Se quantidade > algoritmos: primeiro 1 puro de cada, depois mistura
+
+        Retorna: (lista_jogos, lista_algoritmos_usados)
+        """
+        jogos = []
+        algoritmos_usados = []
+        jogos_gerados: Set[tuple] = set()
+
+        # Separar algoritmos de score dos outros
+        algoritmos_score = [a for a in algoritmos if a in ['frequencia', 'markov', 'coocorrencia', 'atraso']]
+        tem_balanceado = 'balanceado' in algoritmos
+        tem_uniforme = 'uniforme' in algoritmos
+
+        # FASE 1: Gerar 1 jogo PURO para cada algoritmo selecionado
+        for alg in algoritmos_score:
+            if len(jogos) >= quantidade:
+                break
+
+            pesos_puro = {
+                'frequencia': 1.0 if alg == 'frequencia' else 0,
+                'markov': 1.0 if alg == 'markov' else 0,
+                'coocorrencia': 1.0 if alg == 'coocorrencia' else 0,
+                'atraso': 1.0 if alg == 'atraso' else 0,
+            }
+
+            tentativas = 0
+            while tentativas < 50:
+                tentativas += 1
+                usar_bal = tem_balanceado or forcar_balanceamento
+                jogo = self.gerar_por_scores(pesos_puro, usar_bal, numeros_fixos, numeros_removidos)
+                jogo_tuple = tuple(jogo)
+                if jogo_tuple not in jogos_gerados:
+                    jogos_gerados.add(jogo_tuple)
+                    jogos.append(jogo)
+                    algoritmos_usados.append(alg.capitalize())
+                    break
+
+        # Jogo balanceado puro (se selecionado e ainda tem espaço)
+        if tem_balanceado and len(jogos) < quantidade and not algoritmos_score:
+            tentativas = 0
+            while tentativas < 50:
+                tentativas += 1
+                jogo = self.gerar_uniforme(numeros_fixos, numeros_removidos)
+                if self._verificar_balanceamento(jogo):
+                    jogo_tuple = tuple(jogo)
+                    if jogo_tuple not in jogos_gerados:
+                        jogos_gerados.add(jogo_tuple)
+                        jogos.append(jogo)
+                        algoritmos_usados.append("Balanceado")
+                        break
+
+        # Jogo uniforme puro (se selecionado e ainda tem espaço)
+        if tem_uniforme and len(jogos) < quantidade:
+            tentativas = 0
+            while tentativas < 50:
+                tentativas += 1
+                jogo = self.gerar_uniforme(numeros_fixos, numeros_removidos)
+                jogo_tuple = tuple(jogo)
+                if jogo_tuple not in jogos_gerados:
+                    jogos_gerados.add(jogo_tuple)
+                    jogos.append(jogo)
+                    algoritmos_usados.append("Aleatório")
+                    break
+
+        # FASE 2: Gerar jogos MISTURADOS (se ainda precisa de mais)
+        if len(jogos) < quantidade and algoritmos_score:
+            peso_base = 1.0 / len(algoritmos_score)
+            pesos_mix = {
+                'frequencia': peso_base if 'frequencia' in algoritmos_score else 0,
+                'markov': peso_base if 'markov' in algoritmos_score else 0,
+                'coocorrencia': peso_base if 'coocorrencia' in algoritmos_score else 0,
+                'atraso': peso_base if 'atraso' in algoritmos_score else 0,
+            }
+
+            tentativas = 0
+            while len(jogos) < quantidade and tentativas < quantidade * 10:
+                tentativas += 1
+                usar_bal = tem_balanceado or forcar_balanceamento
+                jogo = self.gerar_por_scores(pesos_mix, usar_bal, numeros_fixos, numeros_removidos)
+                jogo_tuple = tuple(jogo)
+                if jogo_tuple not in jogos_gerados:
+                    jogos_gerados.add(jogo_tuple)
+                    jogos.append(jogo)
+                    algoritmos_usados.append("Misto")
+
+        # Fallback: completar com uniforme se ainda faltam jogos
+        tentativas = 0
+        while len(jogos) < quantidade and tentativas < quantidade * 5:
+            tentativas += 1
+            jogo = self.gerar_uniforme(numeros_fixos, numeros_removidos)
+            jogo_tuple = tuple(jogo)
+            if jogo_tuple not in jogos_gerados:
+                jogos_gerados.add(jogo_tuple)
+                jogos.append(jogo)
+                algoritmos_usados.append("Aleatório")
+
+        JOGOS_GERADOS.incrementar(len(jogos), tipo="palpite")
+        return jogos, algoritmos_usados
+
+
+class GeradorFechamento:
+    """Gera fechamentos/desdobramentos para garantir premiacoes."""
+
+    @staticmethod
+    @cronometrado
+    def gerar_fechamento(dezenas_base: List[int], garantia: int = 4) -> List[List[int]]:
+        """
+        Gera um fechamento a partir de dezenas base.
+        garantia: 4 = garantir quadra, 5 = garantir quina, 6 = garantir sena
+        """
+        jogos = fechamento_guloso(dezenas_base, garantia)
+        JOGOS_GERADOS.incrementar(len(jogos), tipo="fechamento")
+        return jogos
+
+    @staticmethod
+    def iniciar_busca_paralela(dezenas_base: List[int], garantia: int = 4,
+                               executor: Optional[ProcessPoolExecutor] = None,
+                               tempo_limite: float = 5.0) -> BuscaFechamentoParalela:
+        """
+        Inicia a busca do fechamento em varios processos (busca local com sementes independentes).
+        Retorna o objeto da busca para acompanhar progresso, cancelar e obter o melhor resultado.
+        """
+        return BuscaFechamentoParalela(dezenas_base, garantia, executor=executor,
+                                       tempo_limite=tempo_limite).iniciar()
+
+    @staticmethod
+    def info_fechamento(num_dezenas: int) -> Dict[str, int]:
+        """Retorna informacoes sobre o fechamento."""
+        total_jogos = comb(num_dezenas, 6)
+
+        # Estimativas de jogos necessarios para cada garantia
+        # (valores aproximados baseados em tabelas de fechamento)
+        fechamentos = {
+            7: {'total': 7, 'quadra': 4, 'quina': 6, 'sena': 7},
+            8: {'total': 28, 'quadra': 6, 'quina': 12, 'sena': 28},
+            9: {'total': 84, 'quadra': 9, 'quina': 30, 'sena': 84},
+            10: {'total': 210, 'quadra': 14, 'quina': 50, 'sena': 210},
+            11: {'total': 462, 'quadra': 20, 'quina': 77, 'sena': 462},
+            12: {'total': 924, 'quadra': 27, 'quina': 132, 'sena': 924},
+            13: {'total': 1716, 'quadra': 35, 'quina': 210, 'sena': 1716},
+            14: {'total': 3003, 'quadra': 45, 'quina': 315, 'sena': 3003},
+            15: {'total': 5005, 'quadra': 56, 'quina': 455, 'sena': 5005},
+            16: {'total': 8008, 'quadra': 70, 'quina': 640, 'sena': 8008},
+        }
+
+        return fechamentos.get(num_dezenas, {'total': total_jogos, 'quadra': '?', 'quina': '?', 'sena': total_jogos})
@@ -0,0 +1,107 @@
+"""
+Modelo de dados da Mega-Sena
+Concurso, jogo salvo, score por dezena e as regras de jogo compartilhadas (faixas e
+balanceamento). So biblioteca padrao: importar este modulo nao carrega NumPy nem pandas.
+"""
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+DEZENA_MIN = 1
+DEZENA_MAX = 60
+TAMANHO_JOGO = 6
+FAIXAS = [(1, 20), (21, 40), (41, 60)]
+
+
+@dataclass(frozen=True)
+class Concurso:
+    numero: int
+    data: dt.date
+    dezenas: Tuple[int, ...]
+
+    @property
+    def dezenas_set(self) -> Set[int]:
+        return set(self.dezenas)
+
+    def to_dict(self) -> dict:
+        return {
+            'numero': self.numero,
+            'data': self.data.isoformat(),
+            'dezenas': list(self.dezenas)
+        }
+
+
+@dataclass
+class JogoSalvo:
+    id: int
+    dezenas: List[int]
+    data_criacao: str
+    algoritmos: List[str]
+    conferido: bool = False
+    acertos: Dict[int, int] = None  # {concurso: acertos}
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'dezenas': self.dezenas,
+            'data_criacao': self.data_criacao,
+            'algoritmos': self.algoritmos,
+            'conferido': self.conferido,
+            'acertos': self.acertos or {}
+        }
+
+    @staticmethod
+    def from_dict(d: dict) -> 'JogoSalvo':
+        return JogoSalvo(
+            id=d['id'],
+            dezenas=d['dezenas'],
+            data_criacao=d['data_criacao'],
+            algoritmos=d['algoritmos'],
+            conferido=d.get('conferido', False),
+            acertos=d.get('acertos', {})
+        )
+
+
+@dataclass
+class ScoreDezena:
+    dezena: int
+    frequencia: float = 0.0
+    markov: float = 0.0
+    coocorrencia: float = 0.0
+    atraso: float = 0.0
+
+    def score_total(self, pesos: Dict[str, float]) -> float:
+        return (
+            self.frequencia * pesos.get('frequencia', 0) +
+            self.markov * pesos.get('markov', 0) +
+            self.coocorrencia * pesos.get('coocorrencia', 0) +
+            self.atraso * pesos.get('atraso', 0)
+        )
+
+
+def dezenas_validas(dezenas: Sequence[int]) -> bool:
+    """6 dezenas distintas entre 1 e 60."""
+    return len(set(dezenas)) == TAMANHO_JOGO == len(dezenas) and all(DEZENA_MIN <= d <= DEZENA_MAX for d in dezenas)
+
+
+def faixa(dezena: int) -> int:
+    for idx, (inicio, fim) in enumerate(FAIXAS):
+        if inicio <= dezena <= fim:
+            return idx
+    return -1
+
+
+def jogo_balanceado(dezenas: Iterable[int]) -> bool:
+    """3 pares e 3 impares, com 1 a 3 dezenas em cada faixa."""
+    dezenas = list(dezenas)
+    if sum(1 for d in dezenas if d % 2 == 0) != TAMANHO_JOGO // 2:
+        return False
+    faixas = [faixa(d) for d in dezenas]
+    return all(1 <= faixas.count(i) <= 3 for i in range(len(FAIXAS)))
+
+
+def filtrar_por_anos(concursos: Sequence[Concurso], anos: int) -> List[Concurso]:
+    """Concursos dos ultimos N anos (365 dias por ano)."""
+    limite = dt.date.today() - dt.timedelta(days=anos * 365)
+    return [c for c in concursos if c.data >= limite]
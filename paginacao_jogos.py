@@ -0,0 +1,76 @@
+"""
+Paginacao de listas grandes de jogos
+Busca e filtro rodam no servidor sobre as mascaras de 60 bits dos jogos (NumPy); so a
+pagina visivel vira HTML, num unico bloco, em vez de um elemento Streamlit por jogo.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from formato_jogos import mascara_sorteio
+from monte_carlo import contar_bits
+from styles import criar_numeros_grandes
+
+TAMANHOS_PAGINA = (25, 50, 100, 250)
+
+
+@dataclass(frozen=True)
+class Pagina:
+    indices: np.ndarray       # posicoes dos jogos da pagina na lista original
+    numero: int               # pagina atual (a partir de 1)
+    total_paginas: int
+    total_filtrado: int
+    inicio: int               # quantos jogos filtrados ficam antes desta pagina
+
+
+def interpretar_busca(texto: str) -> Tuple[List[int], List[int]]:
+    """
+    'ex.: 05 12 -33' -> (dezenas que o jogo deve conter, dezenas que nao pode ter).
+    Numeros fora de 1..60 sao ignorados.
+    """
+    contem, exclui = [], []
+    for sinal, numero in re.findall(r"(-?)(\d+)", texto or ""):
+        dezena = int(numero)
+        if 1 <= dezena <= 60:
+            (exclui if sinal else contem).append(dezena)
+    return sorted(set(contem)), sorted(set(exclui))
+
+
+def filtrar_jogos(mascaras: np.ndarray, contem: Sequence[int] = (), exclui: Sequence[int] = (),
+                  sorteio: Optional[Sequence[int]] = None, acertos_min: int = 0) -> np.ndarray:
+    """Posicoes dos jogos que passam no filtro (todas as dezenas de 'contem', nenhuma de 'exclui')."""
+    manter = np.ones(len(mascaras), dtype=bool)
+    if contem:
+        alvo = mascara_sorteio(contem)
+        manter &= (mascaras & alvo) == alvo
+    if exclui:
+        manter &= (mascaras & mascara_sorteio(exclui)) == 0
+    if sorteio and acertos_min:
+        manter &= contar_bits(mascaras & mascara_sorteio(sorteio)) >= acertos_min
+    return np.flatnonzero(manter)
+
+
+def total_paginas(quantidade: int, tamanho: int) -> int:
+    return max(1, math.ceil(quantidade / tamanho))
+
+
+def paginar(indices: np.ndarray, numero: int, tamanho: int) -> Pagina:
+    """Recorta a pagina 'numero' (limitada ao intervalo valido) das posicoes filtradas."""
+    paginas = total_paginas(len(indices), tamanho)
+    numero = min(max(int(numero), 1), paginas)
+    inicio = (numero - 1) * tamanho
+    return Pagina(indices[inicio:inicio + tamanho], numero, paginas, len(indices), inicio)
+
+
+def html_jogos(jogos: Sequence[Sequence[int]], rotulos: Iterable[str],
+               destacar: Iterable[int] = ()) -> str:
+    """Um bloco HTML com uma linha por jogo; dezenas em 'destacar' recebem numero-acerto."""
+    destacar = set(destacar)
+    return "".join(
+        f'<div style="margin: 0.25rem 0;"><strong>{rotulo}:</strong> {criar_numeros_grandes(jogo, destacar)}</div>'
+        for rotulo, jogo in zip(rotulos, jogos)
+    )
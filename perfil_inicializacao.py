@@ -0,0 +1,60 @@
+"""
+Perfil de inicializacao dos scripts de linha de comando
+--profile-startup reexecuta o mesmo comando com 'python -X importtime', repassa a saida
+normal e resume o tempo de import por modulo e o tempo total ate o fim do processo.
+"""
+
+import subprocess
+import sys
+import time
+from typing import List, Sequence, Tuple
+
+OPCAO = "--profile-startup"
+ALVO_MS = 100.0
+TOP_MODULOS = 15
+
+_PREFIXO = "import time:"
+
+
+def interpretar_importtime(saida: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """
+    Separa as linhas do -X importtime das demais.
+    Retorna ([(modulo, proprio_us, acumulado_us)] dos imports de primeiro nivel, outras linhas).
+    """
+    modulos, outras = [], []
+    for linha in saida.splitlines():
+        if not linha.startswith(_PREFIXO):
+            outras.append(linha)
+            continue
+        try:
+            proprio, acumulado, nome = linha[len(_PREFIXO):].split("|", 2)
+            proprio, acumulado = int(proprio), int(acumulado)
+        except ValueError:
+            continue  # cabecalho "self [us] | cumulative | imported package"
+        # Imports aninhados vem indentados; o acumulado do primeiro nivel ja os inclui
+        if not nome[1:].startswith(" "):
+            modulos.append((nome.strip(), proprio, acumulado))
+    return modulos, outras
+
+
+def perfilar_inicializacao(argv: Sequence[str], top: int = TOP_MODULOS) -> int:
+    """Executa argv (sem a opcao) sob -X importtime e imprime o resumo em stderr."""
+    comando = [sys.executable, "-X", "importtime"] + [a for a in argv if a != OPCAO]
+    inicio = time.perf_counter()
+    processo = subprocess.run(comando, stderr=subprocess.PIPE, text=True)
+    total_ms = (time.perf_counter() - inicio) * 1000
+
+    modulos, outras = interpretar_importtime(processo.stderr)
+    for linha in outras:
+        print(linha, file=sys.stderr)
+
+    imports_ms = sum(m[2] for m in modulos) / 1000
+    print(f"\n--- Perfil de inicializacao ({len(modulos)} imports de primeiro nivel) ---", file=sys.stderr)
+    print(f"{'modulo':<40} {'acumulado':>12} {'proprio':>10}", file=sys.stderr)
+    for nome, proprio, acumulado in sorted(modulos, key=lambda m: -m[2])[:top]:
+        print(f"{nome:<40} {acumulado / 1000:>9.1f} ms {proprio / 1000:>7.1f} ms", file=sys.stderr)
+    situacao = "ok" if total_ms <= ALVO_MS else "acima do alvo"
+    print(f"Imports: {imports_ms:.1f} ms | Processo completo: {total_ms:.1f} ms "
+          f"(alvo {ALVO_MS:.0f} ms: {situacao})", file=sys.stderr)
+    return processo.returncode
+
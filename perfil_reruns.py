@@ -0,0 +1,205 @@
+"""
+Perfil de reruns lentos da pagina
+Opcional (PERFIL_RERUN_MS > 0): cada rerun roda com um amostrador de pilha (thread que le
+o frame da thread do script a cada poucos ms) e, no modo 'cprofile', tambem com o cProfile.
+Se o rerun passar do limite, grava em PERFIL_RERUN_DIR:
+  <id>.json       duracao, parametros da sessao, funcoes mais amostradas, trechos da instrumentacao
+  <id>.collapsed  pilhas colapsadas ("a;b;c microssegundos"), entrada de flamegraph.pl / speedscope
+  <id>.prof       estatisticas do cProfile (modo 'cprofile'; abrir com pstats ou snakeviz)
+Reruns rapidos descartam tudo sem tocar no disco.
+"""
+
+import cProfile
+import datetime as dt
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from config import PERFIL_RERUN_DIR, PERFIL_RERUN_MODO, PERFIL_RERUN_MS
+except ImportError:
+    PERFIL_RERUN_MS = float(os.getenv("PERFIL_RERUN_MS", "0"))
+    PERFIL_RERUN_DIR = os.getenv("PERFIL_RERUN_DIR", "perfis_reruns")
+    PERFIL_RERUN_MODO = os.getenv("PERFIL_RERUN_MODO", "amostragem")
+
+MODOS = ("amostragem", "cprofile")
+INTERVALO_MS = 5.0
+MAX_PERFIS = 50          # perfis mais antigos sao apagados
+TOP_FUNCOES = 25
+
+# Com sys.monitoring (3.12+) so um cProfile pode estar ativo por vez no interpretador
+_cprofile_livre = threading.Lock()
+
+
+def _rotulo(codigo) -> str:
+    # Sem ';' nem espacos finais: formato aceito pelas ferramentas de flamegraph
+    return f"{codigo.co_qualname if hasattr(codigo, 'co_qualname') else codigo.co_name} " \
+           f"({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})".replace(";", ",")
+
+
+class Amostrador:
+    """Amostra a pilha de uma thread em intervalos fixos, a partir de um frame raiz."""
+
+    def __init__(self, ident: int, raiz=None, intervalo_ms: float = INTERVALO_MS):
+        self.ident = ident
+        self.raiz = raiz
+        self.intervalo = intervalo_ms / 1000
+        self.pilhas: Counter = Counter()    # pilha -> microssegundos
+        self.amostras = 0
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name="amostrador-rerun", daemon=True)
+
+    def iniciar(self) -> "Amostrador":
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._parar.set()
+        self._thread.join()
+
+    def _executar(self):
+        anterior = time.perf_counter()
+        while not self._parar.wait(self.intervalo):
+            # Peso = tempo real desde a amostra anterior (a thread pode atrasar esperando o GIL)
+            agora = time.perf_counter()
+            peso, anterior = int((agora - anterior) * 1e6), agora
+            frame = sys._current_frames().get(self.ident)
+            pilha = []
+            while frame is not None and frame is not self.raiz:
+                pilha.append(frame.f_code)
+                frame = frame.f_back
+            if pilha and pilha[-1] is not _CODIGO_SAIDA:
+                self.pilhas[tuple(reversed(pilha))] += peso
+                self.amostras += 1
+
+    def colapsado(self) -> str:
+        """Uma linha por pilha distinta: 'raiz;...;folha microssegundos'."""
+        return "".join(f"{';'.join(_rotulo(c) for c in pilha)} {us}\n"
+                       for pilha, us in self.pilhas.most_common())
+
+    def mais_amostradas(self, top: int = TOP_FUNCOES) -> List[Dict]:
+        """Funcoes por tempo no topo da pilha (proprio) e em qualquer posicao (acumulado)."""
+        proprio, acumulado = Counter(), Counter()
+        for pilha, us in self.pilhas.items():
+            proprio[pilha[-1]] += us
+            for codigo in set(pilha):
+                acumulado[codigo] += us
+        return [{'funcao': _rotulo(c), 'acumulado_ms': round(us / 1000, 1), 'proprio_ms': round(proprio[c] / 1000, 1)}
+                for c, us in acumulado.most_common(top)]
+
+
+class PerfilRerun:
+    """
+    Context manager em volta de um rerun. Ao sair, se a duracao passou de 'limite_ms',
+    grava o perfil com os parametros devolvidos por 'parametros()'.
+    """
+
+    def __init__(self, limite_ms: float = PERFIL_RERUN_MS, diretorio: str = PERFIL_RERUN_DIR,
+                 modo: str = PERFIL_RERUN_MODO, parametros: Optional[Callable[[], Dict]] = None,
+                 extras: Optional[Callable[[], Dict]] = None):
+        if modo not in MODOS:
+            raise ValueError(f"Modo de perfil invalido: {modo} (use {', '.join(MODOS)})")
+        self.limite_ms = limite_ms
+        self.diretorio = Path(diretorio)
+        self.modo = modo
+        self.parametros = parametros
+        self.extras = extras
+        self.gravado: Optional[Path] = None
+        self._amostrador: Optional[Amostrador] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> "PerfilRerun":
+        if self.limite_ms <= 0:
+            return self
+        # Pilhas cortadas no chamador: so o que roda dentro do 'with' entra no perfil
+        self._amostrador = Amostrador(threading.get_ident(), raiz=sys._getframe(1)).iniciar()
+        if self.modo == "cprofile" and _cprofile_livre.acquire(blocking=False):
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, tb) -> bool:
+        if self._amostrador is None:
+            return False
+        duracao_ms = (time.perf_counter() - self._inicio) * 1000
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            _cprofile_livre.release()
+        self._amostrador.parar()
+        if duracao_ms >= self.limite_ms:
+            try:
+                self.gravado = self._gravar(duracao_ms, tipo)
+            except Exception as e:
+                # Perfil e diagnostico: nunca derruba a pagina
+                print(f"Erro ao gravar perfil do rerun: {e}")
+        return False
+
+    def _coletar(self, origem: Optional[Callable[[], Dict]]) -> Dict:
+        if origem is None:
+            return {}
+        try:
+            return origem()
+        except Exception as e:
+            return {'erro': str(e)}
+
+    def _gravar(self, duracao_ms: float, excecao: Optional[type]) -> Path:
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        agora = dt.datetime.now()
+        base = self.diretorio / f"rerun_{agora:%Y%m%d_%H%M%S_%f}_{duracao_ms:.0f}ms"
+
+        relatorio = {
+            'criado_em': agora.isoformat(timespec="seconds"),
+            'duracao_ms': round(duracao_ms, 1),
+            'limite_ms': self.limite_ms,
+            'modo': self.modo,
+            'interrompido_por': excecao.__name__ if excecao else None,
+            'parametros': self._coletar(self.parametros),
+            'amostras': self._amostrador.amostras,
+            'intervalo_ms': self._amostrador.intervalo * 1000,
+            'mais_amostradas': self._amostrador.mais_amostradas(),
+        }
+        relatorio.update(self._coletar(self.extras))
+        base.with_suffix(".collapsed").write_text(self._amostrador.colapsado(), encoding="utf-8")
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(base.with_suffix(".prof"))
+            relatorio['cprofile_top'] = resumo_cprofile(self._cprofile)
+        base.with_suffix(".json").write_text(json.dumps(relatorio, ensure_ascii=False, indent=2), encoding="utf-8")
+        _limpar_antigos(self.diretorio)
+        return base.with_suffix(".json")
+
+
+# Amostras tiradas enquanto o proprio perfil encerra nao entram no resultado
+_CODIGO_SAIDA = PerfilRerun.__exit__.__code__
+
+
+def resumo_cprofile(perfil: cProfile.Profile, top: int = TOP_FUNCOES) -> str:
+    """Tabela do pstats ordenada por tempo acumulado."""
+    saida = io.StringIO()
+    pstats.Stats(perfil, stream=saida).sort_stats("cumulative").print_stats(top)
+    return saida.getvalue()
+
+
+def _limpar_antigos(diretorio: Path, manter: int = MAX_PERFIS):
+    relatorios = sorted(diretorio.glob("rerun_*.json"))
+    for antigo in relatorios[:-manter]:
+        for sufixo in (".json", ".collapsed", ".prof"):
+            antigo.with_suffix(sufixo).unlink(missing_ok=True)
+
+
+def listar_perfis(diretorio: str = PERFIL_RERUN_DIR) -> List[Tuple[Path, Dict]]:
+    """Perfis gravados, do mais recente para o mais antigo: [(json, relatorio)]."""
+    perfis = []
+    for caminho in sorted(Path(diretorio).glob("rerun_*.json"), reverse=True):
+        try:
+            perfis.append((caminho, json.loads(caminho.read_text(encoding="utf-8"))))
+        except (OSError, ValueError):
+            continue
+    return perfis
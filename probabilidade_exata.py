@@ -0,0 +1,181 @@
+"""
+Calculo exato (analitico) de retorno da Mega-Sena
+Valor esperado, variancia e distribuicao por faixa de premio para um jogo, um lote de jogos
+ou um fechamento, usando a distribuicao hipergeometrica e as sobreposicoes entre bilhetes
+"""
+
+import itertools
+from math import comb, sqrt
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from monte_carlo import contar_bits
+
+DEZENA_MAX = 60
+TAMANHO_JOGO = 6
+TOTAL_COMBINACOES = comb(DEZENA_MAX, TAMANHO_JOGO)  # 50.063.860
+
+# Valores medios dos premios e custo da aposta simples
+PREMIOS_MEDIOS = {
+    6: 50_000_000,  # Sena média
+    5: 50_000,       # Quina média
+    4: 1_000         # Quadra média
+}
+CUSTO_JOGO = 5.00
+
+# Acima deste tamanho de uniao das dezenas, a distribuicao completa nao e enumerada
+LIMITE_UNIAO_EXATA = 24
+
+
+def distribuicao_acertos(tamanho_jogo: int = TAMANHO_JOGO) -> Dict[int, float]:
+    """P(k acertos) de um bilhete com 'tamanho_jogo' dezenas (hipergeometrica)."""
+    return {
+        k: comb(tamanho_jogo, k) * comb(DEZENA_MAX - tamanho_jogo, TAMANHO_JOGO - k) / TOTAL_COMBINACOES
+        for k in range(TAMANHO_JOGO + 1)
+    }
+
+
+def distribuicao_conjunta(sobreposicao: int) -> Dict[tuple, float]:
+    """
+    P(acertos_i = a, acertos_j = b) para dois bilhetes de 6 dezenas que compartilham
+    'sobreposicao' dezenas (hipergeometrica multivariada sobre as 4 regioes).
+    """
+    o = sobreposicao
+    so = TAMANHO_JOGO - o
+    fora = DEZENA_MAX - 2 * TAMANHO_JOGO + o
+    conjunta: Dict[tuple, float] = {}
+    for xi in range(o + 1):
+        for xa in range(so + 1):
+            for xb in range(so + 1):
+                xo = TAMANHO_JOGO - xi - xa - xb
+                if xo < 0 or xo > fora:
+                    continue
+                p = comb(o, xi) * comb(so, xa) * comb(so, xb) * comb(fora, xo) / TOTAL_COMBINACOES
+                chave = (xi + xa, xi + xb)
+                conjunta[chave] = conjunta.get(chave, 0.0) + p
+    return conjunta
+
+
+def _mascara(jogo: Sequence[int]) -> int:
+    m = 0
+    for d in jogo:
+        m |= 1 << (d - 1)
+    return m
+
+
+def analisar_jogo(premios: Optional[Dict[int, float]] = None, custo: float = CUSTO_JOGO) -> Dict[str, Any]:
+    """Valor esperado, variancia e ROI de um unico bilhete de 6 dezenas."""
+    premios = premios or PREMIOS_MEDIOS
+    dist = distribuicao_acertos()
+    ev = sum(p * premios.get(k, 0) for k, p in dist.items())
+    e2 = sum(p * premios.get(k, 0) ** 2 for k, p in dist.items())
+    variancia = e2 - ev ** 2
+
+    return {
+        'jogos': 1,
+        'distribuicao': dist,
+        'valor_esperado': ev,
+        'variancia': variancia,
+        'desvio': sqrt(variancia),
+        'custo': custo,
+        'lucro_esperado': ev - custo,
+        'roi': (ev - custo) / custo * 100 if custo > 0 else 0,
+    }
+
+
+def histograma_sobreposicoes(jogos: Sequence[Sequence[int]]) -> np.ndarray:
+    """Quantidade de pares de bilhetes (i < j) por numero de dezenas em comum (0..6)."""
+    mascaras = np.array([_mascara(j) for j in jogos], dtype=np.uint64)
+    hist = np.zeros(TAMANHO_JOGO + 1, dtype=np.int64)
+    for i in range(len(mascaras) - 1):
+        comuns = contar_bits(mascaras[i] & mascaras[i + 1:])
+        hist += np.bincount(comuns, minlength=TAMANHO_JOGO + 1)[:TAMANHO_JOGO + 1]
+    return hist
+
+
+def _distribuicao_enumerada(jogos: Sequence[Sequence[int]], premios: Dict[int, float]) -> Dict[str, Dict]:
+    """
+    Enumera todas as intersecoes possiveis do sorteio com a uniao das dezenas jogadas.
+    Cada subconjunto S (|S| <= 6) da uniao tem peso C(60 - u, 6 - |S|) / C(60, 6).
+    """
+    uniao = sorted(set(d for j in jogos for d in j))
+    u = len(uniao)
+    mascaras = np.array([_mascara(j) for j in jogos], dtype=np.uint64)
+    valores = np.array([premios.get(k, 0) for k in range(TAMANHO_JOGO + 1)], dtype=np.float64)
+
+    melhor: Dict[int, float] = {}
+    premio_total: Dict[float, float] = {}
+
+    for m in range(min(u, TAMANHO_JOGO) + 1):
+        peso = comb(DEZENA_MAX - u, TAMANHO_JOGO - m) / TOTAL_COMBINACOES
+        if peso == 0:
+            continue
+        subconjuntos = np.array([_mascara(s) for s in itertools.combinations(uniao, m)], dtype=np.uint64)
+        # Processa em blocos para limitar a matriz subconjuntos x bilhetes
+        bloco = max(1, 2_000_000 // max(1, len(mascaras)))
+        for inicio in range(0, len(subconjuntos), bloco):
+            subs = subconjuntos[inicio:inicio + bloco]
+            acertos = contar_bits(subs[:, None] & mascaras[None, :]).astype(np.int64)
+            for k, qtd in zip(*np.unique(acertos.max(axis=1), return_counts=True)):
+                melhor[int(k)] = melhor.get(int(k), 0.0) + float(qtd) * peso
+            for v, qtd in zip(*np.unique(valores[acertos].sum(axis=1), return_counts=True)):
+                premio_total[float(v)] = premio_total.get(float(v), 0.0) + float(qtd) * peso
+
+    return {'melhor_acerto': dict(sorted(melhor.items())), 'premio_total': dict(sorted(premio_total.items()))}
+
+
+def analisar_lote(jogos: Sequence[Sequence[int]], premios: Optional[Dict[int, float]] = None,
+                  custo: float = CUSTO_JOGO, limite_uniao: int = LIMITE_UNIAO_EXATA) -> Dict[str, Any]:
+    """
+    Analise exata de um lote de bilhetes (ou de um fechamento).
+
+    Valor esperado por linearidade; variancia somando as covariancias de cada par
+    de bilhetes, agrupados pelo numero de dezenas em comum. Quando a uniao das dezenas
+    tem ate 'limite_uniao' numeros, enumera tambem a distribuicao completa do melhor
+    acerto e do premio total; acima disso 'exato' fica False e so os momentos sao exatos.
+    """
+    premios = premios or PREMIOS_MEDIOS
+    if not jogos:
+        return analisar_jogo(premios, custo)
+
+    n = len(jogos)
+    unitario = analisar_jogo(premios, custo)
+    ev1 = unitario['valor_esperado']
+
+    covariancias = []
+    for o in range(TAMANHO_JOGO + 1):
+        e_prod = sum(p * premios.get(a, 0) * premios.get(b, 0) for (a, b), p in distribuicao_conjunta(o).items())
+        covariancias.append(e_prod - ev1 ** 2)
+
+    hist = histograma_sobreposicoes(jogos)
+    variancia = n * unitario['variancia'] + 2 * sum(hist[o] * covariancias[o] for o in range(TAMANHO_JOGO + 1))
+    variancia = max(float(variancia), 0.0)
+
+    custo_total = n * custo
+    ev = n * ev1
+    resultado = {
+        'jogos': n,
+        'valor_esperado': ev,
+        'variancia': variancia,
+        'desvio': sqrt(variancia),
+        'custo': custo_total,
+        'lucro_esperado': ev - custo_total,
+        'roi': (ev - custo_total) / custo_total * 100 if custo_total > 0 else 0,
+        'premios_esperados': {k: n * unitario['distribuicao'][k] for k in (4, 5, 6)},
+        'sobreposicoes': hist.tolist(),
+        'exato': False,
+    }
+
+    uniao = len(set(d for j in jogos for d in j))
+    if uniao <= limite_uniao:
+        enumerada = _distribuicao_enumerada(jogos, premios)
+        melhor = enumerada['melhor_acerto']
+        resultado['melhor_acerto'] = melhor
+        resultado['premio_total'] = enumerada['premio_total']
+        resultado['prob_ao_menos'] = {
+            k: sum(p for acerto, p in melhor.items() if acerto >= k) for k in (4, 5, 6)
+        }
+        resultado['exato'] = True
+
+    return resultado
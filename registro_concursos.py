@@ -0,0 +1,143 @@
+"""
+Registro canonico de resultados (log binario append-only)
+Cabecalho fixo com o ultimo numero e a quantidade de registros, seguido de registros de
+16 bytes (numero, data, 6 dezenas). Anexar concursos e consultar o ultimo numero custam
+O(1) no tamanho do arquivo; o xlsx passa a ser apenas uma exportacao.
+O NumPy so e importado por quem grava ou mapeia o arquivo; iterar() usa apenas struct,
+para os scripts de linha de comando iniciarem rapido.
+"""
+
+import datetime as dt
+import os
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+MAGICO = b"MSLG"
+VERSAO_FORMATO = 1
+
+# magico, versao do formato, ultimo numero, quantidade de registros (+ reservado ate 32 bytes)
+_CABECALHO = struct.Struct("<4sIqq8x")
+
+# numero, data (date.toordinal()), 6 dezenas, 2 bytes reservados
+_REGISTRO = struct.Struct("<ii6B2x")
+
+
+@lru_cache(maxsize=1)
+def tipo_registro():
+    """dtype NumPy equivalente a _REGISTRO."""
+    import numpy as np
+
+    return np.dtype([
+        ('numero', '<i4'),
+        ('data', '<i4'),
+        ('dezenas', 'u1', (6,)),
+        ('reservado', 'u1', (2,)),
+    ])
+
+
+def _ler_cabecalho(f) -> Tuple[int, int]:
+    f.seek(0)
+    bruto = f.read(_CABECALHO.size)
+    if len(bruto) < _CABECALHO.size:
+        raise ValueError("Registro de concursos truncado")
+    magico, versao, ultimo, quantidade = _CABECALHO.unpack(bruto)
+    if magico != MAGICO or versao != VERSAO_FORMATO:
+        raise ValueError("Arquivo nao e um registro de concursos")
+    return ultimo, quantidade
+
+
+def criar(caminho: Path):
+    """Cria um registro vazio."""
+    with open(caminho, "wb") as f:
+        f.write(_CABECALHO.pack(MAGICO, VERSAO_FORMATO, 0, 0))
+
+
+def ultimo_numero(caminho: Path) -> int:
+    """Ultimo concurso registrado (le apenas o cabecalho; 0 se o arquivo nao existe)."""
+    if not Path(caminho).exists():
+        return 0
+    with open(caminho, "rb") as f:
+        return _ler_cabecalho(f)[0]
+
+
+def anexar(caminho: Path, concursos: Iterable[Tuple[int, dt.date, Sequence[int]]]) -> int:
+    """
+    Anexa (numero, data, dezenas) com numero maior que o ultimo registrado.
+    Os registros sao gravados antes do cabecalho: se o processo cair no meio, o
+    cabecalho antigo continua valido e os bytes orfaos sao sobrescritos na proxima vez.
+    Retorna quantos concursos foram anexados.
+    """
+    import numpy as np
+
+    caminho = Path(caminho)
+    if not caminho.exists():
+        criar(caminho)
+
+    with open(caminho, "r+b") as f:
+        ultimo, quantidade = _ler_cabecalho(f)
+        novos = sorted((c for c in concursos if c[0] > ultimo), key=lambda c: c[0])
+        # Remove numeros repetidos na propria entrada
+        novos = [c for i, c in enumerate(novos) if i == 0 or c[0] != novos[i - 1][0]]
+        if not novos:
+            return 0
+
+        registro = tipo_registro()
+        registros = np.zeros(len(novos), dtype=registro)
+        registros['numero'] = [c[0] for c in novos]
+        registros['data'] = [c[1].toordinal() for c in novos]
+        registros['dezenas'] = [sorted(c[2]) for c in novos]
+
+        f.seek(_CABECALHO.size + quantidade * registro.itemsize)
+        f.write(registros.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+        f.seek(0)
+        f.write(_CABECALHO.pack(MAGICO, VERSAO_FORMATO, int(registros['numero'][-1]), quantidade + len(novos)))
+        f.flush()
+        os.fsync(f.fileno())
+
+    return len(novos)
+
+
+def ler(caminho: Path):
+    """Todos os registros como array estruturado mapeado em memoria (somente leitura)."""
+    import numpy as np
+
+    with open(caminho, "rb") as f:
+        _, quantidade = _ler_cabecalho(f)
+    if quantidade == 0:
+        return np.zeros(0, dtype=tipo_registro())
+    return np.memmap(caminho, dtype=tipo_registro(), mode="r", offset=_CABECALHO.size, shape=(quantidade,))
+
+
+def iterar(caminho: Path) -> Iterator[Tuple[int, dt.date, Tuple[int, ...]]]:
+    """(numero, data, dezenas) de cada registro, sem NumPy."""
+    with open(caminho, "rb") as f:
+        _, quantidade = _ler_cabecalho(f)
+        bruto = f.read(quantidade * _REGISTRO.size)
+    if len(bruto) < quantidade * _REGISTRO.size:
+        raise ValueError("Registro de concursos truncado")
+    for numero, data, *dezenas in _REGISTRO.iter_unpack(bruto):
+        yield numero, dt.date.fromordinal(data), tuple(dezenas)
+
+
+def ler_concursos(caminho: Path, fabrica: Callable) -> List:
+    """Concursos do registro; fabrica(numero=, data=, dezenas=) cria cada objeto."""
+    return [fabrica(numero=numero, data=data, dezenas=dezenas) for numero, data, dezenas in iterar(caminho)]
+
+
+def exportar_excel(caminho: Path, destino: Path):
+    """Exporta o registro para xlsx no layout do arquivo original (Concurso, Data, Dezena 1..6)."""
+    import pandas as pd
+
+    registros = ler(caminho)
+    df = pd.DataFrame({
+        'Concurso': registros['numero'].astype(int),
+        'Data': [dt.date.fromordinal(int(o)).strftime("%d/%m/%Y") for o in registros['data']],
+    })
+    for i in range(6):
+        df[f'Dezena {i + 1}'] = registros['dezenas'][:, i].astype(int)
+    df.to_excel(destino, index=False)
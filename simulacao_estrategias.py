@@ -0,0 +1,133 @@
+"""
+Simulacao de Monte Carlo das estrategias reais de geracao
+Para cada sorteio simulado gera um lote de jogos com o GeradorJogos (mesmos algoritmos,
+balanceamento e numeros fixos/removidos da interface) e confere contra o sorteio.
+Os blocos de rodadas rodam em processos separados com sementes deterministicas.
+"""
+
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from monte_carlo import contar_bits, sortear_mascaras
+from nucleo.analisador import AnalisadorMegaSena
+from nucleo.gerador import GeradorJogos
+from nucleo.modelo import TAMANHO_JOGO, Concurso
+from probabilidade_exata import CUSTO_JOGO, PREMIOS_MEDIOS, analisar_jogo
+
+# Analisador reconstruido uma vez por processo worker (chave = assinatura dos dados)
+_analisadores: Dict[Tuple, AnalisadorMegaSena] = {}
+
+
+@dataclass(frozen=True)
+class Estrategia:
+    algoritmos: Tuple[str, ...]
+    forcar_balanceamento: bool = False
+    numeros_fixos: Tuple[int, ...] = field(default_factory=tuple)
+    numeros_removidos: Tuple[int, ...] = field(default_factory=tuple)
+    jogos_por_rodada: int = 6
+
+
+def _obter_analisador(dados: Tuple[Tuple, ...]):
+    assinatura = (len(dados), dados[-1] if dados else None)
+    if assinatura not in _analisadores:
+        _analisadores.clear()
+        _analisadores[assinatura] = AnalisadorMegaSena(
+            [Concurso(numero=n, data=d, dezenas=dez) for n, d, dez in dados]
+        )
+    return _analisadores[assinatura]
+
+
+def _simular_bloco(dados: Tuple[Tuple, ...], estrategia: Estrategia, rodadas: int,
+                   semente: int, bloco: int) -> Dict[str, List[int]]:
+    """Executa 'rodadas' sorteios de um bloco; semente derivada de (semente, bloco)."""
+    analisador = _obter_analisador(dados)
+    gerador = GeradorJogos(analisador, rng=random.Random(semente * 1_000_003 + bloco))
+    rng_sorteio = np.random.default_rng([semente, bloco])
+    sorteios = sortear_mascaras(rng_sorteio, rodadas)
+
+    por_jogo = np.zeros(TAMANHO_JOGO + 1, dtype=np.int64)
+    melhor_por_rodada = np.zeros(TAMANHO_JOGO + 1, dtype=np.int64)
+    total_jogos = 0
+
+    for sorteio in sorteios:
+        jogos, _ = gerador.gerar_jogos(
+            estrategia.jogos_por_rodada, list(estrategia.algoritmos), estrategia.forcar_balanceamento,
+            set(estrategia.numeros_fixos), set(estrategia.numeros_removidos)
+        )
+        mascaras = np.array([sum(1 << (d - 1) for d in j) for j in jogos], dtype=np.uint64)
+        if len(mascaras) == 0:
+            continue
+        acertos = contar_bits(mascaras & sorteio)
+        por_jogo += np.bincount(acertos, minlength=TAMANHO_JOGO + 1)
+        melhor_por_rodada[int(acertos.max())] += 1
+        total_jogos += len(jogos)
+
+    return {
+        'por_jogo': por_jogo.tolist(),
+        'melhor_por_rodada': melhor_por_rodada.tolist(),
+        'jogos': total_jogos,
+    }
+
+
+def simular_estrategia(concursos: Sequence, estrategia: Estrategia, rodadas: int, semente: int = 0,
+                       executor: Optional[ProcessPoolExecutor] = None, tamanho_bloco: int = 500,
+                       progresso: Optional[Callable[[float], bool]] = None) -> Dict[str, Any]:
+    """
+    Simula 'rodadas' sorteios uniformes; em cada um gera um lote com a estrategia e confere.
+    O resultado so depende de (concursos, estrategia, rodadas, semente, tamanho_bloco),
+    nao da quantidade de processos.
+    """
+    dados = tuple((c.numero, c.data, tuple(c.dezenas)) for c in concursos)
+    blocos = [(i, min(tamanho_bloco, rodadas - i * tamanho_bloco))
+              for i in range((rodadas + tamanho_bloco - 1) // tamanho_bloco)]
+
+    if executor is None:
+        parciais = []
+        for i, (bloco, qtd) in enumerate(blocos):
+            if progresso is not None and progresso(i / len(blocos)) is False:
+                break
+            parciais.append(_simular_bloco(dados, estrategia, qtd, semente, bloco))
+    else:
+        futuros = [executor.submit(_simular_bloco, dados, estrategia, qtd, semente, bloco)
+                   for bloco, qtd in blocos]
+        while not all(f.done() for f in futuros):
+            concluidos = sum(1 for f in futuros if f.done())
+            if progresso is not None and progresso(concluidos / len(futuros)) is False:
+                for f in futuros:
+                    f.cancel()
+                break
+            time.sleep(0.2)
+        parciais = [f.result() for f in futuros if f.done() and not f.cancelled()]
+
+    por_jogo = np.zeros(TAMANHO_JOGO + 1, dtype=np.int64)
+    melhor_por_rodada = np.zeros(TAMANHO_JOGO + 1, dtype=np.int64)
+    total_jogos = 0
+    for p in parciais:
+        por_jogo += p['por_jogo']
+        melhor_por_rodada += p['melhor_por_rodada']
+        total_jogos += p['jogos']
+
+    rodadas_executadas = int(melhor_por_rodada.sum())
+    ganhos_total = sum(PREMIOS_MEDIOS.get(k, 0) * int(por_jogo[k]) for k in range(TAMANHO_JOGO + 1))
+    custo_total = total_jogos * CUSTO_JOGO
+    base = analisar_jogo()
+
+    return {
+        'estrategia': estrategia,
+        'rodadas': rodadas_executadas,
+        'jogos': total_jogos,
+        'acertos': {k: int(por_jogo[k]) for k in (4, 5, 6)},
+        'distribuicao_acertos': {k: int(por_jogo[k]) for k in range(TAMANHO_JOGO + 1)},
+        'melhor_por_rodada': {k: int(melhor_por_rodada[k]) for k in range(TAMANHO_JOGO + 1)},
+        'custo_total': custo_total,
+        'ganhos_total': ganhos_total,
+        'roi': round((ganhos_total - custo_total) / custo_total * 100, 2) if custo_total > 0 else 0,
+        # Referencia: mesma quantidade de jogos uniformes, pela forma fechada
+        'acertos_esperados_uniforme': {k: total_jogos * base['distribuicao'][k] for k in (4, 5, 6)},
+        'roi_uniforme': round(base['roi'], 2),
+    }
@@ -3,6 +3,9 @@ Estilos Premium Dark Mode para Mega-Sena App
 Design moderno com glassmorphism, gradientes e animacoes
 """
 
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
 PREMIUM_CSS = """
 <style>
 /* ============================================
@@ -780,21 +783,82 @@ def criar_bola_html(numero: int, tipo: str = "normal") -> str:
     return f'<span class="{classe}">{numero:02d}</span>'
 
 
+# ============================================
+# FRAGMENTOS PRE-RENDERIZADOS
+# As 60 variantes de cada estado sao montadas uma vez; jogos e volantes sao
+# identificados por mascara de 60 bits (bit d-1 = dezena d) e memoizados por ela.
+# ============================================
+
+DEZENAS = range(1, 61)
+TAMANHO_CACHE_HTML = 8192
+
+_BOLAS = {tipo: [""] + [criar_bola_html(d, tipo) for d in DEZENAS] for tipo in ("normal", "fixed", "hit")}
+_NUMEROS_GRANDES = ([""] + [f'<span class="numero-grande">{d:02d}</span>' for d in DEZENAS],
+                    [""] + [f'<span class="numero-grande numero-acerto">{d:02d}</span>' for d in DEZENAS])
+
+
+def _celulas_volante(classe: str) -> tuple:
+    """(celula desmarcada, celula marcada) de cada dezena para um estilo de volante."""
+    return ([""] + [f'<div class="{classe}">{d:02d}</div>' for d in DEZENAS],
+            [""] + [f'<div class="{classe} marcado">{d:02d}</div>' for d in DEZENAS])
+
+
+_VOLANTE_PREMIUM = _celulas_volante("volante-numero")
+_VOLANTE_SIMPLES = _celulas_volante("numero")
+
+
+def mascara_dezenas(dezenas: Optional[Iterable[int]]) -> int:
+    """Mascara de 60 bits de um conjunto de dezenas (1..60)."""
+    mascara = 0
+    for d in dezenas or ():
+        mascara |= 1 << (int(d) - 1)
+    return mascara
+
+
+def dezenas_mascara(mascara: int) -> List[int]:
+    """Dezenas marcadas na mascara, em ordem crescente."""
+    dezenas = []
+    while mascara:
+        bit = mascara & -mascara
+        dezenas.append(bit.bit_length())
+        mascara ^= bit
+    return dezenas
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_HTML)
+def _bolas_mascara(mascara: int, fixos: int, acertos: int) -> str:
+    partes = []
+    for d in dezenas_mascara(mascara):
+        bit = 1 << (d - 1)
+        tipo = "hit" if acertos & bit else "fixed" if fixos & bit else "normal"
+        partes.append(_BOLAS[tipo][d])
+    return ('<div style="display: flex; flex-wrap: wrap; justify-content: center; gap: 4px;">'
+            + "".join(partes) + '</div>')
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_HTML)
+def _numeros_grandes_mascara(mascara: int, acertos: int) -> str:
+    normal, acerto = _NUMEROS_GRANDES
+    return "".join(acerto[d] if acertos >> (d - 1) & 1 else normal[d] for d in dezenas_mascara(mascara))
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_HTML)
+def volante_mascara(mascara: int, simples: bool = False) -> str:
+    """Celulas das 60 dezenas de um volante (sem o container), marcadas pela mascara."""
+    desmarcada, marcada = _VOLANTE_SIMPLES if simples else _VOLANTE_PREMIUM
+    return "".join(marcada[d] if mascara >> (d - 1) & 1 else desmarcada[d] for d in DEZENAS)
+
+
 def criar_bolas_jogo(dezenas: list, fixos: set = None, acertos: set = None) -> str:
-    """Cria HTML para todas as bolas de um jogo."""
-    fixos = fixos or set()
-    acertos = acertos or set()
-
-    html = '<div style="display: flex; flex-wrap: wrap; justify-content: center; gap: 4px;">'
-    for d in dezenas:
-        if d in acertos:
-            html += criar_bola_html(d, "hit")
-        elif d in fixos:
-            html += criar_bola_html(d, "fixed")
-        else:
-            html += criar_bola_html(d, "normal")
-    html += '</div>'
-    return html
+    """Cria HTML para todas as bolas de um jogo (em ordem crescente)."""
+    mascara = mascara_dezenas(dezenas)
+    return _bolas_mascara(mascara, mascara_dezenas(fixos) & mascara, mascara_dezenas(acertos) & mascara)
+
+
+def criar_numeros_grandes(dezenas: list, acertos: set = None) -> str:
+    """Spans 'numero-grande' de um jogo; dezenas em 'acertos' recebem numero-acerto."""
+    mascara = mascara_dezenas(dezenas)
+    return _numeros_grandes_mascara(mascara, mascara_dezenas(acertos) & mascara)
 
 
 def criar_header_premium(titulo: str, subtitulo: str) -> str:
@@ -819,17 +883,18 @@ def criar_kpi_card(valor: str, label: str, icone: str = "") -> str:
 
 def criar_volante_premium(dezenas_marcadas: list) -> str:
     """Cria um volante visual premium."""
-    html = '<div class="volante-premium">'
-    for i in range(1, 61):
-        classe = "volante-numero marcado" if i in dezenas_marcadas else "volante-numero"
-        html += f'<div class="{classe}">{i:02d}</div>'
-    html += '</div>'
-    return html
+    return f'<div class="volante-premium">{volante_mascara(mascara_dezenas(dezenas_marcadas))}</div>'
 
 
 def criar_game_card(numero_jogo: int, dezenas: list, fixos: set = None, info_extra: str = "") -> str:
     """Cria um card de jogo completo."""
-    bolas = criar_bolas_jogo(dezenas, fixos)
+    mascara = mascara_dezenas(dezenas)
+    return _game_card(numero_jogo, mascara, mascara_dezenas(fixos) & mascara, info_extra)
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_HTML)
+def _game_card(numero_jogo: int, mascara: int, fixos: int, info_extra: str) -> str:
+    bolas = _bolas_mascara(mascara, fixos, 0)
 
     return f'''
     <div class="game-card animate-fade-in">
@@ -1,15 +1,19 @@
 """
 Cliente Supabase para o Gerador Mega-Sena
 Gerencia conexao e operacoes com o banco de dados
+supabase e requests sao importados so quando usados (inicio rapido dos scripts); dotenv so
+quando existe um arquivo .env
 """
 
 import os
-import requests
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from dotenv import load_dotenv
-from supabase import create_client, Client
+
+from instrumentacao import cronometrado
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # URL da API da Caixa
 API_CAIXA_URL = "https://servicebus2.caixa.gov.br/portaldeloterias/api/megasena"
@@ -19,20 +23,23 @@ try:
     from config import SUPABASE_URL, SUPABASE_KEY
 except ImportError:
     # Fallback para variáveis de ambiente
+    from dotenv import load_dotenv
     load_dotenv()
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """Retorna cliente Supabase configurado."""
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Credenciais do Supabase nao configuradas. Verifique o arquivo .env")
+    from supabase import create_client
     return create_client(SUPABASE_URL, SUPABASE_KEY)
 
 
 # ============== OPERACOES COM CONCURSOS ==============
 
+@cronometrado
 def inserir_concurso(numero: int, data: date, dezenas: List[int]) -> bool:
     """Insere um novo concurso no banco."""
     try:
@@ -57,6 +64,7 @@ def inserir_concurso(numero: int, data: date, dezenas: List[int]) -> bool:
         return False
 
 
+@cronometrado
 def inserir_concursos_em_lote(concursos: List[Dict]) -> Tuple[int, int]:
     """
     Insere multiplos concursos de uma vez.
@@ -116,6 +124,7 @@ def inserir_concursos_em_lote(concursos: List[Dict]) -> Tuple[int, int]:
     return sucesso, falhas
 
 
+@cronometrado
 def buscar_todos_concursos() -> List[Dict]:
     """Busca todos os concursos ordenados por numero."""
     try:
@@ -130,6 +139,7 @@ def buscar_todos_concursos() -> List[Dict]:
         return []
 
 
+@cronometrado
 def buscar_ultimo_concurso() -> Optional[Dict]:
     """Busca o concurso mais recente."""
     try:
@@ -145,6 +155,7 @@ def buscar_ultimo_concurso() -> Optional[Dict]:
         return None
 
 
+@cronometrado
 def buscar_concursos_recentes(limite: int = 100) -> List[Dict]:
     """Busca os N concursos mais recentes."""
     try:
@@ -160,6 +171,7 @@ def buscar_concursos_recentes(limite: int = 100) -> List[Dict]:
         return []
 
 
+@cronometrado
 def contar_concursos() -> int:
     """Retorna o total de concursos no banco."""
     try:
@@ -175,6 +187,7 @@ def contar_concursos() -> int:
 
 # ============== OPERACOES COM JOGOS SALVOS ==============
 
+@cronometrado
 def salvar_jogo(dezenas: List[int], algoritmos: List[str] = None) -> Optional[int]:
     """Salva um novo jogo e retorna o ID."""
     try:
@@ -191,6 +204,7 @@ def salvar_jogo(dezenas: List[int], algoritmos: List[str] = None) -> Optional[in
         return None
 
 
+@cronometrado
 def salvar_jogos_em_lote(jogos: List[Dict]) -> Tuple[int, int]:
     """
     Salva multiplos jogos de uma vez.
@@ -220,6 +234,7 @@ def salvar_jogos_em_lote(jogos: List[Dict]) -> Tuple[int, int]:
     return 0, 0
 
 
+@cronometrado
 def buscar_jogos_salvos() -> List[Dict]:
     """Busca todos os jogos salvos."""
     try:
@@ -234,6 +249,7 @@ def buscar_jogos_salvos() -> List[Dict]:
         return []
 
 
+@cronometrado
 def atualizar_jogo(jogo_id: int, dados: Dict) -> bool:
     """Atualiza um jogo existente."""
     try:
@@ -248,6 +264,7 @@ def atualizar_jogo(jogo_id: int, dados: Dict) -> bool:
         return False
 
 
+@cronometrado
 def deletar_jogo(jogo_id: int) -> bool:
     """Deleta um jogo pelo ID."""
     try:
@@ -262,6 +279,7 @@ def deletar_jogo(jogo_id: int) -> bool:
         return False
 
 
+@cronometrado
 def deletar_todos_jogos() -> bool:
     """Deleta todos os jogos salvos."""
     try:
@@ -276,6 +294,7 @@ def deletar_todos_jogos() -> bool:
         return False
 
 
+@cronometrado
 def conferir_jogo_no_banco(jogo_id: int, concurso_numero: int, acertos: int) -> bool:
     """Atualiza o resultado de conferencia de um jogo."""
     try:
@@ -309,8 +328,11 @@ def conferir_jogo_no_banco(jogo_id: int, concurso_numero: int, acertos: int) ->
 
 # ============== SINCRONIZACAO COM API CAIXA ==============
 
+@cronometrado
 def buscar_concurso_caixa(numero: int = None) -> Optional[Dict]:
     """Busca um concurso especifico ou o ultimo da API da Caixa."""
+    import requests
+
     try:
         url = f"{API_CAIXA_URL}/{numero}" if numero else API_CAIXA_URL
         response = requests.get(url, timeout=15)
@@ -321,6 +343,7 @@ def buscar_concurso_caixa(numero: int = None) -> Optional[Dict]:
     return None
 
 
+@cronometrado
 def sincronizar_com_caixa(dias_atras: int = 365) -> Tuple[int, int, str]:
     """
     Sincroniza o banco com os resultados da API da Caixa.
@@ -398,6 +421,7 @@ def sincronizar_com_caixa(dias_atras: int = 365) -> Tuple[int, int, str]:
         return 0, 0, f"Erro na sincronizacao: {str(e)}"
 
 
+@cronometrado
 def verificar_atualizacao() -> Tuple[bool, int, int]:
     """
     Verifica se ha novos concursos disponiveis.
@@ -420,6 +444,7 @@ def verificar_atualizacao() -> Tuple[bool, int, int]:
         return False, 0, 0
 
 
+@cronometrado
 def buscar_concursos_ultimo_ano() -> List[Dict]:
     """Busca todos os concursos do ultimo ano do banco."""
     try:
@@ -439,6 +464,7 @@ def buscar_concursos_ultimo_ano() -> List[Dict]:
 
 # ============== UTILITARIOS ==============
 
+@cronometrado
 def testar_conexao() -> Tuple[bool, str]:
     """Testa a conexao com o Supabase."""
     try:
@@ -0,0 +1,139 @@
+"""
+Gerenciador de tarefas em segundo plano
+Executa calculos longos (Monte Carlo, fechamentos, simulacoes) em um pool de workers,
+identificados pelo hash dos parametros, com cache de resultados por tempo (TTL)
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Estados possiveis de uma tarefa
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+CANCELADA = "cancelada"
+ERRO = "erro"
+
+
+def _aceita_progresso(funcao: Callable[..., Any]) -> bool:
+    """True se a funcao declara 'progresso' ou aceita **kwargs."""
+    try:
+        parametros = inspect.signature(funcao).parameters.values()
+    except (TypeError, ValueError):
+        return True
+    return any(p.name == "progresso" or p.kind is inspect.Parameter.VAR_KEYWORD for p in parametros)
+
+
+class Tarefa:
+    """Estado de um calculo submetido ao gerenciador."""
+
+    def __init__(self, chave: str, nome: str, params: Dict[str, Any]):
+        self.chave = chave
+        self.nome = nome
+        self.params = params
+        self.status = PENDENTE
+        self.progresso = 0.0
+        self.resultado: Any = None
+        self.erro: Optional[str] = None
+        self.criada_em = time.time()
+        self.concluida_em: Optional[float] = None
+        self._cancelar = threading.Event()
+
+    @property
+    def finalizada(self) -> bool:
+        return self.status in (CONCLUIDA, CANCELADA, ERRO)
+
+    @property
+    def cancelamento_solicitado(self) -> bool:
+        return self._cancelar.is_set()
+
+    def cancelar(self):
+        """Pede o cancelamento; a funcao encerra no proximo aviso de progresso."""
+        self._cancelar.set()
+
+    def atualizar_progresso(self, fracao: float) -> bool:
+        """
+        Callback repassado as funcoes como 'progresso'.
+        Retorna False quando o cancelamento foi solicitado.
+        """
+        self.progresso = max(0.0, min(1.0, fracao))
+        return not self._cancelar.is_set()
+
+
+class GerenciadorTarefas:
+    """Fila de tarefas em processo, com deduplicacao por parametros e cache TTL."""
+
+    def __init__(self, max_workers: Optional[int] = None, ttl: float = 600):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                            thread_name_prefix="tarefa")
+        self._tarefas: Dict[str, Tarefa] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(nome: str, params: Dict[str, Any]) -> str:
+        """Hash estavel do nome da tarefa + parametros."""
+        bruto = json.dumps([nome, params], sort_keys=True, default=str)
+        return hashlib.sha256(bruto.encode("utf-8")).hexdigest()[:16]
+
+    def submeter(self, nome: str, funcao: Callable[..., Any], contexto: Any = None, **params) -> Tarefa:
+        """
+        Submete funcao(**params, progresso=callback); funcoes sem o parametro 'progresso'
+        (nem **kwargs) sao chamadas apenas com os params.
+        Se ja existe tarefa com os mesmos parametros (em execucao ou concluida
+        dentro do TTL), devolve a existente em vez de recalcular.
+        'contexto' entra apenas na chave (ex.: ultimo concurso da base usada).
+        """
+        chave = self.chave(nome, {'contexto': contexto, **params})
+        with self._lock:
+            self._remover_expiradas()
+            existente = self._tarefas.get(chave)
+            if existente is not None and existente.status not in (CANCELADA, ERRO):
+                return existente
+
+            tarefa = Tarefa(chave, nome, params)
+            self._tarefas[chave] = tarefa
+
+        self._executor.submit(self._executar, tarefa, funcao)
+        return tarefa
+
+    def obter(self, chave: Optional[str]) -> Optional[Tarefa]:
+        if not chave:
+            return None
+        with self._lock:
+            return self._tarefas.get(chave)
+
+    def cancelar(self, chave: str):
+        tarefa = self.obter(chave)
+        if tarefa is not None:
+            tarefa.cancelar()
+
+    def _executar(self, tarefa: Tarefa, funcao: Callable[..., Any]):
+        tarefa.status = EXECUTANDO
+        try:
+            if _aceita_progresso(funcao):
+                tarefa.resultado = funcao(**tarefa.params, progresso=tarefa.atualizar_progresso)
+            else:
+                tarefa.resultado = funcao(**tarefa.params)
+            tarefa.progresso = 1.0
+            tarefa.status = CANCELADA if tarefa.cancelamento_solicitado else CONCLUIDA
+        except Exception as e:
+            tarefa.erro = str(e)
+            tarefa.status = ERRO
+        finally:
+            tarefa.concluida_em = time.time()
+
+    def _remover_expiradas(self):
+        agora = time.time()
+        expiradas = [
+            chave for chave, t in self._tarefas.items()
+            if t.concluida_em is not None and agora - t.concluida_em > self.ttl
+        ]
+        for chave in expiradas:
+            del self._tarefas[chave]
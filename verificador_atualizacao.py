@@ -0,0 +1,152 @@
+"""
+Verificador compartilhado de novos concursos
+Uma unica instancia por processo consulta a API da Caixa no maximo uma vez por intervalo,
+com requisicoes condicionais (ETag / If-Modified-Since), e nao consulta nada enquanto o
+proximo sorteio previsto ainda nao aconteceu. O resultado vale para todas as sessoes.
+"""
+
+import datetime as dt
+import os
+import threading
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional
+
+import requests
+
+from instrumentacao import cronometrado
+
+try:
+    from config import API_CAIXA_BASE
+except ImportError:
+    API_CAIXA_BASE = os.getenv("API_CAIXA_BASE", "https://servicebus2.caixa.gov.br/portaldeloterias/api/megasena")
+
+# Horario de Brasilia (sem horario de verao desde 2019)
+FUSO_BRASILIA = dt.timezone(dt.timedelta(hours=-3), "BRT")
+
+# Sorteios as tercas, quintas e sabados, as 20h; resultado publicado pouco depois
+DIAS_SORTEIO = (1, 3, 5)
+HORA_SORTEIO = dt.time(20, 0)
+MARGEM_PUBLICACAO = dt.timedelta(minutes=30)
+
+
+@dataclass(frozen=True)
+class EstadoAtualizacao:
+    ultimo_caixa: int = 0
+    ultimo_local: int = 0
+    verificado_em: Optional[dt.datetime] = None
+    proximo_sorteio: Optional[dt.datetime] = None
+
+    @property
+    def ha_novos(self) -> bool:
+        return self.ultimo_caixa > self.ultimo_local
+
+
+def proximo_sorteio_previsto(depois_de: dt.datetime) -> dt.datetime:
+    """Proximo horario de sorteio pela grade semanal (terca, quinta e sabado, 20h)."""
+    agora = depois_de.astimezone(FUSO_BRASILIA)
+    for dias in range(8):
+        dia = agora.date() + dt.timedelta(days=dias)
+        horario = dt.datetime.combine(dia, HORA_SORTEIO, tzinfo=FUSO_BRASILIA)
+        if dia.weekday() in DIAS_SORTEIO and horario > agora:
+            return horario
+    raise AssertionError("grade de sorteios sem dias validos")
+
+
+def _data_proximo_concurso(dados: Dict) -> Optional[dt.datetime]:
+    """Data do proximo concurso informada pela Caixa ('dd/mm/aaaa'), no horario do sorteio."""
+    try:
+        dia = dt.datetime.strptime(dados.get('dataProximoConcurso', ''), "%d/%m/%Y").date()
+    except (TypeError, ValueError):
+        return None
+    return dt.datetime.combine(dia, HORA_SORTEIO, tzinfo=FUSO_BRASILIA)
+
+
+class VerificadorAtualizacao:
+    """
+    ultimo_local() deve ser barato (ex.: versao do cache de concursos); a API da Caixa
+    so e consultada quando o intervalo expirou e ja passou o horario do proximo sorteio.
+    """
+
+    def __init__(self, ultimo_local: Callable[[], Optional[int]], intervalo: float = 300.0,
+                 url: str = API_CAIXA_BASE, timeout: float = 10.0):
+        self._ultimo_local = ultimo_local
+        self.intervalo = dt.timedelta(seconds=intervalo)
+        self.url = url
+        self.timeout = timeout
+        self._estado = EstadoAtualizacao()
+        self._cabecalhos: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> EstadoAtualizacao:
+        return self._estado
+
+    def verificar(self, forcar: bool = False) -> EstadoAtualizacao:
+        """
+        Estado atual. Se outra sessao ja esta consultando a Caixa, devolve o ultimo
+        estado publicado em vez de esperar.
+        """
+        if not self._lock.acquire(blocking=False):
+            return self._estado
+        try:
+            agora = dt.datetime.now(FUSO_BRASILIA)
+            estado = replace(self._estado, ultimo_local=self._ultimo_local() or self._estado.ultimo_local)
+            if forcar or self._precisa_consultar(estado, agora):
+                estado = self._consultar_caixa(estado, agora)
+            self._estado = estado
+            return estado
+        finally:
+            self._lock.release()
+
+    def verificar_em_segundo_plano(self) -> EstadoAtualizacao:
+        """
+        Ultimo estado conhecido, sem nunca esperar pela Caixa: se a consulta esta vencida,
+        ela roda numa thread e o resultado aparece nas proximas leituras.
+        """
+        agora = dt.datetime.now(FUSO_BRASILIA)
+        if not self._lock.locked() and self._precisa_consultar(self._estado, agora):
+            threading.Thread(target=self.verificar, name="verificador-caixa", daemon=True).start()
+        return self._estado
+
+    def _precisa_consultar(self, estado: EstadoAtualizacao, agora: dt.datetime) -> bool:
+        if estado.verificado_em is None:
+            return True
+        if agora - estado.verificado_em < self.intervalo:
+            return False
+        # Ja conhecemos o ultimo concurso e o proximo ainda nao foi sorteado/publicado
+        if estado.proximo_sorteio is not None and agora < estado.proximo_sorteio + MARGEM_PUBLICACAO:
+            return False
+        return True
+
+    @cronometrado("caixa.verificar_atualizacao")
+    def _consultar_caixa(self, estado: EstadoAtualizacao, agora: dt.datetime) -> EstadoAtualizacao:
+        try:
+            response = requests.get(self.url, headers=self._cabecalhos, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Erro ao verificar atualizacao na Caixa: {e}")
+            return replace(estado, verificado_em=agora)
+
+        if response.status_code == 304:
+            # Nada mudou desde a ultima resposta
+            return replace(estado, verificado_em=agora,
+                           proximo_sorteio=estado.proximo_sorteio or proximo_sorteio_previsto(agora))
+        if response.status_code != 200:
+            return replace(estado, verificado_em=agora)
+
+        self._cabecalhos = {}
+        if response.headers.get('ETag'):
+            self._cabecalhos['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            self._cabecalhos['If-Modified-Since'] = response.headers['Last-Modified']
+
+        try:
+            dados = response.json()
+        except ValueError:
+            return replace(estado, verificado_em=agora)
+
+        return replace(
+            estado,
+            ultimo_caixa=int(dados.get('numero', 0)) or estado.ultimo_caixa,
+            verificado_em=agora,
+            proximo_sorteio=_data_proximo_concurso(dados) or proximo_sorteio_previsto(agora),
+        )